@@ -7,11 +7,17 @@ python3 scripts/processing/processData.py
 # Check if processing was successful
 if [ $? -eq 0 ]; then
     echo "Data processing complete!"
-    
+
+    # Keep the outputs in sync with data/raw while the dev server runs
+    echo "Watching data/raw for changes..."
+    python3 scripts/processing/processData.py --watch &
+    WATCH_PID=$!
+    trap 'kill $WATCH_PID 2>/dev/null' EXIT
+
     # Start the development server
     echo "Starting development server..."
     npm run dev
 else
     echo "Data processing failed. Please check the error messages above."
     exit 1
-fi
\ No newline at end of file
+fi
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Local query API over the processed outputs
+A small asyncio HTTP/1.1 server (standard library only) that loads
+data/outputs once into per-state and per-year indexes and answers:
+
+    GET /                                   years, states and endpoints
+    GET /year/{year}                        every state's entry plus the year summary
+    GET /state/{state}                      one state's full timeline
+    GET /state/{state}/range?from=&to=      a state's entries between two years (inclusive)
+    GET /whatif?year=&normalize=            equal (default) or normalize-to-state what-if scenario
+
+States may be given by name ("New%20York") or slug ("new-york"). Rendered
+responses are kept in an LRU cache with an ETag, and If-None-Match requests
+get 304 Not Modified. Connections are kept alive between requests; a request
+body is read and ignored, and one without a Content-Length closes the
+connection after the error response.
+"""
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import sys
+import traceback
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# what-if scenarios and shard naming live with the processing pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '../processing'))
+from scenarios import build_scenarios_for_year
+from shards import state_shard_name
+
+OUTPUT_DIR = Path('data/outputs')
+CACHE_SIZE = 4096
+MAX_HEADER_BYTES = 16384
+MAX_BODY_BYTES = 65536
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Content Too Large', 500: 'Internal Server Error', 501: 'Not Implemented'}
+
+class QueryError(Exception):
+    """A request that maps to an HTTP error status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ElectoralIndex:
+    """Processed outputs indexed by state and by year"""
+
+    def __init__(self, output_dir=OUTPUT_DIR):
+        output_dir = Path(output_dir)
+        with open(output_dir / 'stateTimelines.json', 'r') as f:
+            self.timelines = json.load(f)
+        with open(output_dir / 'yearSummaries.json', 'r') as f:
+            self.summaries = {int(year): summary for year, summary in json.load(f).items()}
+
+        # Precomputed what-if tables are used when present, otherwise years are solved on demand
+        self.whatif = None
+        self.solved = {}
+        whatif_path = output_dir / 'whatIfScenarios.json'
+        if whatif_path.exists():
+            with open(whatif_path, 'r') as f:
+                self.whatif = {int(year): scenarios for year, scenarios in json.load(f).items()}
+
+        self.states = list(self.timelines)
+        self.years = sorted(self.summaries)
+        self.state_names = {}
+        for state in self.states:
+            self.state_names[state.lower()] = state
+            self.state_names[state_shard_name(state)[len('states/'):-len('.json')]] = state
+
+        # Per state: entries and their years sorted for bisect range queries
+        self.state_years = {
+            state: [entry['year'] for entry in data['timeline']] for state, data in self.timelines.items()
+        }
+        # Per year: {state: entry} in stateTimelines.json state order
+        self.by_year = {year: {} for year in self.years}
+        for state, data in self.timelines.items():
+            for entry in data['timeline']:
+                self.by_year.setdefault(entry['year'], {})[state] = entry
+
+    def resolve_state(self, value):
+        state = self.state_names.get(unquote(value).strip().lower())
+        if state is None:
+            raise QueryError(404, f"Unknown state: {unquote(value)}")
+        return state
+
+    def resolve_year(self, value):
+        try:
+            year = int(value)
+        except (TypeError, ValueError):
+            raise QueryError(400, f"Invalid year: {value}")
+        if year not in self.summaries:
+            raise QueryError(404, f"No election in {year}")
+        return year
+
+    def year(self, year):
+        return {'year': year, 'summary': self.summaries[year], 'states': self.by_year.get(year, {})}
+
+    def state(self, state):
+        return self.timelines[state]
+
+    def state_range(self, state, start, end):
+        years = self.state_years[state]
+        low = bisect.bisect_left(years, start)
+        high = bisect.bisect_right(years, end)
+        return {'name': state, 'from': start, 'to': end, 'timeline': self.timelines[state]['timeline'][low:high]}
+
+    def year_scenarios(self, year):
+        if self.whatif is not None and year in self.whatif:
+            return self.whatif[year]
+        if year not in self.solved:
+            self.solved[year] = build_scenarios_for_year(self.timelines, year)
+        return self.solved[year]
+
+    def whatif_scenario(self, year, normalize=None):
+        scenarios = self.year_scenarios(year)
+        if normalize is None or normalize.lower() == 'equal':
+            scenario, mode = scenarios['equal'], 'equal'
+        else:
+            state = self.resolve_state(normalize)
+            scenario, mode = scenarios['normalized'].get(state), 'normalized'
+            if scenario is None:
+                raise QueryError(404, f"{state} has no population or EVs in {year} to normalize to")
+        if scenario is None:
+            raise QueryError(404, f"No what-if scenario for {year}")
+        return {
+            'year': year,
+            'mode': mode,
+            'normalize': state if mode == 'normalized' else None,
+            'states': scenarios['states'],
+            'original': scenarios['original'],
+            'scenario': scenario,
+        }
+
+class QueryApp:
+    """Routes requests to the index and caches rendered responses"""
+
+    def __init__(self, index, cache_size=CACHE_SIZE):
+        self.index = index
+        self.render = lru_cache(maxsize=cache_size)(self._render)
+
+    def _route(self, parts, params):
+        index = self.index
+        if not parts:
+            return {
+                'years': index.years,
+                'states': index.states,
+                'endpoints': ['/year/{year}', '/state/{state}', '/state/{state}/range?from=&to=',
+                              '/whatif?year=&normalize='],
+            }
+        if parts[0] == 'year' and len(parts) == 2:
+            return index.year(index.resolve_year(parts[1]))
+        if parts[0] == 'state' and len(parts) == 2:
+            return index.state(index.resolve_state(parts[1]))
+        if parts[0] == 'state' and len(parts) == 3 and parts[2] == 'range':
+            state = index.resolve_state(parts[1])
+            try:
+                start = int(params.get('from', index.years[0]))
+                end = int(params.get('to', index.years[-1]))
+            except ValueError:
+                raise QueryError(400, "from and to must be years")
+            return index.state_range(state, start, end)
+        if parts[0] == 'whatif' and len(parts) == 1:
+            if 'year' not in params:
+                raise QueryError(400, "year is required")
+            return index.whatif_scenario(index.resolve_year(params['year']), params.get('normalize'))
+        raise QueryError(404, f"No route for /{'/'.join(parts)}")
+
+    def _render(self, path, query):
+        """Status, JSON body and ETag for a normalized path and query (cached)"""
+        parts = tuple(part for part in path.split('/') if part)
+        try:
+            status, payload = 200, self._route(parts, dict(query))
+        except QueryError as error:
+            status, payload = error.status, {'error': str(error)}
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        return status, body, etag
+
+    def respond(self, method, target, headers):
+        """Return (status, headers, body) for one request"""
+        if method not in ('GET', 'HEAD'):
+            body = json.dumps({'error': f"{method} not allowed"}).encode('utf-8')
+            return 405, {'Allow': 'GET, HEAD'}, body
+
+        url = urlsplit(target)
+        query = tuple(sorted(parse_qsl(url.query)))
+        status, body, etag = self.render(url.path.rstrip('/') or '/', query)
+
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if status == 200 and etag in headers.get('if-none-match', ''):
+            return 304, response_headers, b''
+        return status, response_headers, body
+
+async def handle_connection(app, reader, writer):
+    """Serve keep-alive HTTP/1.1 requests on one connection"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            # No route takes a body, but one that was sent must be consumed before the next request
+            # is read. Bodies that cannot be skipped are refused and end the connection.
+            length = headers.get('content-length', '0')
+            refused = None
+            if 'transfer-encoding' in headers:
+                refused = 501, "Transfer-Encoding is not supported"
+            elif not length.isdigit():
+                refused = 400, f"Invalid Content-Length: {length}"
+            elif int(length) > MAX_BODY_BYTES:
+                refused = 413, f"Request body over {MAX_BODY_BYTES} bytes"
+            elif int(length):
+                try:
+                    await reader.readexactly(int(length))
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+            if refused is not None:
+                status, response_headers = refused[0], {}
+                body = json.dumps({'error': refused[1]}).encode('utf-8')
+            else:
+                try:
+                    status, response_headers, body = app.respond(method, target, headers)
+                except Exception:
+                    # The request was read with its body, so the connection stays usable after the error response
+                    print(f"❌ {method} {target} failed:", file=sys.stderr)
+                    traceback.print_exc()
+                    status, response_headers = 500, {}
+                    body = json.dumps({'error': 'Internal server error'}).encode('utf-8')
+            keep_alive = (refused is None and headers.get('connection', '').lower() != 'close'
+                          and (version != 'HTTP/1.0' or headers.get('connection', '').lower() == 'keep-alive'))
+
+            response_headers.update({
+                'Content-Type': 'application/json',
+                'Content-Length': str(len(body)),
+                'Access-Control-Allow-Origin': '*',
+                'Connection': 'keep-alive' if keep_alive else 'close',
+            })
+            head_lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+            head_lines.extend(f"{name}: {value}" for name, value in response_headers.items())
+            writer.write(('\r\n'.join(head_lines) + '\r\n\r\n').encode('latin-1') + (b'' if method == 'HEAD' else body))
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(app, host, port):
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(app, reader, writer),
+                                        host, port, limit=MAX_HEADER_BYTES)
+    address = server.sockets[0].getsockname()
+    print(f"🌐 Serving {len(app.index.states)} states x {len(app.index.years)} years on http://{address[0]}:{address[1]}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    """Load the processed outputs once and serve queries until interrupted"""
+    parser = argparse.ArgumentParser(description="Local query API over data/outputs")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to bind")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on")
+    parser.add_argument('--outputs', type=Path, default=OUTPUT_DIR, help="processed outputs directory")
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help="rendered responses kept in memory")
+    args = parser.parse_args(argv)
+
+    print(f"📊 Loading processed outputs from {args.outputs}...")
+    app = QueryApp(ElectoralIndex(args.outputs), cache_size=args.cache_size)
+    try:
+        asyncio.run(serve(app, args.host, args.port))
+    except KeyboardInterrupt:
+        info = app.render.cache_info()
+        print(f"\n👋 Stopped ({info.hits:,} cache hits, {info.misses:,} misses)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark the processing pipeline on synthetic datasets
+Each scale factor k replaces every state with k district-level rows shaped
+like electoral_enhanced.csv (k = 1 is the real dataset), then times and
+memory-profiles load_data, calculate_metrics, create_state_timeline,
+create_year_summaries and save_json_files. Every scale runs in a fresh
+process inside its own scratch directory, so the process peak RSS and the
+loader cache are per scale and nothing under data/ is touched. Memory per
+stage is its tracemalloc peak in an extra traced run, which unlike RSS does
+not carry over the peaks of earlier stages.
+
+Results are written as JSON keyed by commit; pass --compare with an earlier
+results file to flag stages that got slower or allocate more.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROCESSING_DIR = Path(__file__).resolve().parent.parent / 'processing'
+sys.path.append(str(PROCESSING_DIR))
+from instrumentation import peak_rss
+
+ROOT = PROCESSING_DIR.parent.parent
+CSV_PATH = ROOT / 'data/raw/electoral_enhanced.csv'
+RESULTS_DIR = ROOT / 'benchmarks/results'
+DEFAULT_SCALES = [1, 10, 100, 1000]
+# Stage memory changes below this are noise, not regressions
+MEMORY_NOISE_BYTES = 2**20
+STAGES = ['load_data', 'calculate_metrics', 'create_state_timeline', 'create_year_summaries', 'save_json_files']
+
+def synthesize(df, scale, seed=0):
+    """Scale the dataset by splitting every state into `scale` districts
+
+    District 0 keeps the real row unchanged; the others get the state's name
+    with a district number and a population jittered by up to +/-50%.
+    """
+    if scale == 1:
+        return df.copy()
+
+    rng = np.random.default_rng(seed)
+    districts = np.tile(np.arange(scale), len(df))
+    synthetic = df.loc[df.index.repeat(scale)].reset_index(drop=True)
+
+    names = synthetic['State'].astype(str)
+    synthetic['State'] = names.where(districts == 0, names + ' District ' + districts.astype(str))
+
+    jitter = np.where(districts == 0, 1.0, rng.uniform(0.5, 1.5, len(synthetic)))
+    synthetic['Population'] = (synthetic['Population'] * jitter).round()
+    synthetic['Population_Per_EV'] = synthetic['Population'] / synthetic['Electoral_Votes'].astype(float)
+    return synthetic
+
+def run_stages(processData, traced=False):
+    """Run every stage once in the current directory, returning per-stage measurements"""
+    measurements = {}
+    state = {}
+
+    def measure(name, func, rows_in):
+        if traced:
+            tracemalloc.start()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+        entry = {'rows': rows_in, 'seconds': wall, 'cpuSeconds': cpu}
+        if traced:
+            entry['tracemallocPeakBytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        measurements[name] = entry
+        return result
+
+    state['raw'] = measure('load_data', processData.load_data, None)
+    measurements['load_data']['rows'] = len(state['raw'])
+    df = measure('calculate_metrics', lambda: processData.calculate_metrics(state['raw']), len(state['raw']))
+    timelines = measure('create_state_timeline', lambda: processData.create_state_timeline(df), len(df))
+    summaries = measure('create_year_summaries', lambda: processData.create_year_summaries(df), len(df))
+    with contextlib.redirect_stdout(io.StringIO()):
+        metadata = processData.create_state_metadata()
+    measure('save_json_files', lambda: processData.save_json_files(timelines, summaries, metadata, df), len(df))
+    return measurements
+
+def benchmark_scale(scale, repeat, seed, memory):
+    """Benchmark one scale factor in a scratch directory (runs in its own process)"""
+    import processData
+    from loader import parse_csv
+
+    synthetic = synthesize(parse_csv(CSV_PATH), scale, seed)
+
+    with tempfile.TemporaryDirectory(prefix=f'benchmark-{scale}x-') as workdir:
+        os.chdir(workdir)
+        Path('data/raw').mkdir(parents=True)
+        synthetic.to_csv('data/raw/electoral_enhanced.csv', index=False)
+        csv_bytes = Path('data/raw/electoral_enhanced.csv').stat().st_size
+
+        # Fresh loader cache and outputs for every repeat, so each run is cold
+        runs = []
+        for _ in range(repeat):
+            for path in list(Path('data/cache').glob('*')) + list(Path('data/outputs').glob('*')):
+                path.unlink()
+            runs.append(run_stages(processData))
+
+        traced = None
+        if memory:
+            for path in list(Path('data/cache').glob('*')) + list(Path('data/outputs').glob('*')):
+                path.unlink()
+            traced = run_stages(processData, traced=True)
+
+        output_bytes = sum(path.stat().st_size for path in Path('data/outputs').glob('*.json'))
+
+    results = []
+    for stage in STAGES:
+        seconds = [run[stage]['seconds'] for run in runs]
+        entry = {
+            'scale': scale,
+            'stage': stage,
+            'rows': runs[0][stage]['rows'],
+            'seconds': min(seconds),
+            'meanSeconds': sum(seconds) / len(seconds),
+            'cpuSeconds': min(run[stage]['cpuSeconds'] for run in runs),
+        }
+        if traced:
+            entry['tracemallocPeakBytes'] = traced[stage]['tracemallocPeakBytes']
+        results.append(entry)
+
+    return {'scale': scale, 'rows': len(synthetic), 'csvBytes': csv_bytes, 'outputBytes': output_bytes,
+            'processPeakRssBytes': peak_rss(), 'stages': results}
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _format_measure(field, value):
+    return f"{value:9.3f}s" if field == 'seconds' else f"{value / 2**20:7.1f} MiB"
+
+def compare(current, previous, threshold):
+    """Print per-stage time and memory ratios against a previous results file; returns the regressions"""
+    before = {(entry['scale'], entry['stage']): entry for scale in previous['scales'] for entry in scale['stages']}
+    regressions = []
+    print(f"\n📈 Compared with {(previous.get('commit') or 'previous run')[:12]}:")
+    for scale in current['scales']:
+        for entry in scale['stages']:
+            old = before.get((entry['scale'], entry['stage']))
+            if old is None:
+                continue
+            for field, label in (('seconds', 'time'), ('tracemallocPeakBytes', 'memory')):
+                if not old.get(field) or field not in entry:
+                    continue
+                ratio = entry[field] / old[field]
+                regressed = ratio > 1 + threshold and (field == 'seconds' or entry[field] - old[field] > MEMORY_NOISE_BYTES)
+                flag = '⚠️ ' if regressed else '  '
+                print(f"  {flag}{entry['scale']:>5}x {entry['stage']:<22} {label:<6} "
+                      f"{_format_measure(field, old[field])} → {_format_measure(field, entry[field])} ({ratio:.2f}x)")
+                if regressed:
+                    regressions.append({**entry, 'measure': label})
+    return regressions
+
+def main(argv=None):
+    """Benchmark every scale and write machine-readable results"""
+    parser = argparse.ArgumentParser(description="Benchmark the processing pipeline on synthetic datasets")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="dataset size multipliers")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per scale (the fastest is reported)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the synthetic populations")
+    parser.add_argument('--no-memory', action='store_true', help="skip the extra tracemalloc run")
+    parser.add_argument('--output', type=Path, help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', type=Path, help="earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown or stage memory growth reported as a regression")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'repeat': args.repeat,
+        'scales': [],
+    }
+
+    print(f"⏱️  Benchmarking pipeline at scales {args.scales} ({args.repeat} runs each)...")
+    for scale in args.scales:
+        # A fresh process per scale keeps peak RSS and imported state independent
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                result = pool.submit(benchmark_scale, scale, args.repeat, args.seed, not args.no_memory).result()
+        except BrokenProcessPool:
+            # Usually the OS killing the worker for running out of memory
+            print(f"❌ {scale}x: worker process died (out of memory?)")
+            report['scales'].append({'scale': scale, 'error': 'worker process died', 'stages': []})
+            continue
+        report['scales'].append(result)
+
+        print(f"📊 {scale}x: {result['rows']:,} rows, {result['csvBytes']:,} byte CSV, "
+              f"process peak RSS {result['processPeakRssBytes'] / 2**20:.0f} MiB")
+        for entry in result['stages']:
+            memory = f", {entry['tracemallocPeakBytes'] / 2**20:8.1f} MiB stage peak" if 'tracemallocPeakBytes' in entry else ''
+            print(f"  - {entry['stage']:<22} {entry['seconds']:9.3f}s{memory}")
+
+    output = args.output or RESULTS_DIR / f"{(commit or 'uncommitted')[:12]}.json"
+    output.parent.mkdir(exist_ok=True, parents=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Saved benchmark results to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} stage measurements more than {args.threshold:.0%} above the previous run")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
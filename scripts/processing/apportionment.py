@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Apportionment methods for hypothetical electoral votes
+Huntington-Hill, Webster and Jefferson (divisor methods) and Hamilton
+(largest remainder) over year x state population arrays. Every method works
+on all years and any number of seat totals (e.g. alternative House sizes) in
+one call, and every state that takes part receives at least one seat.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Divisor for a state's next seat when it already holds n seats (n >= 1)
+DIVISORS = {
+    'huntingtonHill': lambda n: np.sqrt(n * (n + 1)),
+    'webster': lambda n: n + 0.5,
+    'jefferson': lambda n: n + 1.0,
+}
+
+METHODS = ('huntingtonHill', 'webster', 'jefferson', 'hamilton')
+
+# Output column for each method, next to calculate_metrics' Hypothetical_EVs
+METHOD_COLUMNS = {
+    'huntingtonHill': 'Hypothetical_EVs_Huntington_Hill',
+    'webster': 'Hypothetical_EVs_Webster',
+    'jefferson': 'Hypothetical_EVs_Jefferson',
+    'hamilton': 'Hypothetical_EVs_Hamilton',
+}
+
+def _prepare(populations, seats):
+    """Normalize inputs to (Y, S) populations, (Y, S) eligibility and (Y, H) seat totals"""
+    populations = np.asarray(populations, dtype=float)
+    eligible = np.isfinite(populations) & (populations > 0)
+    populations = np.where(eligible, populations, 0.0)
+
+    seats = np.asarray(seats, dtype=np.int64)
+    single = seats.ndim == 1
+    if single:
+        seats = seats[:, None]
+    return populations, eligible, seats, single
+
+def apportion_divisor(populations, seats, method='huntingtonHill'):
+    """Apportion seats with a divisor method
+
+    populations: (years, states) array, NaN or <= 0 for states not taking part.
+    seats: (years,) seat totals, or (years, sizes) to solve several totals at once.
+    Returns int arrays of shape (years, states) or (years, sizes, states).
+    """
+    populations, eligible, seats, single = _prepare(populations, seats)
+    n_years, n_states = populations.shape
+    n_eligible = eligible.sum(axis=1)
+    extra = np.clip(seats - n_eligible[:, None], 0, None)
+
+    if extra.max(initial=0) == 0:
+        result = np.broadcast_to(eligible[:, None, :], (n_years, seats.shape[1], n_states)).astype(np.int64)
+        return result[:, 0, :] if single else result
+
+    # Under every divisor method total population / final divisor lies within
+    # seats +/- states, so a state's extra seats stay within its share of that
+    # range. Seats below the window are won outright (with a margin for rounding)
+    # and only the candidates inside it need ranking.
+    totals = populations.sum(axis=1)
+    share = populations / np.where(totals > 0, totals, 1.0)[:, None]
+    low = (seats.min(axis=1) - n_eligible)[:, None]
+    high = (seats.max(axis=1) + n_eligible)[:, None]
+    guaranteed = np.where(eligible, np.clip(np.floor(share * low) - 3, 0, None), 0).astype(np.int64)
+    window = int(np.where(eligible, np.ceil(share * high) + 1 - guaranteed, 0).max())
+
+    # Priority of each state's next seats past the guaranteed ones; one ranking per year covers all seat totals
+    seat_numbers = guaranteed[:, :, None] + np.arange(1, window + 1)[None, None, :]
+    priorities = np.where(eligible[:, :, None], populations[:, :, None] / DIVISORS[method](seat_numbers.astype(float)), -np.inf)
+    flat = priorities.reshape(n_years, -1)
+    order = np.argsort(-flat, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(flat.shape[1])[None, :], axis=1)
+
+    # Ranks rise along each state's row, so offsetting rows makes one sorted key array
+    # and "how many of this state's priorities fall within the first k" is a searchsorted
+    width = flat.shape[1]
+    row_ids = np.arange(n_years * n_states).reshape(n_years, n_states)
+    keys = (row_ids[:, :, None] * width + ranks.reshape(n_years, n_states, window)).ravel()
+    contested = extra - guaranteed.sum(axis=1)[:, None]
+    queries = row_ids[:, None, :] * width + contested[:, :, None]
+    won = np.searchsorted(keys, queries, side='left') - row_ids[:, None, :] * window
+
+    result = np.where(eligible[:, None, :], 1 + guaranteed[:, None, :] + won, 0).astype(np.int64)
+    return result[:, 0, :] if single else result
+
+def apportion_hamilton(populations, seats):
+    """Apportion seats by largest remainders (Hamilton), with a one-seat minimum
+
+    States whose quota falls below one are fixed at one seat and the quotas of
+    the rest are recomputed over the remaining seats until no quota is below one.
+    Same shapes as apportion_divisor; remainder ties keep state order.
+    """
+    populations, eligible, seats, single = _prepare(populations, seats)
+    shape = (seats.shape[0], seats.shape[1], populations.shape[1])
+    eligible = np.broadcast_to(eligible[:, None, :], shape)
+    populations = np.broadcast_to(populations[:, None, :], shape)
+
+    fixed = np.zeros(shape, dtype=bool)
+    for _ in range(shape[2]):
+        free = eligible & ~fixed
+        free_seats = seats - fixed.sum(axis=2)
+        free_population = np.where(free, populations, 0.0).sum(axis=2)
+        safe_population = np.where(free_population > 0, free_population, 1.0)
+        quotas = np.where(free, populations / safe_population[:, :, None] * free_seats[:, :, None], 0.0)
+        below_one = free & (quotas < 1)
+        if not below_one.any():
+            break
+        fixed |= below_one
+
+    floors = np.floor(quotas)
+    allocated = np.where(fixed, 1, np.where(free, floors, 0))
+    remaining = seats - allocated.sum(axis=2)
+
+    # One more seat for the largest remainders among the states not fixed at one
+    remainders = np.where(free, quotas - floors, -1.0)
+    order = np.argsort(-remainders, axis=2, kind='stable')
+    position = np.empty_like(order)
+    np.put_along_axis(position, order, np.arange(shape[2])[None, None, :], axis=2)
+    add = free & (position < remaining[:, :, None])
+
+    result = (allocated + add).astype(np.int64)
+    return result[:, 0, :] if single else result
+
+def apportion(populations, seats, method):
+    """Apportion seats with any method in METHODS"""
+    if method == 'hamilton':
+        return apportion_hamilton(populations, seats)
+    if method not in DIVISORS:
+        raise ValueError(f"Unknown apportionment method: {method}")
+    return apportion_divisor(populations, seats, method)
+
+def apportion_frame(df, methods=METHODS):
+    """Apportion each year's electoral votes among its states by population
+
+    The seats for a year are the EVs of the states that have both EVs and a
+    population, so every method sums to the real total. Returns a frame with
+    one nullable-int column per method (see METHOD_COLUMNS), aligned to df.
+    """
+    eligible = (df['Electoral_Votes'].fillna(0) > 0) & (df['Population'].fillna(0) > 0)
+    year_codes, years = pd.factorize(df['Year'], sort=True)
+    state_codes, states = pd.factorize(df['State'])
+
+    populations = np.full((len(years), len(states)), np.nan)
+    populations[year_codes[eligible], state_codes[eligible]] = df.loc[eligible, 'Population'].to_numpy(dtype=float)
+    seats = np.bincount(year_codes[eligible], weights=df.loc[eligible, 'Electoral_Votes'].to_numpy(dtype=float),
+                        minlength=len(years)).astype(np.int64)
+
+    result = pd.DataFrame(index=df.index)
+    for method in methods:
+        allocation = apportion(populations, seats, method)
+        values = pd.Series(allocation[year_codes, state_codes], index=df.index, dtype='Int64')
+        result[METHOD_COLUMNS[method]] = values.mask(~eligible)
+    return result
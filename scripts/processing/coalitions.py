@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Minimum-population winning coalitions
+The smallest share of the population whose states could have won the
+Electoral College: a 0/1 knapsack that picks states reaching a majority of
+the EVs with the least total population. It is solved exactly by a DP over
+EV totals,
+
+    best[k] = least population of a set of states holding exactly k EVs
+
+one state at a time, keeping which states improved each total so the winning
+set can be read back. Every year and every what-if EV allocation (equal
+representation and the four apportionment methods) is one game, and all games
+are solved together as one batch of arrays.
+
+Games in which a participating state has no population are left unsolved, as
+are games whose DP table would exceed MAX_TABLE_CELLS (the benchmark's
+synthetic district rows).
+"""
+
+import argparse
+
+import numpy as np
+
+from apportionment import METHOD_COLUMNS
+from frame_index import YearStateIndex
+from json_writer import FLOAT_DIGITS
+from power_index import majority_quota
+
+MAX_TABLE_CELLS = 2**20
+BATCH_BYTES = 64 * 2**20
+
+# Allocation name -> metrics frame column; 'actual' is the real result
+ALLOCATIONS = {'actual': 'Electoral_Votes', 'equalRepresentation': 'Hypothetical_EVs', **METHOD_COLUMNS}
+
+def _solve_batch(weights, populations, quota):
+    """Least population, its EVs and the chosen players for a batch of solvable games"""
+    n_games, n_players = weights.shape
+    width = int(weights.sum(axis=1).max()) + 1
+
+    # The i-th state of weight w in every game is one knapsack item, so each item shifts all
+    # games by the same w; nothing beyond the EVs of the items taken so far is touched
+    order = np.argsort(weights, axis=1, kind='stable')
+    sorted_weights = np.take_along_axis(weights, order, axis=1)
+    best = np.full((n_games, width), np.inf)
+    best[:, 0] = 0.0
+    items = []
+    reach = 1
+    for value in np.unique(weights[weights > 0]).tolist():
+        matches = sorted_weights == value
+        first, counts = np.argmax(matches, axis=1), matches.sum(axis=1)
+        for step in range(counts.max()):
+            reach = min(width, reach + value)
+            games = np.nonzero(counts > step)[0]
+            player = order[games, first[games] + step]
+            candidate = best[games, :reach - value] + populations[games, player][:, None]
+            # Ties keep the set without this state
+            better = candidate < best[games, value:reach]
+            best[games, value:reach] = np.where(better, candidate, best[games, value:reach])
+            items.append((value, games, player, better))
+
+    # Cheapest total at or above the quota, then walk the items back from it
+    totals = np.arange(width)[None, :]
+    winning = np.where(totals >= quota[:, None], best, np.inf)
+    electoral_votes = np.argmin(winning, axis=1)
+    population = winning[np.arange(n_games), electoral_votes]
+
+    chosen = np.zeros((n_games, n_players), dtype=bool)
+    total = electoral_votes.copy()
+    for value, games, player, better in reversed(items):
+        column = total[games] - value
+        taken = (column >= 0) & (column < better.shape[1])
+        taken[taken] = better[np.nonzero(taken)[0], column[taken]]
+        chosen[games[taken], player[taken]] = True
+        total[games[taken]] -= value
+    return population, electoral_votes, chosen
+
+def minimum_winning_coalitions(weights, populations, quota=None, batch_bytes=BATCH_BYTES):
+    """Least-population sets of players reaching the quota, for games x players arrays
+
+    Players with weight 0 are not in the game. quota defaults to a majority of
+    each game's total weight. Returns (population, electoral votes, chosen
+    players): population is NaN, electoral votes 0 and nobody chosen for
+    unsolved games.
+    """
+    weights = np.asarray(weights, dtype=float)
+    shape = weights.shape
+    weights = np.nan_to_num(weights, nan=0).astype(np.int64).reshape(int(np.prod(shape[:-1])), shape[-1])
+    weights = np.maximum(weights, 0)
+    populations = np.broadcast_to(np.asarray(populations, dtype=float), shape).reshape(int(np.prod(shape[:-1])), shape[-1])
+    totals = weights.sum(axis=1)
+    quota = majority_quota(totals) if quota is None else np.broadcast_to(
+        np.asarray(quota, dtype=np.int64), shape[:-1]).reshape(-1)
+
+    players = weights > 0
+    complete = ~(players & np.isnan(populations)).any(axis=1)
+    fits = players.sum(axis=1) * (totals + 1) <= MAX_TABLE_CELLS
+    solvable = np.nonzero(players.any(axis=1) & complete & fits & (quota > 0) & (quota <= totals))[0]
+
+    population = np.full(len(weights), np.nan)
+    electoral_votes = np.zeros(len(weights), dtype=np.int64)
+    chosen = np.zeros(weights.shape, dtype=bool)
+
+    # Batches of similar totals keep the EV axis tight
+    solvable = solvable[np.argsort(totals[solvable], kind='stable')]
+    start = 0
+    while start < len(solvable):
+        per_game = (shape[-1] + 4 * np.dtype(float).itemsize) * (int(totals[solvable[-1]]) + 1)
+        games = solvable[start:start + max(1, batch_bytes // per_game)]
+        start += len(games)
+
+        columns = np.nonzero(players[games].any(axis=0))[0]
+        batch = _solve_batch(weights[np.ix_(games, columns)], np.nan_to_num(populations[np.ix_(games, columns)]),
+                             quota[games])
+        population[games], electoral_votes[games] = batch[0], batch[1]
+        chosen[np.ix_(games, columns)] = batch[2]
+
+    return population.reshape(shape[:-1]), electoral_votes.reshape(shape[:-1]), chosen.reshape(shape)
+
+def year_coalitions(df, allocations=ALLOCATIONS):
+    """{year: {allocation: coalition}} for the participating rows of a metrics frame
+
+    A coalition is {'electoralVotes', 'population', 'populationShare', 'states'}
+    with the states in name order and the share rounded like the JSON outputs,
+    or None values and no states when the game could not be solved.
+    """
+    index = YearStateIndex(df)
+    names = [name for name, column in allocations.items() if column in df]
+
+    # States in name order, so ties and the listed sets do not depend on which years the frame holds
+    order = np.argsort(np.asarray(index.states, dtype=object), kind='stable')
+    weights = np.stack([index.grid(allocations[name])[:, order] for name in names], axis=1)
+    populations = index.grid('Population')[:, None, order]
+    population, electoral_votes, chosen = minimum_winning_coalitions(weights, populations)
+
+    # Shares are of the year's whole population, so the allocations compare directly
+    total_population = np.nansum(populations, axis=2)
+
+    states = np.asarray(index.states, dtype=object)[order]
+    result = {}
+    for position, year in enumerate(index.years):
+        result[year] = {}
+        for allocation, name in enumerate(names):
+            solved = not np.isnan(population[position, allocation])
+            result[year][name] = {
+                'electoralVotes': int(electoral_votes[position, allocation]) if solved else None,
+                'population': int(population[position, allocation]) if solved else None,
+                'populationShare': round(float(population[position, allocation] / total_population[position, 0]),
+                                         FLOAT_DIGITS) if solved else None,
+                'states': states[chosen[position, allocation]].tolist(),
+            }
+    return result
+
+def main(argv=None):
+    """Print the smallest population share that could have won each year"""
+    parser = argparse.ArgumentParser(description="Minimum-population winning coalition per election year")
+    parser.add_argument('--years', type=int, nargs='*', help="years to list with their winning states (default: all, without states)")
+    args = parser.parse_args(argv)
+
+    from processData import calculate_metrics, load_data
+
+    df = calculate_metrics(load_data(), ['Year', 'State', 'Population', *ALLOCATIONS.values()])
+    coalitions = year_coalitions(df[df['Electoral_Votes'] > 0])
+
+    print("🏆 Smallest population share that could win (actual EVs / equal representation):")
+    for year, games in coalitions.items():
+        if args.years and year not in args.years:
+            continue
+        actual, equal = games['actual'], games.get('equalRepresentation', {})
+        if actual['populationShare'] is None:
+            print(f"  - {year}: unknown (a participating state has no population)")
+            continue
+        equal_share = f"{equal['populationShare']:.1%}" if equal.get('populationShare') is not None else "n/a"
+        print(f"  - {year}: {actual['populationShare']:.1%} with {len(actual['states'])} states "
+              f"and {actual['electoralVotes']} EVs / {equal_share}")
+        if args.years:
+            print(f"    {', '.join(actual['states'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Compact columnar export of the state timelines
+Stores every timeline field as a typed year x state array, with party names,
+colors and candidates dictionary-encoded into small integer codes. The file
+can be memory-mapped back into NumPy arrays without copying.
+
+File layout (little-endian):
+    magic b'ECOL' | uint16 version | uint32 header length | JSON header
+    | arrays, each starting on a 64-byte boundary
+"""
+
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from json_writer import write_if_changed
+
+MAGIC = b'ECOL'
+VERSION = 1
+ALIGNMENT = 64
+PREAMBLE = struct.Struct('<4sHI')
+
+# Timeline field -> (column dtype, dictionary name or None)
+COLUMNS = {
+    'electoralVotes': ('<i2', None),
+    'population': ('<i8', None),
+    'populationPerEV': ('<f8', None),
+    'representationRatio': ('<f8', None),
+    'banzhafIndex': ('<f8', None),
+    'shapleyShubikIndex': ('<f8', None),
+    'hypotheticalEVs': ('<i2', None),
+    'apportionedEVs.huntingtonHill': ('<i2', None),
+    'apportionedEVs.webster': ('<i2', None),
+    'apportionedEVs.jefferson': ('<i2', None),
+    'apportionedEVs.hamilton': ('<i2', None),
+    'evDifference': ('<i2', None),
+    'winner': ('<i2', 'party'),
+    'runnerUp': ('<i2', 'party'),
+    'winnerColor': ('<i2', 'color'),
+    'runnerUpColor': ('<i2', 'color'),
+    'exists': ('|b1', None),
+    'isSplitState': ('|b1', None),
+    'winnerCandidate': ('<i2', 'candidate'),
+    'runnerUpCandidate': ('<i2', 'candidate'),
+    'winnerEV': ('<i2', None),
+    'runnerUpEV': ('<i2', None),
+    'winnerWeight': ('<f8', None),
+    'runnerUpWeight': ('<f8', None),
+}
+
+def null_value(dtype):
+    """Sentinel for missing values: NaN for floats, the minimum for signed ints, False for flags"""
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return np.nan
+    if dtype.kind == 'i':
+        return np.iinfo(dtype).min
+    return False
+
+def _flatten(timeline_data):
+    """Flatten {state: {'timeline': [...]}} into one frame with a 'state' column
+
+    Nested objects such as apportionedEVs become dotted columns.
+    """
+    records = [
+        dict(entry, state=state)
+        for state, data in timeline_data.items()
+        for entry in data['timeline']
+    ]
+    return pd.json_normalize(records)
+
+def build_columns(timeline_data):
+    """Build the dictionaries and year x state arrays for every timeline field"""
+    frame = _flatten(timeline_data)
+    years = sorted(frame['year'].unique().tolist())
+    states = list(timeline_data)
+
+    year_index = np.searchsorted(years, frame['year'].to_numpy())
+    state_index = pd.Categorical(frame['state'], categories=states).codes
+    shape = (len(years), len(states))
+
+    # Shared dictionaries: parties cover both winner and runner-up, etc.
+    dictionaries = {}
+    for name, fields in (('party', ['winner', 'runnerUp']),
+                         ('color', ['winnerColor', 'runnerUpColor']),
+                         ('candidate', ['winnerCandidate', 'runnerUpCandidate'])):
+        values = pd.concat([frame[field] for field in fields]).dropna()
+        dictionaries[name] = pd.unique(values).tolist()
+
+    arrays = {'present': np.zeros(shape, dtype='|b1')}
+    arrays['present'][year_index, state_index] = True
+
+    for field, (dtype, dictionary) in COLUMNS.items():
+        values = frame[field]
+        if dictionary is not None:
+            values = pd.Categorical(values, categories=dictionaries[dictionary]).codes
+        elif np.dtype(dtype).kind == 'i':
+            values = values.astype(float).fillna(null_value(dtype))
+        elif np.dtype(dtype).kind == 'b':
+            values = values.fillna(False)
+        else:
+            values = values.astype(float)
+
+        grid = np.full(shape, null_value(dtype), dtype=dtype)
+        grid[year_index, state_index] = np.asarray(values).astype(dtype)
+        arrays[field] = grid
+
+    return years, states, dictionaries, arrays
+
+def write_columnar(timeline_data, path):
+    """Write the timelines as a memory-mappable columnar file, returning its size in bytes"""
+    years, states, dictionaries, arrays = build_columns(timeline_data)
+
+    # Lay the arrays out first so the header can record their offsets
+    columns = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        columns[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset,
+            'dictionary': COLUMNS.get(name, (None, None))[1],
+        }
+        offset += array.nbytes
+
+    header = json.dumps({
+        'years': years,
+        'states': states,
+        'dictionaries': dictionaries,
+        'columns': columns,
+    }, separators=(',', ':')).encode('utf-8')
+
+    data_start = -(-(PREAMBLE.size + len(header)) // ALIGNMENT) * ALIGNMENT
+    header = header.ljust(data_start - PREAMBLE.size, b' ')
+
+    content = bytearray(data_start + offset)
+    content[:data_start] = PREAMBLE.pack(MAGIC, VERSION, len(header)) + header
+    for name, array in arrays.items():
+        start = data_start + columns[name]['offset']
+        content[start:start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+
+    write_if_changed(path, bytes(content))
+    return len(content)
+
+class ColumnarData:
+    """Read-only view over a columnar file; arrays are zero-copy slices of a memory map"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a columnar electoral file")
+        if version != VERSION:
+            raise ValueError(f"{path} has unsupported columnar version {version}")
+
+        header = json.loads(bytes(self._mmap[PREAMBLE.size:PREAMBLE.size + header_length]))
+        data_start = PREAMBLE.size + header_length
+
+        self.years = header['years']
+        self.states = header['states']
+        self.dictionaries = header['dictionaries']
+        self.columns = {}
+        for name, spec in header['columns'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape']))
+            self.columns[name] = np.frombuffer(
+                self._mmap, dtype=dtype, count=count, offset=data_start + spec['offset']
+            ).reshape(spec['shape'])
+        self._dictionary_for = {name: spec['dictionary'] for name, spec in header['columns'].items()}
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def decode(self, name, codes=None):
+        """Map dictionary codes of a column back to strings (None for missing)"""
+        dictionary = self.dictionaries[self._dictionary_for[name]]
+        codes = self.columns[name] if codes is None else np.asarray(codes)
+        lookup = np.array(dictionary + [None], dtype=object)
+        return lookup[np.where(codes < 0, len(dictionary), codes)]
+
+def read_columnar(path):
+    """Memory-map a columnar file written by write_columnar"""
+    return ColumnarData(path)
+
+if __name__ == "__main__":
+    data = read_columnar(sys.argv[1] if len(sys.argv) > 1 else 'data/outputs/stateTimelines.ecol')
+    print(f"📦 {len(data.years)} years x {len(data.states)} states, {len(data.columns)} columns")
+    for name, array in data.columns.items():
+        print(f"  - {name}: {array.dtype} {array.shape}")
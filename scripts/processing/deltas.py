@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Delta-encoded year stream for timeline playback
+Playback steps through the elections in order and only needs what the map
+draws for each state. The stream stores a full keyframe every
+`keyframeInterval` years and, for the years in between, only the states whose
+drawn fields changed since the previous election (with just those fields), plus
+the states that dropped out. Any year is rebuilt from its nearest keyframe.
+
+    {'fields': [...], 'keyframeInterval': 8, 'years': [1789, ...],
+     'frames': {'1789': {'keyframe': True, 'states': {state: {field: value}}},
+                '1792': {'keyframe': False, 'changed': {state: {field: value}}, 'removed': [state]}}}
+"""
+
+import json
+import sys
+
+from json_writer import write_if_changed
+
+KEYFRAME_INTERVAL = 8
+
+# Timeline fields the map draws for a state in a given year
+FRAME_FIELDS = [
+    'winner', 'winnerColor', 'runnerUp', 'runnerUpColor', 'electoralVotes', 'population',
+    'exists', 'isSplitState', 'winnerWeight', 'runnerUpWeight',
+]
+
+def year_frames(timeline_data, fields=FRAME_FIELDS):
+    """{year: {state: {field: value}}} in year order, states in stateTimelines.json order"""
+    frames = {}
+    for state, data in timeline_data.items():
+        for entry in data['timeline']:
+            frames.setdefault(entry['year'], {})[state] = {field: entry.get(field) for field in fields}
+    return dict(sorted(frames.items()))
+
+def build_delta_stream(timeline_data, keyframe_interval=KEYFRAME_INTERVAL, fields=FRAME_FIELDS):
+    """Encode every year as a keyframe or a diff against the previous year"""
+    if keyframe_interval < 1:
+        raise ValueError("keyframe_interval must be at least 1")
+
+    frames = year_frames(timeline_data, fields)
+    encoded = {}
+    previous = {}
+    for position, (year, states) in enumerate(frames.items()):
+        if position % keyframe_interval == 0:
+            encoded[str(year)] = {'keyframe': True, 'states': states}
+        else:
+            changed = {}
+            for state, values in states.items():
+                before = previous.get(state)
+                if before is None:
+                    changed[state] = values
+                    continue
+                diff = {field: value for field, value in values.items() if before.get(field) != value}
+                if diff:
+                    changed[state] = diff
+            removed = [state for state in previous if state not in states]
+            encoded[str(year)] = {'keyframe': False, 'changed': changed, 'removed': removed}
+        previous = states
+
+    return {
+        'fields': list(fields),
+        'keyframeInterval': keyframe_interval,
+        'years': list(frames),
+        'frames': encoded,
+    }
+
+def _apply(current, frame):
+    """Advance a decoded year by one encoded frame (in place)"""
+    if frame['keyframe']:
+        current.clear()
+        current.update({state: dict(values) for state, values in frame['states'].items()})
+        return current
+    for state in frame['removed']:
+        current.pop(state, None)
+    for state, values in frame['changed'].items():
+        current.setdefault(state, {}).update(values)
+    return current
+
+def decode_year(stream, year):
+    """Rebuild {state: {field: value}} for one year from its nearest preceding keyframe"""
+    years = stream['years']
+    try:
+        position = years.index(int(year))
+    except ValueError:
+        raise KeyError(f"No election in {year}") from None
+
+    start = position - position % stream['keyframeInterval']
+    current = {}
+    for step in years[start:position + 1]:
+        _apply(current, stream['frames'][str(step)])
+    return current
+
+def iter_years(stream, start=None):
+    """Yield (year, {state: {field: value}}) in order, applying one diff per step
+
+    The yielded mapping is updated in place on the next step; copy it to keep it.
+    """
+    years = stream['years']
+    if start is None:
+        start = years[0]
+    current = decode_year(stream, start)
+    yield start, current
+    for year in years[years.index(int(start)) + 1:]:
+        yield year, _apply(current, stream['frames'][str(year)])
+
+def save_delta_stream(timeline_data, path, keyframe_interval=KEYFRAME_INTERVAL):
+    """Write the delta stream as compact JSON, returning its size in bytes"""
+    print(f"🎞️  Encoding timeline deltas (keyframe every {keyframe_interval} years)...")
+    stream = build_delta_stream(timeline_data, keyframe_interval)
+    content = json.dumps(stream, separators=(',', ':')).encode('utf-8')
+    write_if_changed(path, content)
+    return len(content)
+
+if __name__ == "__main__":
+    with open(sys.argv[1] if len(sys.argv) > 1 else 'data/outputs/timelineDeltas.json', 'r') as f:
+        stream = json.load(f)
+    keyframes = sum(frame['keyframe'] for frame in stream['frames'].values())
+    changes = [len(frame['changed']) for frame in stream['frames'].values() if not frame['keyframe']]
+    print(f"🎞️  {len(stream['years'])} years, {keyframes} keyframes every {stream['keyframeInterval']} years")
+    if changes:
+        print(f"  - {sum(changes) / len(changes):.1f} changed states per diff frame on average")
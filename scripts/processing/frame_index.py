@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Dense year x state index over the metrics frame
+Maps every (year, state) cell to its row offset in the frame, so point lookups
+are two dictionary hits and an array read instead of a boolean mask over every
+row. Rows are also kept sorted by (year, state), which makes a run of years one
+contiguous slice of row offsets. Metric columns are gathered lazily into
+year x state arrays; a year is a row of that array and a state a column, both
+zero-copy views.
+
+Years are sorted and states keep their order of first appearance, like
+create_state_timeline. A cell that appears more than once points at its first
+row (see `duplicates`).
+
+processData.py --dense-index saves the offsets and the metric arrays to
+data/outputs/yearStateIndex.npz; load_index() reads them back without the frame.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from apportionment import METHOD_COLUMNS
+
+INDEX_PATH = Path('data/outputs/yearStateIndex.npz')
+
+# Metrics frame columns saved with the index
+INDEX_COLUMNS = [
+    'Electoral_Votes', 'Winner_EV', 'Runner_Up_EV', 'Population', 'Population_Per_EV', 'National_Pop_Per_EV',
+    'Representation_Ratio', 'Hypothetical_EVs', 'EV_Difference', *METHOD_COLUMNS.values(), 'Is_Split_State',
+]
+
+def _missing_value(values):
+    """Fill for cells without a row: NaN for numbers, False for flags, None otherwise"""
+    if values.dtype.kind == 'f':
+        return np.nan
+    if values.dtype.kind == 'b':
+        return False
+    return None
+
+def _column_values(series):
+    """A frame column as a NumPy array: bool flags, float numbers (NaN for missing) or objects"""
+    if pd.api.types.is_bool_dtype(series.dtype) and not series.isna().any():
+        return series.to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    return series.astype(object).where(series.notna(), None).to_numpy(dtype=object)
+
+class YearStateIndex:
+    """O(1) (year, state) lookups and zero-copy year or state slices of frame metrics"""
+
+    def __init__(self, df=None, year_column='Year', state_column='State'):
+        self._frame = df
+        self._grids = {}
+        if df is None:
+            return
+
+        year_codes, years = pd.factorize(df[year_column], sort=True)
+        state_codes, states = pd.factorize(df[state_column])
+        self._set_labels([int(year) for year in years], list(states))
+
+        # Counting sort of the rows by cell: a cell's rows are order[bounds[c]:bounds[c + 1]]
+        cells = year_codes.astype(np.int64) * len(self.states) + state_codes
+        self.order = np.argsort(cells, kind='stable')
+        counts = np.bincount(cells, minlength=len(self.years) * len(self.states))
+        self.bounds = np.concatenate(([0], np.cumsum(counts)))
+
+        occupied = counts > 0
+        offsets = np.full(counts.shape, -1, dtype=np.int64)
+        offsets[occupied] = self.order[self.bounds[:-1][occupied]]
+        self.offsets = offsets.reshape(self.shape)
+        self.duplicates = int((counts > 1).sum())
+
+    def _set_labels(self, years, states):
+        self.years = years
+        self.states = states
+        self._year_positions = {year: position for position, year in enumerate(years)}
+        self._state_positions = {state: position for position, state in enumerate(states)}
+
+    @property
+    def shape(self):
+        return len(self.years), len(self.states)
+
+    @property
+    def present(self):
+        """Boolean year x state array of cells that have a row"""
+        return self.offsets >= 0
+
+    def year_position(self, year):
+        return self._year_positions[int(year)]
+
+    def state_position(self, state):
+        return self._state_positions[state]
+
+    def __contains__(self, cell):
+        year, state = cell
+        return self.row(year, state) is not None
+
+    def row(self, year, state):
+        """Frame row offset of a (year, state) cell, or None"""
+        year_position = self._year_positions.get(int(year))
+        state_position = self._state_positions.get(state)
+        if year_position is None or state_position is None:
+            return None
+        offset = self.offsets[year_position, state_position]
+        return int(offset) if offset >= 0 else None
+
+    def year_rows(self, start, end=None):
+        """Row offsets for years start..end (inclusive), sorted by year then state
+
+        The result is a view into the sorted row order, not a copy.
+        """
+        end = start if end is None else end
+        low = np.searchsorted(self.years, start, side='left')
+        high = np.searchsorted(self.years, end, side='right')
+        width = len(self.states)
+        return self.order[self.bounds[low * width]:self.bounds[high * width]]
+
+    def state_rows(self, state):
+        """Row offsets of one state, in year order"""
+        offsets = self.offsets[:, self.state_position(state)]
+        return offsets[offsets >= 0]
+
+    def grid(self, column):
+        """Dense year x state array of a frame column (computed once, then cached)"""
+        if column not in self._grids:
+            if self._frame is None:
+                raise KeyError(f"{column} was not saved with this index")
+            values = _column_values(self._frame[column])
+            grid = np.full(self.shape, _missing_value(values), dtype=values.dtype)
+            present = self.present
+            grid[present] = values[self.offsets[present]]
+            grid.flags.writeable = False
+            self._grids[column] = grid
+        return self._grids[column]
+
+    def value(self, column, year, state):
+        """One cell of a column, or None when the cell has no row"""
+        year_position = self._year_positions.get(int(year))
+        state_position = self._state_positions.get(state)
+        if year_position is None or state_position is None or self.offsets[year_position, state_position] < 0:
+            return None
+        return self.grid(column)[year_position, state_position]
+
+    def by_year(self, column, year):
+        """Every state's value of a column in one year (a view, in state order)"""
+        return self.grid(column)[self.year_position(year)]
+
+    def by_state(self, column, state):
+        """One state's value of a column in every year (a strided view, in year order)"""
+        return self.grid(column)[:, self.state_position(state)]
+
+    def save(self, path=INDEX_PATH, columns=INDEX_COLUMNS):
+        """Write the labels, offsets and the dense arrays of the given columns; returns the size in bytes"""
+        arrays = {
+            'years': np.asarray(self.years, dtype=np.int64),
+            'states': np.asarray(self.states, dtype=str),
+            'offsets': self.offsets,
+        }
+        for column in columns:
+            if self._frame is not None and column not in self._frame:
+                continue
+            grid = self.grid(column)
+            if grid.dtype == object:
+                raise TypeError(f"{column} is not numeric and cannot be saved with the index")
+            arrays[f"column:{column}"] = grid
+
+        # npz members carry timestamps, so an unchanged index is left untouched
+        path = Path(path)
+        if path.exists():
+            with np.load(path, allow_pickle=False) as saved:
+                unchanged = set(saved.files) == set(arrays) and all(
+                    saved[name].dtype == array.dtype and np.array_equal(saved[name], array, equal_nan=array.dtype.kind == 'f')
+                    for name, array in arrays.items())
+            if unchanged:
+                return path.stat().st_size
+
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+        return path.stat().st_size
+
+def merge_index(df, previous, partial, affected_years):
+    """Index over the whole raw frame, with arrays from partial for the affected years and previous elsewhere
+
+    Used by incremental builds, where only the affected years' metrics are recomputed.
+    """
+    index = YearStateIndex(df)
+    index._frame = None
+    for column in previous._grids:
+        merged = None
+        for source, from_partial in ((previous, False), (partial, True)):
+            years = [year for year in source.years
+                     if (year in affected_years) == from_partial and year in index._year_positions]
+            states = [state for state in source.states if state in index._state_positions]
+            values = source.grid(column)
+            if merged is None:
+                merged = np.full(index.shape, _missing_value(values), dtype=values.dtype)
+            target = np.ix_([index.year_position(year) for year in years],
+                            [index.state_position(state) for state in states])
+            merged[target] = values[np.ix_([source.year_position(year) for year in years],
+                                           [source.state_position(state) for state in states])]
+        merged[~index.present] = _missing_value(merged)
+        merged.flags.writeable = False
+        index._grids[column] = merged
+    return index
+
+def load_index(path=INDEX_PATH):
+    """Read an index written by YearStateIndex.save; its arrays are available without the frame"""
+    index = YearStateIndex()
+    with np.load(path, allow_pickle=False) as saved:
+        index._set_labels(saved['years'].tolist(), saved['states'].tolist())
+        index.offsets = saved['offsets']
+        index.duplicates = 0
+        for name in saved.files:
+            if name.startswith('column:'):
+                grid = saved[name]
+                grid.flags.writeable = False
+                index._grids[name[len('column:'):]] = grid
+
+    # Rebuild the sorted row order from the offsets (one row per cell)
+    present = index.offsets.ravel() >= 0
+    index.order = index.offsets.ravel()[present]
+    index.bounds = np.concatenate(([0], np.cumsum(present)))
+    return index
+
+if __name__ == "__main__":
+    index = load_index(sys.argv[1] if len(sys.argv) > 1 else INDEX_PATH)
+    print(f"🗂️  {len(index.years)} years x {len(index.states)} states, {int(index.present.sum()):,} cells with rows")
+    for name, grid in index._grids.items():
+        print(f"  - {name}: {grid.dtype} {grid.shape}")
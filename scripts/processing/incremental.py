@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Incremental rebuild support for processData.py
+Tracks a content hash for every (Year, State) row of the root CSV plus a
+per-year digest. National_Pop_Per_EV couples every state in a year, so any
+changed row marks its whole year for recomputation; unchanged years are
+carried over from the previous outputs.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BUILD_STATE_PATH = Path('data/cache/build_state.json')
+BUILD_STATE_VERSION = 1
+
+def pipeline_fingerprint():
+    """Hash the processing code and library versions; any change forces a full rebuild"""
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.glob('*.py')):
+        digest.update(source.name.encode('utf-8'))
+        digest.update(source.read_bytes())
+    digest.update(f"pandas={pd.__version__};numpy={np.__version__}".encode('utf-8'))
+    return digest.hexdigest()
+
+def row_key(year, state):
+    """Key used for a (Year, State) row in the build state"""
+    return f"{int(year)}|{state}"
+
+def row_hashes(df):
+    """Return {'Year|State': hash} for every row, hashing all raw columns at once"""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    keys = [row_key(year, state) for year, state in zip(df['Year'].tolist(), df['State'].tolist())]
+    return dict(zip(keys, (format(value, '016x') for value in hashes.tolist())))
+
+def year_digests(hashes):
+    """Combine row hashes into one digest per year (the year's dependency record)"""
+    by_year = {}
+    for key in sorted(hashes):
+        year = key.split('|', 1)[0]
+        by_year.setdefault(year, hashlib.sha256()).update(f"{key}={hashes[key]};".encode('utf-8'))
+    return {year: digest.hexdigest() for year, digest in by_year.items()}
+
+def load_build_state(path=BUILD_STATE_PATH):
+    """Load the previous build state, or None if there is no usable one"""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    with open(path, 'r') as f:
+        state = json.load(f)
+
+    if state.get('version') != BUILD_STATE_VERSION:
+        return None
+    return state
+
+def save_build_state(hashes, options, path=BUILD_STATE_PATH):
+    """Record row hashes, year digests and output options for the next run"""
+    state = {
+        'version': BUILD_STATE_VERSION,
+        'pipeline': pipeline_fingerprint(),
+        'options': options,
+        'years': year_digests(hashes),
+        'rows': hashes,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def plan_rebuild(hashes, options, required_outputs, path=BUILD_STATE_PATH):
+    """Decide what to rebuild
+
+    Returns (None, None) when a full rebuild is needed, otherwise the set of
+    affected years and the list of changed 'Year|State' keys (both possibly empty).
+    """
+    previous = load_build_state(path)
+    if previous is None:
+        print("♻️  No previous build state, running a full rebuild")
+        return None, None
+    if previous.get('pipeline') != pipeline_fingerprint():
+        print("♻️  Processing code changed since the last build, running a full rebuild")
+        return None, None
+    if previous.get('options') != options:
+        print("♻️  Output options changed since the last build, running a full rebuild")
+        return None, None
+    missing = [str(output) for output in required_outputs if not Path(output).exists()]
+    if missing:
+        print(f"♻️  Missing outputs {missing}, running a full rebuild")
+        return None, None
+
+    old_hashes = previous['rows']
+    changed_keys = sorted(
+        key for key in set(hashes) | set(old_hashes)
+        if hashes.get(key) != old_hashes.get(key)
+    )
+
+    digests = year_digests(hashes)
+    old_digests = previous['years']
+    affected_years = {
+        int(year) for year in set(digests) | set(old_digests)
+        if digests.get(year) != old_digests.get(year)
+    }
+
+    return affected_years, changed_keys
+
+def merge_timelines(previous, partial, state_order, affected_years):
+    """Replace the affected years' entries of a previous stateTimelines structure"""
+    merged = {}
+    for state in state_order:
+        entries = [
+            entry for entry in previous.get(state, {}).get('timeline', [])
+            if entry['year'] not in affected_years
+        ]
+        entries.extend(partial.get(state, {}).get('timeline', []))
+        if entries:
+            entries.sort(key=lambda entry: entry['year'])
+            merged[state] = {'name': state, 'timeline': entries}
+    return merged
+
+def merge_year_summaries(previous, partial, affected_years):
+    """Replace the affected years of a previous yearSummaries structure (keys become ints)"""
+    merged = {int(year): summary for year, summary in previous.items() if int(year) not in affected_years}
+    merged.update({int(year): summary for year, summary in partial.items()})
+    return dict(sorted(merged.items()))
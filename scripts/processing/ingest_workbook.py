@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Ingest data/raw/electoral_data_final.xlsx into the root CSV schema
+The workbook holds the results (Electoral_Votes sheet) and a long table of
+state populations (Population_Data sheet). Sheets are streamed straight from
+the .xlsx zip with iterparse, one row at a time, and parsed in parallel
+processes; no spreadsheet library is needed. The converted rows are cached
+under data/cache keyed by the workbook's SHA-256, so an unchanged workbook is
+never parsed twice.
+
+Prints a row-level diff against data/raw/electoral_enhanced.csv; --write
+replaces the CSV with the workbook's rows. Corrections in data/corrections
+are not part of the workbook, so run apply_corrections.py after a refresh.
+"""
+
+import argparse
+import io
+import os
+import posixpath
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+import pandas as pd
+
+from loader import CACHE_DIR, CSV_PATH, SCHEMA, file_hash, load_electoral_data, parse_csv
+
+WORKBOOK_PATH = Path('data/raw/electoral_data_final.xlsx')
+CONVERTER_VERSION = 1
+VOTES_SHEET = 'Electoral_Votes'
+POPULATION_SHEET = 'Population_Data'
+KEY_COLUMNS = ['Year', 'State']
+FLOAT_TOLERANCE = 1e-9
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+def _column_position(reference):
+    """Zero-based column of a cell reference such as 'AB12'"""
+    position = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        position = position * 26 + ord(char.upper()) - 64
+    return position - 1
+
+def _text(element):
+    """Concatenated <t> text of a shared or inline string (rich text runs included)"""
+    return ''.join(node.text or '' for node in element.iter(f'{MAIN_NS}t'))
+
+def shared_strings(archive):
+    """The workbook's shared string table"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, element in iterparse(f):
+            if element.tag == f'{MAIN_NS}si':
+                strings.append(_text(element))
+                element.clear()
+    return strings
+
+def sheet_paths(archive):
+    """{sheet name: zip member} from the workbook and its relationships"""
+    with archive.open('xl/_rels/workbook.xml.rels') as f:
+        targets = {
+            element.get('Id'): element.get('Target')
+            for _, element in iterparse(f) if element.tag == f'{PACKAGE_RELATIONSHIP_NS}Relationship'
+        }
+    with archive.open('xl/workbook.xml') as f:
+        sheets = [element for _, element in iterparse(f) if element.tag == f'{MAIN_NS}sheet']
+
+    paths = {}
+    for sheet in sheets:
+        target = targets[sheet.get(f'{RELATIONSHIP_NS}id')]
+        paths[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+    return paths
+
+def _cell_value(cell, strings):
+    kind = cell.get('t', 'n')
+    if kind == 'inlineStr':
+        return _text(cell)
+    value = cell.find(f'{MAIN_NS}v')
+    if value is None or value.text is None:
+        return None
+    if kind == 's':
+        return strings[int(value.text)]
+    if kind == 'str':
+        return value.text
+    if kind == 'b':
+        return value.text == '1'
+    if kind == 'e':
+        return None
+    number = float(value.text)
+    return int(number) if number.is_integer() else number
+
+def read_sheet_rows(workbook_path, member, strings):
+    """Every row of one sheet as a list of values, streamed with iterparse"""
+    rows = []
+    with zipfile.ZipFile(workbook_path) as archive, archive.open(member) as f:
+        for _, element in iterparse(f):
+            if element.tag != f'{MAIN_NS}row':
+                continue
+            row = []
+            for cell in element.iter(f'{MAIN_NS}c'):
+                position = _column_position(cell.get('r', '')) if cell.get('r') else len(row)
+                row.extend([None] * (position - len(row)))
+                row.append(_cell_value(cell, strings))
+            rows.append(row)
+            element.clear()
+    return rows
+
+def read_workbook(workbook_path=WORKBOOK_PATH, sheets=(VOTES_SHEET, POPULATION_SHEET), workers=None):
+    """{sheet name: DataFrame} with the first row as the header; sheets are parsed in parallel"""
+    with zipfile.ZipFile(workbook_path) as archive:
+        strings = shared_strings(archive)
+        paths = sheet_paths(archive)
+    missing = [sheet for sheet in sheets if sheet not in paths]
+    if missing:
+        raise ValueError(f"{workbook_path} has no sheet named {missing}; found {list(paths)}")
+
+    workers = min(len(sheets), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(read_sheet_rows, workbook_path, paths[sheet], strings) for sheet in sheets]
+            results = [job.result() for job in jobs]
+    else:
+        results = [read_sheet_rows(workbook_path, paths[sheet], strings) for sheet in sheets]
+
+    frames = {}
+    for sheet, rows in zip(sheets, results):
+        header = rows[0] if rows else []
+        width = len(header)
+        frames[sheet] = pd.DataFrame([(row + [None] * width)[:width] for row in rows[1:]], columns=header)
+    return frames
+
+def convert_workbook(frames):
+    """Root CSV text built from the workbook sheets: results joined with population, plus Population_Per_EV"""
+    votes = frames[VOTES_SHEET]
+    population = frames[POPULATION_SHEET][KEY_COLUMNS + ['Population']]
+    if population.duplicated(KEY_COLUMNS).any():
+        raise ValueError(f"{POPULATION_SHEET} has duplicate (Year, State) rows")
+
+    converted = votes.merge(population, on=KEY_COLUMNS, how='left', validate='many_to_one')
+    electoral_votes = pd.to_numeric(converted['Electoral_Votes'], errors='coerce')
+    converted['Population'] = pd.to_numeric(converted['Population'], errors='coerce').astype(float)
+    converted['Population_Per_EV'] = converted['Population'] / electoral_votes.where(electoral_votes > 0)
+
+    missing = [column for column in SCHEMA if column not in converted]
+    if missing:
+        raise ValueError(f"{VOTES_SHEET} is missing columns {missing}")
+    return converted[list(SCHEMA)].to_csv(index=False)
+
+def _cache_path(digest):
+    return CACHE_DIR / f"workbook-{digest[:16]}-v{CONVERTER_VERSION}.csv"
+
+def load_workbook(workbook_path=WORKBOOK_PATH, workers=None):
+    """The workbook converted to the typed root frame, parsing the .xlsx only when its hash is new
+
+    Returns (frame, whether the cache was used).
+    """
+    cache_path = _cache_path(file_hash(workbook_path))
+    if cache_path.exists():
+        return parse_csv(cache_path), True
+
+    content = convert_workbook(read_workbook(workbook_path, workers=workers))
+    cache_path.parent.mkdir(exist_ok=True, parents=True)
+    temporary = cache_path.with_name(cache_path.name + '.tmp')
+    temporary.write_text(content)
+    os.replace(temporary, cache_path)
+    return parse_csv(io.StringIO(content)), False
+
+def diff_frames(current, incoming):
+    """Row-level differences between two root frames keyed by (Year, State)
+
+    Returns (added keys, removed keys, changes frame with Year, State, field, old, new).
+    """
+    current = current.astype({column: object for column in SCHEMA if column not in KEY_COLUMNS})
+    incoming = incoming.astype({column: object for column in SCHEMA if column not in KEY_COLUMNS})
+    merged = current.merge(incoming, on=KEY_COLUMNS, how='outer', suffixes=('_old', '_new'), indicator=True)
+
+    added = merged.loc[merged['_merge'] == 'right_only', KEY_COLUMNS]
+    removed = merged.loc[merged['_merge'] == 'left_only', KEY_COLUMNS]
+    both = merged[merged['_merge'] == 'both']
+
+    changes = []
+    for field in SCHEMA:
+        if field in KEY_COLUMNS:
+            continue
+        old, new = both[f'{field}_old'], both[f'{field}_new']
+        differs = (old.isna() != new.isna()) | (old.notna() & new.notna() & (old != new))
+        if SCHEMA[field] == 'float64':
+            # Derived ratios differ in the last digits depending on the tool that computed them
+            close = np.isclose(old.astype(float), new.astype(float), rtol=FLOAT_TOLERANCE, atol=0)
+            differs &= ~close
+        if differs.any():
+            changes.append(pd.DataFrame({
+                'Year': both.loc[differs, 'Year'], 'State': both.loc[differs, 'State'],
+                'field': field, 'old': old[differs], 'new': new[differs],
+            }))
+    changes = pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(columns=KEY_COLUMNS + ['field', 'old', 'new'])
+    return added, removed, changes.sort_values(KEY_COLUMNS, kind='stable')
+
+def print_diff(added, removed, changes, limit):
+    for label, keys in (('New', added), ('Removed', removed)):
+        for year, state in keys.head(limit).itertuples(index=False):
+            print(f"{label} row: {year} {state}")
+
+    shown = 0
+    for (year, state), rows in changes.groupby(KEY_COLUMNS, sort=False):
+        if shown >= limit:
+            print(f"  ... {changes[KEY_COLUMNS].drop_duplicates().shape[0] - shown} more changed rows")
+            break
+        print(f"Changed {year} {state}:")
+        for field, old, new in rows[['field', 'old', 'new']].itertuples(index=False):
+            print(f"  {field}: {old} → {new}")
+        shown += 1
+
+def main(argv=None):
+    """Convert the workbook, report how it differs from the CSV and optionally replace the CSV"""
+    parser = argparse.ArgumentParser(description="Convert electoral_data_final.xlsx to the root CSV schema")
+    parser.add_argument('--workbook', type=Path, default=WORKBOOK_PATH, help="workbook to ingest")
+    parser.add_argument('--workers', type=int, default=None, help="processes for parsing sheets (default: one per sheet)")
+    parser.add_argument('--limit', type=int, default=20, help="changed rows to list (the counts are always complete)")
+    parser.add_argument('--write', action='store_true', help=f"replace {CSV_PATH} with the workbook's rows")
+    args = parser.parse_args(argv)
+
+    print(f"📗 Ingesting {args.workbook}...")
+    started = time.perf_counter()
+    incoming, cached = load_workbook(args.workbook, workers=args.workers)
+    source = "cached conversion (workbook unchanged)" if cached else "parsed workbook"
+    print(f"✅ {len(incoming):,} rows from {source} in {time.perf_counter() - started:.2f}s")
+
+    added, removed, changes = diff_frames(load_electoral_data(categorical=False), incoming)
+    changed_rows = len(changes[KEY_COLUMNS].drop_duplicates())
+    print_diff(added, removed, changes, args.limit)
+    print(f"\n📊 {len(added)} new rows, {len(removed)} removed rows, "
+          f"{len(changes)} field changes across {changed_rows} rows")
+
+    if not (len(added) or len(removed) or len(changes)):
+        print("✅ CSV already matches the workbook")
+    elif args.write:
+        incoming.to_csv(CSV_PATH, index=False)
+        print(f"💾 Saved workbook rows to {CSV_PATH}; rerun apply_corrections.py to reapply data/corrections")
+    else:
+        print("🔎 Report only, rerun with --write to replace the CSV")
+
+if __name__ == "__main__":
+    main()
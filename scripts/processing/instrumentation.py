@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Stage-level instrumentation for the processing pipeline
+Records wall time, CPU time, tracemalloc allocations and row counts for every
+stage of processData.main. Memory per stage is the tracemalloc peak above
+what was allocated when the stage started; RSS is only reported once, as the
+process peak of the whole run, since its high-water mark never drops between
+stages. Enabled with --profile or the ELECTORAL_PROFILE environment variable
+(1 for the default directory, or a directory path); when disabled, stages
+cost one context manager call.
+
+Writes two files to the profile directory:
+    profile.json        - one record per stage plus run totals
+    profile.trace.json  - Chrome trace events (open in chrome://tracing or Perfetto)
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROFILE_ENV = 'ELECTORAL_PROFILE'
+PROFILE_DIR = Path('data/cache/profile')
+
+def peak_rss():
+    """Process peak resident set size in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def profile_dir_from_env():
+    """Profile directory requested through ELECTORAL_PROFILE, or None"""
+    value = os.environ.get(PROFILE_ENV, '').strip()
+    if value.lower() in ('', '0', 'false', 'no'):
+        return None
+    return PROFILE_DIR if value.lower() in ('1', 'true', 'yes') else Path(value)
+
+class StageProfiler:
+    """Collects one measurement per pipeline stage
+
+    Use `with profiler.stage('name', rows_in=n) as record:` and set
+    record['rowsOut'] inside the block. Stages are sequential, not nested.
+    """
+
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+        self._started = time.perf_counter()
+        self._started_at = datetime.now(timezone.utc)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = {'stage': name, 'rowsIn': rows_in, 'rowsOut': None}
+        if not self.enabled:
+            yield record
+            return
+
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            start_traced = tracemalloc.get_traced_memory()[0]
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            end_wall = time.perf_counter()
+            record.update({
+                'start': start_wall - self._started,
+                'seconds': end_wall - start_wall,
+                'cpuSeconds': time.process_time() - start_cpu,
+            })
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['allocatedBytes'] = current - start_traced
+                record['tracemallocPeakBytes'] = peak - start_traced
+            self.stages.append(record)
+
+    def to_dict(self):
+        return {
+            'startedAt': self._started_at.isoformat(timespec='seconds'),
+            'totalSeconds': time.perf_counter() - self._started,
+            'processPeakRssBytes': peak_rss(),
+            'tracemalloc': self.trace_memory,
+            'stages': self.stages,
+        }
+
+    def chrome_trace(self):
+        """Stages as complete ('X') events in the Chrome trace event format"""
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'processData'}}]
+        for record in self.stages:
+            events.append({
+                'name': record['stage'],
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': record['start'] * 1e6,
+                'dur': record['seconds'] * 1e6,
+                'pid': pid,
+                'tid': 0,
+                'args': {key: value for key, value in record.items() if key not in ('stage', 'start', 'seconds')},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, directory=PROFILE_DIR):
+        """Write profile.json and profile.trace.json, returning their paths"""
+        directory = Path(directory)
+        directory.mkdir(exist_ok=True, parents=True)
+        paths = directory / 'profile.json', directory / 'profile.trace.json'
+        with open(paths[0], 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(paths[1], 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return paths
+
+    def print_summary(self):
+        print("⏱️  Stage profile:")
+        for record in self.stages:
+            memory = f", {record['tracemallocPeakBytes'] / 2**20:7.1f} MiB peak alloc" if self.trace_memory else ''
+            rows = f"{record['rowsIn'] if record['rowsIn'] is not None else '-':>8} → {record['rowsOut'] if record['rowsOut'] is not None else '-':<8}"
+            print(f"  - {record['stage']:<22} {record['seconds']:8.3f}s wall {record['cpuSeconds']:8.3f}s cpu{memory}, rows {rows}")
+        print(f"  Process peak RSS {peak_rss() / 2**20:.0f} MiB")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON writer for the pipeline outputs
+Serializes a top-level mapping one entry at a time (e.g. one state's
+timeline), so only a single entry's text is in memory, and writes a gzip and,
+when the brotli package is installed, a brotli sibling in the same pass for
+static hosts that serve precompressed assets. Output is compact unless an
+indent is given, keys keep insertion order and floats are rounded to
+FLOAT_DIGITS decimals, so the bytes are deterministic. The timeline and
+summary builders already round their floats the same way, so shards, the
+columnar export and incremental merges of the reloaded JSON all see the
+values the JSON files hold.
+"""
+
+import filecmp
+import gzip
+import json
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FLOAT_DIGITS = 6
+
+def round_floats(value, digits=FLOAT_DIGITS):
+    """Copy of a JSON-ready value with every float rounded"""
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: round_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [round_floats(item, digits) for item in value]
+    return value
+
+def iter_json_chunks(data, indent=None, digits=FLOAT_DIGITS):
+    """Yield the JSON text of data in pieces, one top-level entry per piece
+
+    Joining the pieces gives the same text as json.dumps(data, indent=indent)
+    after rounding floats.
+    """
+    separators = (',', ':') if indent is None else (',', ': ')
+    if not isinstance(data, dict) or not data:
+        yield json.dumps(round_floats(data, digits), indent=indent, separators=separators)
+        return
+
+    newline = '' if indent is None else '\n' + ' ' * indent
+    yield '{'
+    for position, (key, value) in enumerate(data.items()):
+        text = json.dumps(round_floats(value, digits), indent=indent, separators=separators)
+        if indent is not None:
+            text = text.replace('\n', newline)
+        prefix = ',' if position else ''
+        yield f"{prefix}{newline}{json.dumps(str(key))}{separators[1]}{text}"
+    yield '}' if indent is None else '\n}'
+
+def compressed_suffixes():
+    """Precompressed siblings written next to every file"""
+    return ['.gz', '.br'] if brotli is not None else ['.gz']
+
+def write_if_changed(path, content):
+    """Write bytes to path unless it already holds exactly them; returns True when the file changed"""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(content) and path.read_bytes() == content:
+        return False
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+    return True
+
+def write_json_stream(path, data, indent=None, compress=True):
+    """Stream data to path (plus .gz/.br siblings), replacing files only when their bytes change
+
+    Returns True when the JSON file itself changed.
+    """
+    path = Path(path)
+    suffixes = compressed_suffixes() if compress else []
+    targets = [path] + [path.with_name(path.name + suffix) for suffix in suffixes]
+    temporaries = [target.with_name(target.name + '.tmp') for target in targets]
+
+    with open(temporaries[0], 'wb') as plain:
+        compressed = []
+        if '.gz' in suffixes:
+            # mtime=0 and no file name keep the gzip bytes reproducible
+            gz_file = open(temporaries[1], 'wb')
+            compressed.append((gz_file, gzip.GzipFile(filename='', mode='wb', fileobj=gz_file, compresslevel=9, mtime=0)))
+        if '.br' in suffixes:
+            compressor = brotli.Compressor(quality=11)
+            br_file = open(temporaries[2], 'wb')
+
+        for chunk in iter_json_chunks(data, indent):
+            encoded = chunk.encode('utf-8')
+            plain.write(encoded)
+            for _, stream in compressed:
+                stream.write(encoded)
+            if '.br' in suffixes:
+                br_file.write(compressor.process(encoded))
+
+        for raw, stream in compressed:
+            stream.close()
+            raw.close()
+        if '.br' in suffixes:
+            br_file.write(compressor.finish())
+            br_file.close()
+
+    changed = False
+    for position, (temporary, target) in enumerate(zip(temporaries, targets)):
+        if target.exists() and filecmp.cmp(temporary, target, shallow=False):
+            temporary.unlink()
+            continue
+        os.replace(temporary, target)
+        changed = changed or position == 0
+    return changed
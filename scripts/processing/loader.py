@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Shared loader for the root electoral datasource
+Parses data/raw/electoral_enhanced.csv with an explicit schema and caches the
+typed frame in a binary file under data/cache, so repeated pipeline steps skip
+text parsing. The cache is reused while the CSV's mtime and size are unchanged,
+and revalidated by content hash when they are not.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - only needed for the Feather cache format
+    CACHE_FORMAT = 'feather'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+CSV_PATH = Path('data/raw/electoral_enhanced.csv')
+CACHE_DIR = Path('data/cache')
+SCHEMA_VERSION = 1
+
+# Explicit column types: repeated text becomes categorical, EV counts nullable ints
+SCHEMA = {
+    'Year': 'int64',
+    'State': 'category',
+    'Electoral_Votes': 'Int64',
+    'Winner': 'category',
+    'Winner_EV': 'Int64',
+    'Runner_Up': 'category',
+    'Runner_Up_EV': 'Int64',
+    'Total_EV_Cast': 'Int64',
+    'Notes': 'category',
+    'Winner_Party': 'category',
+    'RunnerUp_Party': 'category',
+    'Population': 'float64',
+    'Population_Per_EV': 'float64',
+}
+
+CATEGORICAL_COLUMNS = [column for column, dtype in SCHEMA.items() if dtype == 'category']
+
+def file_hash(path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _cache_paths(csv_path):
+    """Return (data file, metadata file) used to cache a CSV"""
+    stem = Path(csv_path).stem
+    return CACHE_DIR / f"{stem}.{CACHE_FORMAT}", CACHE_DIR / f"{stem}.meta.json"
+
+def _source_info(csv_path):
+    """Identify the CSV by mtime and size (cheap) - the hash is added only when needed"""
+    stat = Path(csv_path).stat()
+    return {
+        'source': str(csv_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'schema': SCHEMA_VERSION,
+        'format': CACHE_FORMAT,
+    }
+
+def _read_cache(data_path):
+    if CACHE_FORMAT == 'feather':
+        return pd.read_feather(data_path)
+    return pd.read_pickle(data_path)
+
+def _write_cache(df, data_path):
+    data_path.parent.mkdir(exist_ok=True, parents=True)
+    if CACHE_FORMAT == 'feather':
+        df.to_feather(data_path)
+    else:
+        df.to_pickle(data_path)
+
+def parse_csv(csv_path=CSV_PATH):
+    """Parse the CSV from text with the explicit schema (no cache)"""
+    return pd.read_csv(csv_path, dtype=SCHEMA)
+
+def _load_cached(csv_path):
+    """Return the typed frame for a CSV, from cache when it is still valid"""
+    data_path, meta_path = _cache_paths(csv_path)
+    info = _source_info(csv_path)
+
+    if data_path.exists() and meta_path.exists():
+        with open(meta_path, 'r') as f:
+            cached = json.load(f)
+        same_layout = all(cached.get(key) == info[key] for key in ('source', 'schema', 'format'))
+
+        if same_layout and cached['mtime_ns'] == info['mtime_ns'] and cached['size'] == info['size']:
+            return _read_cache(data_path)
+
+        # Touched but possibly identical (e.g. rewritten by a fix script): compare content
+        if same_layout and cached.get('sha256') == file_hash(csv_path):
+            with open(meta_path, 'w') as f:
+                json.dump(dict(cached, mtime_ns=info['mtime_ns'], size=info['size']), f, indent=2)
+            return _read_cache(data_path)
+
+    df = parse_csv(csv_path)
+    _write_cache(df, data_path)
+    with open(meta_path, 'w') as f:
+        json.dump(dict(info, sha256=file_hash(csv_path)), f, indent=2)
+    return df
+
+def load_electoral_data(csv_path=CSV_PATH, categorical=True):
+    """Load the root datasource with typed columns
+
+    With categorical=False the text columns are returned as plain objects,
+    which is what scripts that edit values and write the CSV back need.
+    """
+    df = _load_cached(Path(csv_path))
+    if not categorical:
+        df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype(object)
+    return df
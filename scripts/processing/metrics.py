@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Registry of the derived columns of the metrics frame
+Every metric declares the columns it reads and a vectorized function that
+computes its column(s) from the frame. MetricsEngine resolves the columns an
+output reads into the metrics behind them and computes those in dependency
+order, straight into the frame. Each metric runs at most once per engine, and
+a metric that no requested column depends on does not run at all. Columns no
+metric produces are read from the frame as loaded.
+
+A new metric is one decorated function:
+
+    @metric('Population_Per_EV', inputs=['Population', 'Electoral_Votes'])
+    def population_per_ev(df):
+        return df['Population'] / df['Electoral_Votes']
+
+A metric that produces several columns lists them all and returns a
+{column: values} mapping or a frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from apportionment import METHOD_COLUMNS, apportion_frame
+from notes_classifier import NOTE_COLUMNS, default_classifier
+from party_inference import default_matcher
+from power_index import frame_power_indices
+
+class Metric:
+    """A registered function with the columns it reads and the columns it produces"""
+
+    def __init__(self, columns, inputs, compute):
+        self.name = compute.__name__
+        self.columns = list(columns)
+        self.inputs = list(inputs)
+        self.compute = compute
+
+# Column -> the Metric that produces it
+METRICS = {}
+
+def metric(columns, inputs):
+    """Decorator registering a metric function for one column or a list of columns"""
+    columns = [columns] if isinstance(columns, str) else list(columns)
+
+    def register(compute):
+        entry = Metric(columns, inputs, compute)
+        for column in columns:
+            if column in METRICS:
+                raise ValueError(f"{column} is already produced by {METRICS[column].name}")
+            METRICS[column] = entry
+        return compute
+    return register
+
+class MetricsEngine:
+    """Adds requested metric columns to one frame, computing each metric at most once"""
+
+    def __init__(self, df, registry=METRICS):
+        self.df = df
+        self.registry = registry
+        self.computed = set()
+
+    def plan(self, columns):
+        """Metrics that computing these columns would still run, in dependency order"""
+        order = {}
+        for column in columns:
+            self._visit(column, (), order)
+        return list(order.values())
+
+    def require(self, columns):
+        """Compute whatever the columns need and return the frame"""
+        for entry in self.plan(columns):
+            values = entry.compute(self.df)
+            if not isinstance(values, (dict, pd.DataFrame)):
+                values = {entry.columns[0]: values}
+            for column in entry.columns:
+                self.df[column] = values[column]
+            self.computed.add(entry.name)
+        return self.df
+
+    def _visit(self, column, path, order):
+        entry = self.registry.get(column)
+        if entry is None:
+            if column not in self.df:
+                raise KeyError(f"{column} is neither a frame column nor a registered metric")
+            return
+        if entry.name in self.computed or entry.name in order:
+            return
+        if entry.name in path:
+            raise ValueError(f"Metrics depend on each other in a cycle: {' -> '.join(path + (entry.name,))}")
+        for dependency in entry.inputs:
+            self._visit(dependency, path + (entry.name,), order)
+        order[entry.name] = entry
+
+def _corrected_party(df, party_column, candidate_column, label):
+    """A party column with 'Unknown' for missing parties, inferred from candidate names where possible"""
+    party = df[party_column].astype(object).fillna('Unknown')
+    missing = party.isin(['Unknown', '', None]) | party.isna()
+    if missing.any():
+        print(f"🔧 Found {missing.sum()} rows with missing {label} party data, trying candidate name inference...")
+        inferred = default_matcher().infer_column(df.loc[missing, candidate_column]).dropna()
+        party.loc[inferred.index] = inferred
+    return party
+
+@metric('Corrected_Winner_Party', inputs=['Winner_Party', 'Winner'])
+def corrected_winner_party(df):
+    # Each row has its own winner party; candidate names only fill the gaps
+    return _corrected_party(df, 'Winner_Party', 'Winner', 'winner')
+
+@metric('Corrected_RunnerUp_Party', inputs=['RunnerUp_Party', 'Runner_Up'])
+def corrected_runner_up_party(df):
+    return _corrected_party(df, 'RunnerUp_Party', 'Runner_Up', 'runner-up')
+
+@metric('Is_Split_State', inputs=['Winner_EV', 'Runner_Up_EV', 'Electoral_Votes'])
+def is_split_state(df):
+    # A state is split if the winner didn't get all EVs and there are runner-up EVs (not party inference)
+    print("🔧 Handling split electoral states...")
+    split = (df['Winner_EV'] < df['Electoral_Votes']) & (df['Runner_Up_EV'] > 0)
+    return split.fillna(False).astype(bool)
+
+@metric(NOTE_COLUMNS, inputs=['Notes'])
+def notes_classification(df):
+    # Split type, faithless electors, disputes and named party, once per distinct note
+    return default_classifier().classify_column(df['Notes'])
+
+@metric('Population_Per_EV', inputs=['Population', 'Electoral_Votes'])
+def population_per_ev(df):
+    return (df['Population'] / df['Electoral_Votes']).replace([np.inf, -np.inf], np.nan)
+
+@metric('National_Pop_Per_EV', inputs=['Year', 'Population', 'Electoral_Votes'])
+def national_pop_per_ev(df):
+    # Each year's totals broadcast back to its rows, without merging a copy of the frame
+    totals = df.groupby('Year')[['Population', 'Electoral_Votes']].transform('sum')
+    return totals['Population'] / totals['Electoral_Votes']
+
+@metric('Representation_Ratio', inputs=['National_Pop_Per_EV', 'Population_Per_EV'])
+def representation_ratio(df):
+    # 1.0 = perfectly represented
+    return (df['National_Pop_Per_EV'] / df['Population_Per_EV']).replace([np.inf, -np.inf], np.nan)
+
+@metric('Hypothetical_EVs', inputs=['Population', 'National_Pop_Per_EV'])
+def hypothetical_evs(df):
+    # EVs under equal representation
+    return (df['Population'] / df['National_Pop_Per_EV']).round()
+
+@metric('EV_Difference', inputs=['Hypothetical_EVs', 'Electoral_Votes'])
+def ev_difference(df):
+    return df['Hypothetical_EVs'] - df['Electoral_Votes']
+
+@metric(list(METHOD_COLUMNS.values()), inputs=['Year', 'State', 'Population', 'Electoral_Votes'])
+def apportioned_evs(df):
+    # Each year's real EV total apportioned by population with proper methods (sums exactly)
+    return apportion_frame(df)
+
+@metric(['Banzhaf_Index', 'Shapley_Shubik_Index'], inputs=['Year', 'State', 'Electoral_Votes'])
+def voting_power(df):
+    # Banzhaf and Shapley-Shubik voting power, one weighted voting game over the EVs per year
+    return frame_power_indices(df)
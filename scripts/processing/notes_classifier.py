@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Notes column classification
+Free-text Notes ("Split by district", "2 faithless electors", "Disputed;
+awarded to Hayes", "Lincoln Republican") are classified by one compiled rule
+set. Rules run once per distinct note, over the categories of a categorical
+column, and the results are broadcast back to every row through the category
+codes, so the cost grows with the number of distinct notes, not rows.
+
+Produces, per row, when calculate_metrics is asked for NOTE_COLUMNS (the JSON
+outputs do not read them; validate_data.py does):
+    Split_Type         'district', 'complex' or 'vote' (None when not split)
+    Faithless_Electors number of faithless electors mentioned (0 when none)
+    Is_Disputed        the result was disputed
+    Notes_Party        party named by the note ('Split' for district splits),
+                       None when the note names none or defers to Winner_Party
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Checked in order: the first matching pattern decides the split type
+SPLIT_RULES = (
+    ('district', r'\bsplit by district\b'),
+    ('complex', r'\bcomplex split\b'),
+    ('vote', r'\bsplit\b'),
+)
+
+FAITHLESS_PATTERN = r'(\d+)\s+faithless\s+electors?\b'
+DISPUTED_PATTERN = r'\bdisputed\b'
+
+# Checked in order; None means "defer to the Winner_Party column". Party words
+# are case-sensitive substrings, so 'Jefferson Democratic-Republican' yields
+# 'Republican'
+NOTES_PARTY_RULES = (
+    (re.compile(r'Split by district'), 'Split'),
+    (re.compile(r'faithless electors', re.IGNORECASE), None),
+    (re.compile(r'(?=.*disputed)(?=.*awarded)', re.IGNORECASE | re.DOTALL), None),
+    (re.compile(r'Republican'), 'Republican'),
+    (re.compile(r'Democrat'), 'Democratic'),
+    (re.compile(r'Federalist'), 'Federalist'),
+    (re.compile(r'Whig'), 'Whig'),
+    (re.compile(r'Progressive'), 'Progressive'),
+    (re.compile(r'Did Not Vote'), 'Did Not Vote'),
+)
+
+# Otherwise the last of two or more words names the party, unless it is one of these
+NON_PARTY_WORDS = frozenset(['electors', 'elector', 'vote', 'votes', 'district', 'state', 'lost', 'won', 'split', 'home'])
+
+NOTE_COLUMNS = ['Split_Type', 'Faithless_Electors', 'Is_Disputed', 'Notes_Party']
+
+class NotesClassifier:
+    """Classify Notes strings with compiled rules, once per distinct value"""
+
+    def __init__(self, split_rules=SPLIT_RULES, party_rules=NOTES_PARTY_RULES):
+        self._split_rules = [(label, re.compile(pattern, re.IGNORECASE)) for label, pattern in split_rules]
+        self._faithless = re.compile(FAITHLESS_PATTERN, re.IGNORECASE)
+        self._disputed = re.compile(DISPUTED_PATTERN, re.IGNORECASE)
+        self._party_rules = party_rules
+
+    def _party(self, note):
+        for pattern, party in self._party_rules:
+            if pattern.search(note):
+                return party
+        words = note.strip().split()
+        if len(words) >= 2 and words[-1].lower() not in NON_PARTY_WORDS:
+            return words[-1]
+        return None
+
+    def classify(self, note):
+        """Classification of one note as {column: value}"""
+        if pd.isna(note) or note == '':
+            return {'Split_Type': None, 'Faithless_Electors': 0, 'Is_Disputed': False, 'Notes_Party': None}
+
+        note = str(note)
+        faithless = self._faithless.search(note)
+        return {
+            'Split_Type': next((label for label, pattern in self._split_rules if pattern.search(note)), None),
+            'Faithless_Electors': int(faithless.group(1)) if faithless else 0,
+            'Is_Disputed': bool(self._disputed.search(note)),
+            'Notes_Party': self._party(note),
+        }
+
+    def classify_column(self, notes):
+        """Classify a whole Notes column; returns a frame of NOTE_COLUMNS aligned with notes"""
+        notes = pd.Series(notes)
+        categorical = notes.array if isinstance(notes.dtype, pd.CategoricalDtype) else pd.Categorical(notes.astype(object))
+        table = pd.DataFrame([self.classify(note) for note in categorical.categories], columns=NOTE_COLUMNS)
+
+        # Missing notes (code -1) take the last row: the classification of an empty note
+        table.loc[len(table)] = self.classify(None)
+        rows = table.iloc[np.where(categorical.codes < 0, len(table) - 1, categorical.codes)]
+        return pd.DataFrame({
+            'Split_Type': pd.Categorical(rows['Split_Type'], categories=[label for label, _ in self._split_rules]),
+            'Faithless_Electors': rows['Faithless_Electors'].to_numpy(dtype=np.int64),
+            'Is_Disputed': rows['Is_Disputed'].to_numpy(dtype=bool),
+            # Kept as objects so a missing party stays None (pandas would infer a string dtype with NaN)
+            'Notes_Party': pd.Series(
+                rows['Notes_Party'].where(rows['Notes_Party'].notna(), None).to_numpy(dtype=object),
+                index=notes.index, dtype=object),
+        }, index=notes.index)
+
+_default_classifier = None
+
+def default_classifier():
+    """Shared classifier built from the module rule tables"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = NotesClassifier()
+    return _default_classifier
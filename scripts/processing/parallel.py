@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Parallel output generation
+Runs the output builders and their file writes on a process pool. The metrics
+frame is copied once into a shared-memory block (numeric columns, nullable
+masks and categorical codes); tasks receive only a small spec and rebuild the
+frame as zero-copy NumPy views instead of unpickling it.
+
+Every output file is produced by exactly one task and shards are split into
+fixed year and state groups, so the files are identical for any worker count.
+"""
+
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from json_writer import write_json_stream
+
+ALIGNMENT = 64
+MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+class SharedFrame:
+    """A DataFrame's columns laid out in one shared-memory block"""
+
+    def __init__(self, df):
+        arrays = []
+        columns = []
+        for name in df.columns:
+            series = df[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                spec = {'kind': 'category', 'categories': series.cat.categories.tolist(),
+                        'ordered': series.cat.ordered}
+                parts = [series.cat.codes.to_numpy()]
+            elif isinstance(series.array, MASKED_ARRAYS):
+                spec = {'kind': 'masked', 'dtype': str(series.dtype)}
+                numpy_dtype = series.dtype.numpy_dtype
+                parts = [series.to_numpy(dtype=numpy_dtype, na_value=numpy_dtype.type(0)), series.isna().to_numpy()]
+            elif isinstance(series.dtype, np.dtype) and series.dtype != object:
+                spec = {'kind': 'numpy'}
+                parts = [series.to_numpy()]
+            else:
+                # Strings and other Python objects travel as codes into a small list of uniques
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                spec = {'kind': 'object', 'dtype': str(series.dtype), 'uniques': list(uniques)}
+                parts = [codes]
+            spec['name'] = name
+            spec['arrays'] = [len(arrays) + position for position in range(len(parts))]
+            arrays.extend(np.ascontiguousarray(part) for part in parts)
+            columns.append(spec)
+
+        if not isinstance(df.index, pd.RangeIndex):
+            arrays.append(np.ascontiguousarray(df.index.to_numpy()))
+        layout, size = [], 0
+        for array in arrays:
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            layout.append({'offset': size, 'dtype': array.dtype.str, 'length': len(array)})
+            size += array.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for array, spec in zip(arrays, layout):
+            np.ndarray(len(array), dtype=array.dtype, buffer=self.shm.buf, offset=spec['offset'])[:] = array
+
+        self.spec = {
+            'name': self.shm.name,
+            'layout': layout,
+            'columns': columns,
+            'index': None if isinstance(df.index, pd.RangeIndex) else len(arrays) - 1,
+            'range': (df.index.start, df.index.stop, df.index.step) if isinstance(df.index, pd.RangeIndex) else None,
+        }
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+_attached = {}
+
+def attach_frame(spec):
+    """Rebuild the DataFrame described by spec as views into shared memory (cached per process)"""
+    if spec['name'] in _attached:
+        return _attached[spec['name']][1]
+
+    # Pool workers share the parent's resource tracker, so attaching does not
+    # hand ownership over: the parent alone unlinks the block
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    views = [
+        np.ndarray(entry['length'], dtype=np.dtype(entry['dtype']), buffer=shm.buf, offset=entry['offset'])
+        for entry in spec['layout']
+    ]
+    for view in views:
+        view.flags.writeable = False
+
+    index = pd.RangeIndex(*spec['range']) if spec['range'] is not None else pd.Index(views[spec['index']])
+    data = {}
+    for column in spec['columns']:
+        parts = [views[position] for position in column['arrays']]
+        if column['kind'] == 'category':
+            values = pd.Categorical.from_codes(parts[0], categories=column['categories'], ordered=column['ordered'])
+        elif column['kind'] == 'masked':
+            values = pd.api.types.pandas_dtype(column['dtype']).construct_array_type()(parts[0], parts[1])
+        elif column['kind'] == 'object':
+            lookup = np.array(column['uniques'] + [np.nan], dtype=object)
+            values = lookup[np.where(parts[0] < 0, len(column['uniques']), parts[0])]
+            # An object column stays one: pandas would otherwise infer a string dtype for it
+            values = (pd.array(values, dtype=column['dtype']) if column['dtype'] != 'object'
+                      else pd.Series(values, index=index, dtype=object, copy=False))
+        else:
+            values = parts[0]
+        data[column['name']] = values
+
+    frame = pd.DataFrame(data, index=index, copy=False)
+    _attached[spec['name']] = (shm, frame)
+    return frame
+
+def _ordered(timeline_data, state_order):
+    """Timelines in the full dataset's state order (a row subset may see states in another order)"""
+    return {state: timeline_data[state] for state in state_order if state in timeline_data}
+
+def _quiet(func, *args):
+    """Run a builder without its status lines; the parent prints one summary"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+def _timelines_task(spec, output_dir, indent, columnar, scenarios, deltas):
+    import processData
+    from columnar import write_columnar
+    from deltas import save_delta_stream
+    from scenarios import save_whatif_scenarios
+
+    timeline_data = _quiet(processData.create_state_timeline, attach_frame(spec))
+    written = write_json_stream(Path(output_dir) / 'stateTimelines.json', timeline_data, indent=indent)
+    extras = {}
+    if columnar:
+        extras['columnar'] = write_columnar(timeline_data, Path(output_dir) / 'stateTimelines.ecol')
+    if scenarios:
+        extras['scenarios'] = _quiet(save_whatif_scenarios, timeline_data, Path(output_dir) / 'whatIfScenarios.json')
+    if deltas is not None:
+        extras['deltas'] = _quiet(save_delta_stream, timeline_data, Path(output_dir) / 'timelineDeltas.json', deltas)
+    return written, len(timeline_data), extras
+
+def _summaries_task(spec, output_dir, indent):
+    import processData
+
+    year_summaries = _quiet(processData.create_year_summaries, attach_frame(spec))
+    written = write_json_stream(Path(output_dir) / 'yearSummaries.json', year_summaries, indent=indent)
+    return written, len(year_summaries)
+
+def _shard_task(spec, shard_dir, state_order, years=None, states=None):
+    """Write the year shards for `years` or the state shards for `states` from that row subset"""
+    import processData
+    from shards import build_state_shards, build_year_shards, state_shard_name, write_shard, year_shard_name
+
+    frame = attach_frame(spec)
+    subset = frame[frame['Year'].isin(years)] if years is not None else frame[frame['State'].isin(states)]
+    timeline_data = _ordered(_quiet(processData.create_state_timeline, subset), state_order)
+
+    if years is not None:
+        year_summaries = _quiet(processData.create_year_summaries, subset)
+        return 'years', {
+            str(year): write_shard(shard_dir, year_shard_name(year), payload)
+            for year, payload in build_year_shards(timeline_data, year_summaries).items()
+        }
+    return 'states', {
+        state: write_shard(shard_dir, state_shard_name(state), payload)
+        for state, payload in build_state_shards(timeline_data).items()
+    }
+
+def save_outputs_parallel(df, state_metadata, output_dir, workers, sharded=False, columnar=False,
+                          scenarios=False, indent=None, deltas=None):
+    """Build and write every output on a process pool; returns (state count, year count)"""
+    import processData
+    from shards import SHARD_DIR, write_manifest
+
+    print(f"⚡ Generating outputs on {workers} worker processes...")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True, parents=True)
+    state_order = pd.unique(df['State']).tolist()
+    years = sorted(df['Year'].unique().tolist())
+
+    shared = SharedFrame(df)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            timelines = pool.submit(_timelines_task, shared.spec, output_dir, indent, columnar, scenarios, deltas)
+            summaries = pool.submit(_summaries_task, shared.spec, output_dir, indent)
+
+            shard_jobs = []
+            if sharded:
+                shard_dir = output_dir / SHARD_DIR
+                shard_dir.mkdir(exist_ok=True, parents=True)
+                groups = max(1, workers)
+                for chunk in np.array_split(np.array(years), groups):
+                    if len(chunk):
+                        shard_jobs.append(pool.submit(_shard_task, shared.spec, shard_dir, state_order,
+                                                      years=chunk.tolist()))
+                for chunk in np.array_split(np.array(state_order, dtype=object), groups):
+                    if len(chunk):
+                        shard_jobs.append(pool.submit(_shard_task, shared.spec, shard_dir, state_order,
+                                                      states=chunk.tolist()))
+
+            # The small files are written here while the pool works
+            small_outputs = {
+                'stateMetadata.json': state_metadata,
+                'partyColors.json': processData.PARTY_COLORS,
+                'config.json': processData.create_config(df, state_metadata),
+            }
+            written = {name: write_json_stream(output_dir / name, data, indent=indent)
+                       for name, data in small_outputs.items()}
+
+            timelines_written, state_count, extras = timelines.result()
+            summaries_written, year_count = summaries.result()
+            written['stateTimelines.json'] = timelines_written
+            written['yearSummaries.json'] = summaries_written
+
+            manifest = {'years': {}, 'states': {}}
+            for job in shard_jobs:
+                group, entries = job.result()
+                manifest[group].update(entries)
+    finally:
+        shared.close()
+
+    names = [name for name in ('stateTimelines.json', 'yearSummaries.json', 'stateMetadata.json',
+                               'partyColors.json', 'config.json') if written[name]]
+    print(f"💾 Updated {len(names)} of {len(written)} JSON files {names if names else ''}".rstrip())
+    if sharded:
+        rewritten = len(manifest['years']) + len(manifest['states'])
+        write_manifest(output_dir / SHARD_DIR, manifest, years, state_order, rewritten)
+    if 'columnar' in extras:
+        print(f"📦 Saved columnar timelines ({extras['columnar']:,} bytes)")
+    if 'scenarios' in extras:
+        print(f"🔮 Saved what-if scenarios ({extras['scenarios']:,} bytes)")
+    if 'deltas' in extras:
+        print(f"🎞️  Saved timeline deltas ({extras['deltas']:,} bytes)")
+    print("✅ All JSON files saved successfully!")
+
+    return state_count, year_count
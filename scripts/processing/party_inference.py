@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Candidate name -> party inference
+A data-driven table of well-known candidate surnames is compiled into one
+regular expression. Columns are matched once per distinct candidate string
+and the results broadcast back to every row, with a per-matcher memo so
+repeated calls only pay for names they have not seen before.
+"""
+
+import re
+
+import pandas as pd
+
+# Checked in order: a name matching several entries takes the earliest party
+CANDIDATE_PARTY_TABLE = (
+    ('Democratic', ('biden', 'harris', 'obama', 'clinton', 'gore', 'kerry', 'dukakis', 'mondale')),
+    ('Republican', ('trump', 'pence', 'bush', 'reagan', 'romney', 'mccain', 'dole')),
+    ('Independent', ('washington',)),  # Washington was non-partisan
+)
+
+class CandidatePartyMatcher:
+    """Infer a party from a candidate name by case-insensitive whole-word match"""
+
+    def __init__(self, table=CANDIDATE_PARTY_TABLE):
+        self._priority = {}
+        for rank, (party, names) in enumerate(table):
+            for name in names:
+                self._priority.setdefault(name.lower(), (rank, party))
+
+        # Whole words only ('harris' must not match 'Harrison'); the zero-width
+        # lookahead reports overlapping names so table order decides ties
+        alternatives = sorted(self._priority, key=len, reverse=True)
+        self._pattern = re.compile(r'(?=\b(' + '|'.join(map(re.escape, alternatives)) + r')\b)')
+        self._memo = {}
+
+    @property
+    def parties(self):
+        """Parties the table can produce"""
+        return sorted({party for _, party in self._priority.values()})
+
+    def _best_party(self, matches):
+        if not matches:
+            return None
+        return min(self._priority[match] for match in matches)[1]
+
+    def infer(self, name):
+        """Return the party for one candidate name, or None if no table entry matches"""
+        if pd.isna(name):
+            return None
+        if name not in self._memo:
+            self._memo[name] = self._best_party(self._pattern.findall(str(name).strip().lower()))
+        return self._memo[name]
+
+    def infer_column(self, names):
+        """Infer parties for a whole column; returns an object Series aligned with names"""
+        names = pd.Series(names).astype(object)
+        distinct = pd.Series(pd.unique(names.dropna()), dtype=object)
+
+        unseen = distinct[~distinct.isin(list(self._memo))]
+        if len(unseen):
+            matches = unseen.astype(str).str.strip().str.lower().str.findall(self._pattern)
+            self._memo.update(zip(unseen.tolist(), (self._best_party(found) for found in matches)))
+
+        lookup = {name: self._memo[name] for name in distinct.tolist()}
+        parties = names.map(lookup).astype(object)
+        return parties.where(parties.notna(), None)
+
+_default_matcher = None
+
+def default_matcher():
+    """Shared matcher built from CANDIDATE_PARTY_TABLE"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = CandidatePartyMatcher()
+    return _default_matcher
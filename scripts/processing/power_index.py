@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Banzhaf and Shapley-Shubik voting power of each state
+Every election year is a weighted voting game: the players are the states
+casting electoral votes, a state's weight is its EV count and a coalition wins
+with a majority of all EVs cast. Both indices come from exact coalition counts
+built by a generating-function DP over the weights, never by enumerating the
+2^51 coalitions:
+
+    g[s, k]    coalitions of s states holding k EVs (product of (1 + y x^w))
+    h_i[s, k]  the same without state i (g divided by state i's factor)
+
+State i is pivotal for the coalitions without it holding quota - w_i .. quota - 1
+EVs. Banzhaf counts those swings (normalized to sum to 1); Shapley-Shubik
+weights a coalition of size s by s!(n - 1 - s)!/n!. Many games (years, or
+years x hypothetical House sizes) are solved together as one batch of arrays.
+
+Counts are exact int64, which holds for games of up to MAX_PLAYERS players;
+larger games (such as the benchmark's synthetic district rows) get NaN.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from frame_index import YearStateIndex
+
+MAX_PLAYERS = 60
+BATCH_BYTES = 64 * 2**20
+
+def majority_quota(total_weight):
+    """Smallest weight that is a strict majority of total_weight"""
+    return np.asarray(total_weight, dtype=np.int64) // 2 + 1
+
+def _solve_batch(weights, quota):
+    """Swing counts and Shapley-Shubik indices for a batch of games with quotas above 0
+
+    Players of equal weight are interchangeable, so the pivotal counts are
+    found once per distinct weight, not once per player.
+    """
+    n_games, n_players = weights.shape
+    width = int(quota.max())
+    values = np.unique(weights[weights > 0])
+    multiplicity = (weights[:, :, None] == values).sum(axis=1)
+
+    # g[game, k, size] as the product of (1 + y x^w)^m, one factor at a time for the games that
+    # have it. Nothing beyond the weight and players taken so far is touched, and weights of
+    # quota and above never lead back below it, so they are dropped
+    coalitions = np.zeros((n_games, width, n_players + 1), dtype=np.int64)
+    coalitions[:, 0, 0] = 1
+    reach, sizes = 1, 1
+    for value, counts in zip(values.tolist(), multiplicity.T):
+        for step in range(1, counts.max() + 1):
+            reach, sizes = min(width, reach + value), min(n_players + 1, sizes + 1)
+            if value >= reach:
+                continue
+            taking = np.nonzero(counts >= step)[0]
+            if len(taking) == n_games:
+                coalitions[:, value:reach, 1:sizes] += coalitions[:, :reach - value, :sizes - 1]
+            else:
+                coalitions[taking, value:reach, 1:sizes] += coalitions[taking, :reach - value, :sizes - 1]
+
+    # Coalitions without one player of weight w in which it is pivotal, by size: unrolling the
+    # division h_w[s, k] = g[s, k] - h_w[s - 1, k - w] over the window quota - w .. quota - 1
+    # gives an alternating sum of g's sums over the blocks quota - (t + 1)w .. quota - tw - 1,
+    # taken from prefix sums. int64 wraps, so the exact result survives overflowing partial sums
+    prefix = np.concatenate((np.zeros((n_games, 1, n_players + 1), dtype=np.int64), np.cumsum(coalitions, axis=1)), axis=1)
+    game = np.arange(n_games)
+    swings_by_size = np.zeros((len(values), n_games, n_players + 1), dtype=np.int64)
+    for position, value in enumerate(values.tolist()):
+        for t in range(min(n_players, (width - 1) // value) + 1):
+            high = np.maximum(quota - t * value, 0)
+            block = prefix[game, high] - prefix[game, np.maximum(high - value, 0)]
+            if t % 2:
+                swings_by_size[position, :, t:] -= block[:, :n_players + 1 - t]
+            else:
+                swings_by_size[position, :, t:] += block[:, :n_players + 1 - t]
+
+    # s!(n - 1 - s)!/n! from a log-factorial table, 0 for sizes the game cannot have
+    players = (weights > 0).sum(axis=1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n_players + 1)))))
+    size = np.arange(n_players + 1)[None, :]
+    rest = np.maximum(players[:, None] - 1 - size, 0)
+    size_weight = np.exp(log_factorial[size] + log_factorial[rest] - log_factorial[players][:, None])
+    size_weight = np.where(size < players[:, None], size_weight, 0.0)
+
+    # Back from weights to players; players outside the game get 0
+    position = np.minimum(np.searchsorted(values, weights), len(values) - 1)
+    game = np.arange(n_games)[:, None]
+    swings = np.where(weights > 0, swings_by_size.sum(axis=-1)[position, game], 0)
+    shapley = np.where(weights > 0, (swings_by_size * size_weight[None]).sum(axis=-1)[position, game], 0.0)
+    return swings, shapley
+
+def power_indices(weights, quota=None, batch_bytes=BATCH_BYTES):
+    """Normalized Banzhaf and Shapley-Shubik indices for games x players weights
+
+    Players with weight 0 are not in the game and get NaN, as do games with
+    more than MAX_PLAYERS players or nothing at stake. quota defaults to a
+    majority of each game's total weight. Returns (banzhaf, shapley), shaped
+    like weights.
+    """
+    weights = np.asarray(weights)
+    shape = weights.shape
+    weights = np.where(np.isnan(weights), 0, weights).astype(np.int64).reshape(int(np.prod(shape[:-1])), shape[-1])
+    weights = np.maximum(weights, 0)
+    quota = majority_quota(weights.sum(axis=1)) if quota is None else np.broadcast_to(
+        np.asarray(quota, dtype=np.int64), shape[:-1]).reshape(-1)
+
+    banzhaf = np.full(weights.shape, np.nan)
+    shapley = np.full(weights.shape, np.nan)
+    players = (weights > 0).sum(axis=1)
+    solvable = np.nonzero((players > 0) & (players <= MAX_PLAYERS) & (quota > 0) & (quota <= weights.sum(axis=1)))[0]
+
+    # Batches of similar quotas keep the weight axis tight
+    solvable = solvable[np.argsort(quota[solvable], kind='stable')]
+    start = 0
+    while start < len(solvable):
+        width = int(quota[solvable[-1]])
+        per_game = 2 * width * (shape[-1] + 1) * np.dtype(np.int64).itemsize
+        games = solvable[start:start + max(1, batch_bytes // per_game)]
+        start += len(games)
+
+        # Only the batch's players take part in the DP
+        columns = np.nonzero((weights[games] > 0).any(axis=0))[0]
+        swings, batch_shapley = _solve_batch(weights[np.ix_(games, columns)], quota[games])
+
+        total_swings = swings.sum(axis=1, keepdims=True)
+        in_game = weights[np.ix_(games, columns)] > 0
+        normalized = np.divide(swings, total_swings, out=np.zeros(swings.shape), where=total_swings > 0)
+        banzhaf[np.ix_(games, columns)] = np.where(in_game, normalized, np.nan)
+        shapley[np.ix_(games, columns)] = np.where(in_game, batch_shapley, np.nan)
+
+    return banzhaf.reshape(shape), shapley.reshape(shape)
+
+def frame_power_indices(df):
+    """Banzhaf_Index and Shapley_Shubik_Index columns for a frame, one game per Year"""
+    index = YearStateIndex(df)
+    banzhaf, shapley = power_indices(index.grid('Electoral_Votes'))
+
+    present = index.present
+    rows = index.offsets[present]
+    columns = {}
+    for name, grid in (('Banzhaf_Index', banzhaf), ('Shapley_Shubik_Index', shapley)):
+        values = np.full(len(df), np.nan)
+        values[rows] = grid[present]
+        columns[name] = values
+    return columns
+
+def house_size_power(arrays):
+    """Indices per (year, House size, state) for simulate.build_arrays' house_evs"""
+    return power_indices(arrays['house_evs'])
+
+def main(argv=None):
+    """Print the most and least powerful states per year, optionally under other House sizes"""
+    parser = argparse.ArgumentParser(description="Banzhaf and Shapley-Shubik voting power per state and year")
+    parser.add_argument('--house-sizes', type=int, nargs='*', help="also solve the games for these House sizes")
+    parser.add_argument('--years', type=int, nargs='*', help="years to list (default: all)")
+    args = parser.parse_args(argv)
+
+    from processData import calculate_metrics, load_data
+    from simulate import SIMULATION_COLUMNS, build_arrays
+
+    df = calculate_metrics(load_data(), SIMULATION_COLUMNS + ['Banzhaf_Index', 'Shapley_Shubik_Index'])
+    arrays = build_arrays(df, house_sizes=args.house_sizes)
+    index = YearStateIndex(df)
+    banzhaf = index.grid('Banzhaf_Index')
+    shapley = index.grid('Shapley_Shubik_Index')
+
+    print("🗳️  Voting power per year (normalized Banzhaf / Shapley-Shubik):")
+    for position, year in enumerate(index.years):
+        if args.years and year not in args.years or np.isnan(banzhaf[position]).all():
+            continue
+        most, least = np.nanargmax(banzhaf[position]), np.nanargmin(banzhaf[position])
+        print(f"  - {year}: most {index.states[most]} {banzhaf[position, most]:.4f}/{shapley[position, most]:.4f}, "
+              f"least {index.states[least]} {banzhaf[position, least]:.4f}/{shapley[position, least]:.4f}")
+
+    if args.house_sizes:
+        started = time.perf_counter()
+        house_banzhaf, _ = house_size_power(arrays)
+        elapsed = time.perf_counter() - started
+        print(f"\n🏛️  {house_banzhaf.shape[0] * house_banzhaf.shape[1]} House-size games solved in {elapsed:.2f}s")
+        latest = len(index.years) - 1
+        for position, size in enumerate(args.house_sizes):
+            values = house_banzhaf[latest, position]
+            if np.isnan(values).all():
+                continue
+            most = np.nanargmax(values)
+            print(f"  - {index.years[latest]} with {size} seats: most {index.states[most]} {values[most]:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,30 @@ Process electoral data for visualization
 Generates JSON files optimized for frontend consumption
 """
 
+import argparse
 import pandas as pd
 import json
 import numpy as np
 from pathlib import Path
 
+from apportionment import METHOD_COLUMNS
+from coalitions import ALLOCATIONS, year_coalitions
+from columnar import write_columnar
+from deltas import KEYFRAME_INTERVAL, save_delta_stream
+from frame_index import INDEX_COLUMNS, INDEX_PATH, YearStateIndex, load_index, merge_index
+from incremental import merge_timelines, merge_year_summaries, plan_rebuild, row_hashes, save_build_state
+from instrumentation import PROFILE_DIR, StageProfiler, profile_dir_from_env
+from json_writer import FLOAT_DIGITS, compressed_suffixes, write_json_stream
+from loader import load_electoral_data
+from metrics import MetricsEngine
+from parallel import save_outputs_parallel
+from power_index import majority_quota
+from scenarios import save_whatif_scenarios
+from shards import save_sharded_files
+from watch import DEBOUNCE_SECONDS, RAW_DIR, watch
+
+OUTPUT_DIR = Path('data/outputs')
+
 # Comprehensive party color mappings (self-contained)
 def get_party_colors():
     """Return comprehensive party colors - self-contained, no external files"""
@@ -73,276 +92,280 @@ def load_data():
     """Load electoral data from single source of truth"""
     print("📊 Loading electoral data from single source...")
     
-    # Single source of truth: enhanced CSV contains ALL data 1789-2024
-    enhanced_df = pd.read_csv('data/raw/electoral_enhanced.csv')
+    # Single source of truth: enhanced CSV contains ALL data 1789-2024 (typed, cached parse)
+    enhanced_df = load_electoral_data()
     
     print(f"✅ Loaded {len(enhanced_df)} records from {enhanced_df['Year'].min()}-{enhanced_df['Year'].max()}")
     
     return enhanced_df
 
-def extract_party_from_split_state(row):
-    """Handle split electoral states like Maine and Nebraska"""
-    if not ('Split by district' in str(row['Notes']) or 'split' in str(row['Notes']).lower()):
-        return None
-    
-    # For split states, determine winner by who got more EVs
-    winner_evs = int(row['Winner_EV']) if pd.notna(row['Winner_EV']) else 0
-    runner_up_evs = int(row['Runner_Up_EV']) if pd.notna(row['Runner_Up_EV']) else 0
-    
-    # Extract candidate names and determine their parties
-    winner_name = str(row['Winner']).strip()
-    
-    if 'Biden' in winner_name or 'Harris' in winner_name or 'Clinton' in winner_name or 'Obama' in winner_name:
-        winner_party = 'Democratic'
-    elif 'Trump' in winner_name or 'Pence' in winner_name or 'Romney' in winner_name or 'McCain' in winner_name:
-        winner_party = 'Republican'
-    else:
-        # Fallback to looking at the data pattern
-        winner_party = 'Unknown'
-    
-    return winner_party
-
-def extract_party_from_notes(notes_str):
-    """Extract party from Notes column like 'Trump Republican' or 'Biden Democrat'"""
-    if pd.isna(notes_str) or notes_str == '':
-        return None
-    
-    notes_str = str(notes_str)
-    
-    # Handle ONLY district-level splits (Maine/Nebraska system), not historical split votes
-    if 'Split by district' in notes_str:
-        return 'Split'  # Will be handled by special logic
-    
-    # Handle faithless elector cases - extract from pattern like "2 faithless electors"
-    if 'faithless electors' in notes_str.lower():
-        return None  # Will fall back to Winner_Party column
-    
-    # Handle disputed cases like "Disputed; awarded to Bush" - should use Winner_Party column
-    if 'disputed' in notes_str.lower() and 'awarded' in notes_str.lower():
-        return None  # Will fall back to Winner_Party column
-    
-    # Common patterns in notes
-    if 'Republican' in notes_str:
-        return 'Republican'
-    elif 'Democrat' in notes_str:
-        return 'Democratic'
-    elif 'Federalist' in notes_str:
-        return 'Federalist'
-    elif 'Whig' in notes_str:
-        return 'Whig'
-    elif 'Progressive' in notes_str:
-        return 'Progressive'
-    elif 'Did Not Vote' in notes_str:
-        return 'Did Not Vote'
-    else:
-        # Try to extract last word as party, but avoid common non-party words
-        words = notes_str.strip().split()
-        if len(words) >= 2:
-            last_word = words[-1]
-            # Skip words that are clearly not parties
-            if last_word.lower() in ['electors', 'elector', 'vote', 'votes', 'district', 'state', 'lost', 'won', 'split', 'home']:
-                return None
-            return last_word
-        return None
+# Metrics frame columns read by create_state_timeline and create_year_summaries; derived ones
+# are computed by the metrics registry (metrics.py) only when an output asks for them
+TIMELINE_COLUMNS = [
+    'Year', 'State', 'Electoral_Votes', 'Population', 'Population_Per_EV', 'Representation_Ratio',
+    'Banzhaf_Index', 'Shapley_Shubik_Index', 'Hypothetical_EVs', *METHOD_COLUMNS.values(), 'EV_Difference',
+    'Corrected_Winner_Party', 'Corrected_RunnerUp_Party', 'Is_Split_State', 'Winner', 'Runner_Up',
+    'Winner_EV', 'Runner_Up_EV',
+]
+SUMMARY_COLUMNS = [
+    'Year', 'State', 'Electoral_Votes', 'Population', 'Population_Per_EV', 'Banzhaf_Index', 'Shapley_Shubik_Index',
+    'Corrected_Winner_Party', 'Corrected_RunnerUp_Party', *ALLOCATIONS.values(),
+]
+OUTPUT_COLUMNS = list(dict.fromkeys(TIMELINE_COLUMNS + SUMMARY_COLUMNS))
 
-def calculate_metrics(df):
-    """Calculate additional metrics for visualization"""
+def calculate_metrics(df, columns=OUTPUT_COLUMNS):
+    """Add the metric columns the outputs read (by default the JSON outputs') to df and return it"""
     print("🔧 Calculating metrics...")
+    return MetricsEngine(df).require(columns)
+
+def _nullable_ints(series):
+    """Convert a numeric column to a list of Python ints, with None for missing values"""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(values)
+    result = np.where(missing, 0, values).astype(np.int64).astype(object)
+    result[missing] = None
+    return result.tolist()
+
+def _nullable_floats(series, digits=FLOAT_DIGITS):
+    """Convert a numeric column to a list of Python floats rounded like the JSON outputs, with None for missing values"""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    result = np.array(_rounded(values, digits), dtype=object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+def _nullable_strings(series):
+    """Convert a text column to a list of stripped strings, with None for missing values"""
+    result = series.to_numpy(dtype=object, copy=True)
+    present = series.notna().to_numpy()
+    result[present] = series[present].astype(str).str.strip().to_numpy()
+    result[~present] = None
+    return result.tolist()
+
+def _rounded(values, digits):
+    """Round with Python's round() semantics, once per distinct value"""
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(float(value), digits) for value in unique_values])
+    return rounded[inverse.reshape(-1)].tolist()
+
+def _timeline_columns(df):
+    """Compute every timeline field as a whole column, in output key order"""
+    # Determine colors - NEVER grey unless state doesn't exist or doesn't vote
+    winner_party = df['Corrected_Winner_Party'].astype(object).where(df['Corrected_Winner_Party'].notna(), 'Unknown')
+    runner_up_party = df['Corrected_RunnerUp_Party'].astype(object).where(df['Corrected_RunnerUp_Party'].notna(), 'Unknown')
+    
+    # Get colors from party mapping, defaulting to slate gray for unknown parties
+    winner_color = winner_party.map(PARTY_COLORS).fillna('#708090')
+    runner_up_color = runner_up_party.map(PARTY_COLORS).fillna('#708090')
+    
+    # ONLY use grey if the state doesn't exist or doesn't vote
+    electoral_votes = df['Electoral_Votes'].fillna(0).astype(np.int64)
+    state_exists = electoral_votes > 0
+    
+    # Override color to grey ONLY for non-participating states
+    non_voting = winner_party.isin(['Did Not Vote', 'None'])
+    winner_color = winner_color.mask(~state_exists & non_voting, winner_party.map(PARTY_COLORS).fillna('#696969'))
+    winner_color = winner_color.mask(~state_exists & ~non_voting, '#696969')
+    
+    # Calculate weighted stripe proportions for split states
+    winner_ev = df['Winner_EV'].fillna(electoral_votes).astype(np.int64)
+    runner_up_ev = df['Runner_Up_EV'].fillna(0).astype(np.int64)
+    
+    # Calculate stripe weights (percentage of total EVs)
+    total_split_evs = (winner_ev + runner_up_ev).to_numpy()
+    has_split_evs = total_split_evs > 0
+    safe_total = np.where(has_split_evs, total_split_evs, 1)
+    winner_weight = np.where(has_split_evs, winner_ev.to_numpy() / safe_total, 1.0)
+    runner_up_weight = np.where(has_split_evs, runner_up_ev.to_numpy() / safe_total, 0.0)
+    
+    if 'Is_Split_State' in df:
+        is_split_state = df['Is_Split_State'].fillna(False).astype(bool)
+    else:
+        is_split_state = pd.Series(False, index=df.index)
     
-    # Use actual party data from each state's Winner_Party and RunnerUp_Party columns
-    print("🔧 Using actual party data from each row...")
-    
-    # Each row has its own winner and runner-up party - use them directly per state
-    df['Corrected_Winner_Party'] = df['Winner_Party'].fillna('Unknown')
-    df['Corrected_RunnerUp_Party'] = df['RunnerUp_Party'].fillna('Unknown')
-    
-    # For rows where party data might be missing, try to extract from candidate names
-    missing_winner_party = df['Corrected_Winner_Party'].isin(['Unknown', '', None]) | df['Corrected_Winner_Party'].isna()
-    missing_runner_party = df['Corrected_RunnerUp_Party'].isin(['Unknown', '', None]) | df['Corrected_RunnerUp_Party'].isna()
-    
-    if missing_winner_party.any():
-        print(f"🔧 Found {missing_winner_party.sum()} rows with missing winner party data, trying candidate name inference...")
-        # Try to infer from candidate names for missing data only
-        for idx in df[missing_winner_party].index:
-            row = df.loc[idx]
-            winner_name = str(row['Winner']).strip().lower()
-            
-            # Infer party from well-known candidate names
-            if any(name in winner_name for name in ['biden', 'harris', 'obama', 'clinton', 'gore', 'kerry', 'dukakis', 'mondale']):
-                df.loc[idx, 'Corrected_Winner_Party'] = 'Democratic'
-            elif any(name in winner_name for name in ['trump', 'bush', 'reagan', 'romney', 'mccain', 'dole']):
-                df.loc[idx, 'Corrected_Winner_Party'] = 'Republican'
-            elif 'washington' in winner_name:
-                df.loc[idx, 'Corrected_Winner_Party'] = 'Independent'  # Washington was non-partisan
-    
-    if missing_runner_party.any():
-        print(f"🔧 Found {missing_runner_party.sum()} rows with missing runner-up party data, trying candidate name inference...")
-        # Try to infer from candidate names for missing data only
-        for idx in df[missing_runner_party].index:
-            row = df.loc[idx]
-            runner_name = str(row['Runner_Up']).strip().lower() if pd.notna(row['Runner_Up']) else ''
-            
-            # Infer party from well-known candidate names  
-            if any(name in runner_name for name in ['biden', 'harris', 'obama', 'clinton', 'gore', 'kerry', 'dukakis', 'mondale']):
-                df.loc[idx, 'Corrected_RunnerUp_Party'] = 'Democratic'
-            elif any(name in runner_name for name in ['trump', 'bush', 'reagan', 'romney', 'mccain', 'dole']):
-                df.loc[idx, 'Corrected_RunnerUp_Party'] = 'Republican'
-    
-    # Initialize split state column - detect from actual split vote data
-    df['Is_Split_State'] = False
-    
-    # Handle split states based on actual electoral vote splits (not party inference)
-    print("🔧 Handling split electoral states...")
-    # A state is split if winner didn't get all EVs and there are runner-up EVs
-    split_mask = (df['Winner_EV'] < df['Electoral_Votes']) & (df['Runner_Up_EV'] > 0)
-    df.loc[split_mask, 'Is_Split_State'] = True
-    
-    # Ensure population per EV is calculated
-    df['Population_Per_EV'] = df['Population'] / df['Electoral_Votes']
-    df['Population_Per_EV'] = df['Population_Per_EV'].replace([np.inf, -np.inf], np.nan)
-    
-    # Calculate national average for each year
-    year_stats = df.groupby('Year').agg({
-        'Population': 'sum',
-        'Electoral_Votes': 'sum'
-    }).reset_index()
-    year_stats['National_Pop_Per_EV'] = year_stats['Population'] / year_stats['Electoral_Votes']
-    
-    # Merge back to main dataframe
-    df = df.merge(year_stats[['Year', 'National_Pop_Per_EV']], on='Year', how='left')
-    
-    # Calculate representation ratio (1.0 = perfectly represented)
-    df['Representation_Ratio'] = df['National_Pop_Per_EV'] / df['Population_Per_EV']
-    df['Representation_Ratio'] = df['Representation_Ratio'].replace([np.inf, -np.inf], np.nan)
-    
-    # Calculate hypothetical equal representation EVs
-    df['Hypothetical_EVs'] = (df['Population'] / df['National_Pop_Per_EV']).round()
-    df['EV_Difference'] = df['Hypothetical_EVs'] - df['Electoral_Votes']
-    
-    return df
+    return {
+        'year': df['Year'].astype(np.int64).tolist(),
+        'electoralVotes': electoral_votes.tolist(),
+        'population': _nullable_ints(df['Population']),
+        'populationPerEV': _nullable_floats(df['Population_Per_EV']),
+        'representationRatio': _nullable_floats(df['Representation_Ratio']),
+        'banzhafIndex': _nullable_floats(df['Banzhaf_Index']),
+        'shapleyShubikIndex': _nullable_floats(df['Shapley_Shubik_Index']),
+        'hypotheticalEVs': _nullable_ints(df['Hypothetical_EVs']),
+        'apportionedEVs': [
+            dict(zip(METHOD_COLUMNS, values))
+            for values in zip(*(_nullable_ints(df[column]) for column in METHOD_COLUMNS.values()))
+        ],
+        'evDifference': _nullable_ints(df['EV_Difference']),
+        'winner': winner_party.tolist(),
+        'runnerUp': runner_up_party.tolist(),
+        'winnerColor': winner_color.tolist(),
+        'runnerUpColor': runner_up_color.tolist(),
+        'exists': state_exists.tolist(),
+        'isSplitState': is_split_state.tolist(),
+        # Add candidate names
+        'winnerCandidate': _nullable_strings(df['Winner']),
+        'runnerUpCandidate': _nullable_strings(df['Runner_Up']),
+        # Add weighted split vote details for proportional stripes
+        'winnerEV': winner_ev.tolist(),
+        'runnerUpEV': runner_up_ev.tolist(),
+        'winnerWeight': _rounded(winner_weight, 3),  # Percentage as decimal (0.0-1.0)
+        'runnerUpWeight': _rounded(runner_up_weight, 3),
+    }
 
 def create_state_timeline(df):
     """Create timeline data for each state"""
     print("📅 Creating state timelines...")
     
-    states = df['State'].unique()
+    # States keep their order of first appearance; each timeline is sorted by year
+    state_codes, states = pd.factorize(df['State'])
+    order = np.lexsort((df['Year'].to_numpy(), state_codes))
+    ordered = df.iloc[order]
+    
+    columns = _timeline_columns(ordered)
+    fields = list(columns)
+    records = [dict(zip(fields, values)) for values in zip(*columns.values())]
+    
     timeline_data = {}
+    group_sizes = ordered.groupby(state_codes[order], sort=True).size()
+    boundaries = np.concatenate(([0], np.cumsum(group_sizes.to_numpy())))
     
-    for state in states:
-        state_data = df[df['State'] == state].sort_values('Year')
-        
+    for state, start, end in zip(states, boundaries[:-1], boundaries[1:]):
         timeline_data[state] = {
             'name': state,
-            'timeline': []
+            'timeline': records[start:end]
         }
-        
-        for _, row in state_data.iterrows():
-            # Determine colors - NEVER grey unless state doesn't exist or doesn't vote
-            winner_party = row['Corrected_Winner_Party'] if pd.notna(row['Corrected_Winner_Party']) else 'Unknown'
-            runner_up_party = row['Corrected_RunnerUp_Party'] if pd.notna(row['Corrected_RunnerUp_Party']) else 'Unknown'
-            
-            # Get colors from party mapping
-            winner_color = PARTY_COLORS.get(winner_party, '#708090')  # Default to slate gray for unknown
-            runner_up_color = PARTY_COLORS.get(runner_up_party, '#708090')
-            
-            # ONLY use grey if the state doesn't exist or doesn't vote
-            electoral_votes = int(row['Electoral_Votes']) if pd.notna(row['Electoral_Votes']) else 0
-            state_exists = electoral_votes > 0
-            
-            # Override color to grey ONLY for non-participating states
-            if not state_exists:
-                if winner_party in ['Did Not Vote', 'None']:
-                    winner_color = PARTY_COLORS.get(winner_party, '#696969')
-                else:
-                    winner_color = '#696969'  # Non-participating state
-            
-            # Calculate weighted stripe proportions for split states
-            winner_ev = int(row['Winner_EV']) if pd.notna(row['Winner_EV']) else electoral_votes
-            runner_up_ev = int(row['Runner_Up_EV']) if pd.notna(row['Runner_Up_EV']) else 0
-            
-            # Calculate stripe weights (percentage of total EVs)
-            total_split_evs = winner_ev + runner_up_ev
-            winner_weight = winner_ev / total_split_evs if total_split_evs > 0 else 1.0
-            runner_up_weight = runner_up_ev / total_split_evs if total_split_evs > 0 else 0.0
-            
-            year_data = {
-                'year': int(row['Year']),
-                'electoralVotes': electoral_votes,
-                'population': int(row['Population']) if pd.notna(row['Population']) else None,
-                'populationPerEV': float(row['Population_Per_EV']) if pd.notna(row['Population_Per_EV']) else None,
-                'representationRatio': float(row['Representation_Ratio']) if pd.notna(row['Representation_Ratio']) else None,
-                'hypotheticalEVs': int(row['Hypothetical_EVs']) if pd.notna(row['Hypothetical_EVs']) else None,
-                'evDifference': int(row['EV_Difference']) if pd.notna(row['EV_Difference']) else None,
-                'winner': winner_party,
-                'runnerUp': runner_up_party,
-                'winnerColor': winner_color,
-                'runnerUpColor': runner_up_color,
-                'exists': state_exists,
-                'isSplitState': bool(row.get('Is_Split_State', False)),
-                # Add candidate names
-                'winnerCandidate': str(row['Winner']).strip() if pd.notna(row['Winner']) else None,
-                'runnerUpCandidate': str(row['Runner_Up']).strip() if pd.notna(row['Runner_Up']) else None,
-                # Add weighted split vote details for proportional stripes
-                'winnerEV': winner_ev,
-                'runnerUpEV': runner_up_ev,
-                'winnerWeight': round(winner_weight, 3),  # Percentage as decimal (0.0-1.0)
-                'runnerUpWeight': round(runner_up_weight, 3)
-            }
-            timeline_data[state]['timeline'].append(year_data)
     
     return timeline_data
 
+def _party_tables(participating, column):
+    """EV totals and state counts per (Year, party) from one groupby
+
+    EV totals are keyed in party name order (like groupby), state counts by
+    descending count with ties in order of first appearance (like value_counts).
+    """
+    if column not in participating:
+        return {}, {}
+    
+    grouped = participating.assign(_position=np.arange(len(participating))).groupby(['Year', column], sort=True)
+    table = grouped.agg(ev=('Electoral_Votes', 'sum'), states=('Electoral_Votes', 'size'), first=('_position', 'min'))
+    table = table.reset_index()
+    
+    ev_totals, state_counts = {}, {}
+    for year, party, ev in zip(table['Year'].tolist(), table[column].tolist(), table['ev'].tolist()):
+        ev_totals.setdefault(year, {})[party] = int(ev)
+    
+    ranked = table.sort_values(['Year', 'states', 'first'], ascending=[True, False, True], kind='stable')
+    for year, party, count in zip(ranked['Year'].tolist(), ranked[column].tolist(), ranked['states'].tolist()):
+        state_counts.setdefault(year, {})[party] = int(count)
+    return ev_totals, state_counts
+
+def _power_extremes(participating):
+    """The most and least powerful state (by Banzhaf index) of each year, with both indices"""
+    banzhaf = participating['Banzhaf_Index'].dropna()
+    if banzhaf.empty:
+        return {}
+    
+    extremes = banzhaf.groupby(participating.loc[banzhaf.index, 'Year']).agg(['idxmax', 'idxmin'])
+    result = {}
+    for year, most, least in zip(extremes.index.tolist(), extremes['idxmax'], extremes['idxmin']):
+        result[year] = {
+            label: {
+                'state': participating.at[row, 'State'],
+                'banzhaf': round(float(participating.at[row, 'Banzhaf_Index']), FLOAT_DIGITS),
+                'shapleyShubik': round(float(participating.at[row, 'Shapley_Shubik_Index']), FLOAT_DIGITS),
+            }
+            for label, row in (('mostPowerful', most), ('leastPowerful', least))
+        }
+    return result
+
 def create_year_summaries(df):
     """Create summary data for each election year"""
     print("📊 Creating year summaries...")
     
-    years = sorted(df['Year'].unique())
-    year_summaries = {}
+    participating = df[df['Electoral_Votes'] > 0]
     
-    for year in years:
-        year_data = df[df['Year'] == year]
-        participating = year_data[year_data['Electoral_Votes'] > 0]
-        
-        # Calculate statistics
-        if len(participating) > 0:
-            pop_per_ev_values = participating['Population_Per_EV'].dropna()
-            
-            summary = {
-                'year': int(year),
-                'totalStates': len(participating),
-                'totalElectoralVotes': int(participating['Electoral_Votes'].sum()),
-                'totalPopulation': int(participating['Population'].sum()) if participating['Population'].notna().any() else None,
-                'averagePopPerEV': float(pop_per_ev_values.mean()) if len(pop_per_ev_values) > 0 else None,
-                'minPopPerEV': {
-                    'state': participating.loc[participating['Population_Per_EV'].idxmin(), 'State'] if len(pop_per_ev_values) > 0 else None,
-                    'value': float(pop_per_ev_values.min()) if len(pop_per_ev_values) > 0 else None,
-                },
-                'maxPopPerEV': {
-                    'state': participating.loc[participating['Population_Per_EV'].idxmax(), 'State'] if len(pop_per_ev_values) > 0 else None,
-                    'value': float(pop_per_ev_values.max()) if len(pop_per_ev_values) > 0 else None,
-                },
-                'parties': {
-                    'winner': participating.groupby('Corrected_Winner_Party')['Electoral_Votes'].sum().to_dict() if 'Corrected_Winner_Party' in participating else {},
-                    'runnerUp': participating.groupby('Corrected_RunnerUp_Party')['Electoral_Votes'].sum().to_dict() if 'Corrected_RunnerUp_Party' in participating else {},
-                    'stateCount': {
-                        'winner': participating['Corrected_Winner_Party'].value_counts().to_dict() if 'Corrected_Winner_Party' in participating else {},
-                        'runnerUp': participating['Corrected_RunnerUp_Party'].value_counts().to_dict() if 'Corrected_RunnerUp_Party' in participating else {},
-                    }
-                }
-            }
-        else:
-            summary = {
-                'year': int(year),
+    # Per-year totals, and population-per-EV statistics with the min/max states, in one pass each
+    totals = participating.groupby('Year').agg(
+        states=('Electoral_Votes', 'size'),
+        electoral_votes=('Electoral_Votes', 'sum'),
+        population=('Population', 'sum'),
+        populated=('Population', 'count'),
+    )
+    pop_per_ev = participating['Population_Per_EV'].dropna()
+    ratio_years = participating.loc[pop_per_ev.index, 'Year']
+    ratios = pop_per_ev.groupby(ratio_years).agg(['count', 'min', 'max', 'idxmin', 'idxmax'])
+    
+    # groupby's mean uses compensated summation; averaging each year's contiguous
+    # slice with np.mean keeps Series.mean's pairwise summation, bit for bit
+    order = np.argsort(ratio_years.to_numpy(), kind='stable')
+    segments = np.split(pop_per_ev.to_numpy(dtype=float)[order], np.cumsum(ratios['count'].to_numpy())[:-1])
+    ratios['mean'] = [segment.mean() for segment in segments]
+    
+    power = _power_extremes(participating)
+    no_power = {'state': None, 'banzhaf': None, 'shapleyShubik': None}
+    
+    # Least-population set of states that could have won, for the real EVs and each what-if allocation
+    coalitions = year_coalitions(participating)
+    no_coalition = {'electoralVotes': None, 'population': None, 'populationShare': None, 'states': [], 'whatIf': {}}
+    
+    winner_evs, winner_counts = _party_tables(participating, 'Corrected_Winner_Party')
+    runner_up_evs, runner_up_counts = _party_tables(participating, 'Corrected_RunnerUp_Party')
+    
+    totals = totals.to_dict(orient='index')
+    ratios['min_state'] = participating.loc[ratios['idxmin'], 'State'].to_numpy()
+    ratios['max_state'] = participating.loc[ratios['idxmax'], 'State'].to_numpy()
+    ratios = ratios.to_dict(orient='index')
+    
+    year_summaries = {}
+    for year in sorted(df['Year'].unique()):
+        year = int(year)
+        if year not in totals:
+            year_summaries[year] = {
+                'year': year,
                 'totalStates': 0,
                 'totalElectoralVotes': 0,
                 'totalPopulation': None,
                 'averagePopPerEV': None,
                 'minPopPerEV': {'state': None, 'value': None},
                 'maxPopPerEV': {'state': None, 'value': None},
+                'votingPower': {'quota': None, 'mostPowerful': dict(no_power), 'leastPowerful': dict(no_power)},
+                'minimumWinningCoalition': dict(no_coalition),
                 'parties': {'winner': {}, 'runnerUp': {}, 'stateCount': {'winner': {}, 'runnerUp': {}}}
             }
+            continue
         
-        year_summaries[int(year)] = summary
+        row = totals[year]
+        stats = ratios.get(year)
+        year_summaries[year] = {
+            'year': year,
+            'totalStates': int(row['states']),
+            'totalElectoralVotes': int(row['electoral_votes']),
+            'totalPopulation': int(row['population']) if row['populated'] > 0 else None,
+            'averagePopPerEV': round(float(stats['mean']), FLOAT_DIGITS) if stats is not None else None,
+            'minPopPerEV': {
+                'state': stats['min_state'] if stats is not None else None,
+                'value': round(float(stats['min']), FLOAT_DIGITS) if stats is not None else None,
+            },
+            'maxPopPerEV': {
+                'state': stats['max_state'] if stats is not None else None,
+                'value': round(float(stats['max']), FLOAT_DIGITS) if stats is not None else None,
+            },
+            'votingPower': {
+                'quota': int(majority_quota(row['electoral_votes'])),
+                **power.get(year, {'mostPowerful': dict(no_power), 'leastPowerful': dict(no_power)}),
+            },
+            'minimumWinningCoalition': dict(coalitions[year]['actual'], whatIf={
+                name: coalition for name, coalition in coalitions[year].items() if name != 'actual'
+            }),
+            'parties': {
+                'winner': winner_evs.get(year, {}),
+                'runnerUp': runner_up_evs.get(year, {}),
+                'stateCount': {
+                    'winner': winner_counts.get(year, {}),
+                    'runnerUp': runner_up_counts.get(year, {}),
+                }
+            }
+        }
     
     return year_summaries
 
@@ -393,65 +416,231 @@ def create_state_metadata():
     
     return metadata
 
-def save_json_files(timeline_data, year_summaries, state_metadata, df):
-    """Save processed data as JSON files"""
+def create_config(df, state_metadata):
+    """Create a compact version for initial load"""
+    return {
+        'years': sorted(df['Year'].unique().tolist()),
+        'states': sorted(df['State'].unique().tolist()),
+        'partyColors': PARTY_COLORS,
+        'metadata': state_metadata,
+    }
+
+def save_json_files(timeline_data, year_summaries, state_metadata, df, sharded=False, columnar=False,
+                    scenarios=False, shard_years=None, shard_states=None, indent=None, deltas=None):
+    """Save processed data as JSON files (compact unless indent is given, with precompressed siblings),
+    optionally with shards, a columnar export, what-if tables and a delta stream (keyframe interval)"""
     print("💾 Saving JSON files...")
     
-    output_dir = Path('data/outputs')
+    output_dir = OUTPUT_DIR
     output_dir.mkdir(exist_ok=True, parents=True)
     
-    # Save state timeline data
-    with open(output_dir / 'stateTimelines.json', 'w') as f:
-        json.dump(timeline_data, f, indent=2)
+    outputs = {
+        'stateTimelines.json': timeline_data,
+        'yearSummaries.json': year_summaries,
+        'stateMetadata.json': state_metadata,
+        'partyColors.json': PARTY_COLORS,
+        'config.json': create_config(df, state_metadata),
+    }
     
-    # Save year summaries
-    with open(output_dir / 'yearSummaries.json', 'w') as f:
-        json.dump(year_summaries, f, indent=2)
+    # Streamed entry by entry; unchanged files are left untouched
+    written = [name for name, data in outputs.items() if write_json_stream(output_dir / name, data, indent=indent)]
+    print(f"💾 Updated {len(written)} of {len(outputs)} JSON files {written if written else ''}".rstrip())
+    print(f"🗜️  Precompressed siblings: {', '.join(compressed_suffixes())}")
     
-    # Save state metadata
-    with open(output_dir / 'stateMetadata.json', 'w') as f:
-        json.dump(state_metadata, f, indent=2)
+    # Per-year and per-state shards so the app can fetch only what it shows
+    if sharded:
+        save_sharded_files(timeline_data, year_summaries, output_dir, years=shard_years, states=shard_states)
     
-    # Save party colors
-    with open(output_dir / 'partyColors.json', 'w') as f:
-        json.dump(PARTY_COLORS, f, indent=2)
+    # Dictionary-encoded, memory-mappable year x state arrays
+    if columnar:
+        size = write_columnar(timeline_data, output_dir / 'stateTimelines.ecol')
+        print(f"📦 Saved columnar timelines ({size:,} bytes)")
     
-    # Create a compact version for initial load
-    compact_data = {
-        'years': sorted(df['Year'].unique().tolist()),
-        'states': sorted(df['State'].unique().tolist()),
-        'partyColors': PARTY_COLORS,
-        'metadata': state_metadata,
-    }
+    # Every year x normalize-to-state what-if result, for constant-time lookups in the app
+    if scenarios:
+        size = save_whatif_scenarios(timeline_data, output_dir / 'whatIfScenarios.json')
+        print(f"🔮 Saved what-if scenarios ({size:,} bytes)")
     
-    with open(output_dir / 'config.json', 'w') as f:
-        json.dump(compact_data, f, indent=2)
+    # Keyframes plus per-year diffs for timeline playback
+    if deltas is not None:
+        size = save_delta_stream(timeline_data, output_dir / 'timelineDeltas.json', deltas)
+        print(f"🎞️  Saved timeline deltas ({size:,} bytes)")
     
     print("✅ All JSON files saved successfully!")
 
-def main():
-    """Main processing function"""
-    print("🚀 Starting electoral data processing...")
+def build_incremental(df, affected_years, columns=OUTPUT_COLUMNS):
+    """Recompute only the affected years and patch them into the previous outputs
+
+    Returns the merged timelines and summaries plus the recomputed metrics of the affected years.
+    """
+    subset = calculate_metrics(df[df['Year'].isin(affected_years)].copy(), columns)
     
-    # Load data
-    df = load_data()
+    with open(OUTPUT_DIR / 'stateTimelines.json', 'r') as f:
+        previous_timelines = json.load(f)
+    with open(OUTPUT_DIR / 'yearSummaries.json', 'r') as f:
+        previous_summaries = json.load(f)
     
-    # Calculate metrics
-    df = calculate_metrics(df)
+    timeline_data = merge_timelines(previous_timelines, create_state_timeline(subset),
+                                    pd.unique(df['State']), affected_years)
+    year_summaries = merge_year_summaries(previous_summaries, create_year_summaries(subset), affected_years)
     
-    # Create data structures
-    timeline_data = create_state_timeline(df)
-    year_summaries = create_year_summaries(df)
-    state_metadata = create_state_metadata()
+    return timeline_data, year_summaries, subset
+
+def keyframe_interval(value):
+    """argparse type for --deltas: a whole number of years, at least one"""
+    interval = int(value)
+    if interval < 1:
+        raise argparse.ArgumentTypeError(f"the keyframe interval must be at least 1, got {interval}")
+    return interval
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Process electoral data for visualization")
+    parser.add_argument('--sharded', action='store_true',
+                        help="also write per-year and per-state shards with a manifest to data/outputs/shards")
+    parser.add_argument('--columnar', action='store_true',
+                        help="also write a dictionary-encoded columnar export to data/outputs/stateTimelines.ecol")
+    parser.add_argument('--scenarios', action='store_true',
+                        help="also precompute every what-if scenario to data/outputs/whatIfScenarios.json")
+    parser.add_argument('--deltas', nargs='?', const=KEYFRAME_INTERVAL, type=keyframe_interval, metavar='N',
+                        help="also write keyframes every N years (default %(const)s) plus per-year diffs "
+                             "to data/outputs/timelineDeltas.json")
+    parser.add_argument('--dense-index', action='store_true',
+                        help=f"also save the dense year x state index of the metrics to {INDEX_PATH}")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only recompute election years whose CSV rows changed since the last build")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="build and write the outputs on this many processes (full rebuilds only)")
+    parser.add_argument('--pretty', action='store_true',
+                        help="indent the JSON outputs for reading and diffing (default: compact)")
+    parser.add_argument('--watch', action='store_true',
+                        help=f"keep running and rebuild incrementally whenever files in {RAW_DIR}/ change")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS, metavar='SECONDS',
+                        help="with --watch, wait for this long without changes before rebuilding")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, type=Path, metavar='DIR',
+                        help=f"record per-stage time, memory and row counts to DIR (default {PROFILE_DIR}); "
+                             "also enabled by the ELECTORAL_PROFILE environment variable")
+    return parser.parse_args(argv)
+
+def process(args, df=None):
+    """Run one build with parsed options; callers that already hold the raw frame can pass it as df"""
+    profile_dir = args.profile or profile_dir_from_env()
+    profiler = StageProfiler(enabled=profile_dir is not None)
+    print("🚀 Starting electoral data processing...")
     
-    # Save files
-    save_json_files(timeline_data, year_summaries, state_metadata, df)
+    # Load data
+    with profiler.stage('load_data') as stage:
+        if df is None:
+            df = load_data()
+        stage['rowsOut'] = len(df)
+    options = {'sharded': args.sharded, 'columnar': args.columnar, 'scenarios': args.scenarios,
+               'denseIndex': args.dense_index, 'deltas': args.deltas}
+    with profiler.stage('row_hashes', rows_in=len(df)) as stage:
+        hashes = row_hashes(df)
+        stage['rowsOut'] = len(hashes)
+    
+    affected_years = None
+    if args.incremental:
+        required_outputs = [OUTPUT_DIR / 'stateTimelines.json', OUTPUT_DIR / 'yearSummaries.json']
+        if args.dense_index:
+            required_outputs.append(INDEX_PATH)
+        with profiler.stage('plan_rebuild', rows_in=len(hashes)) as stage:
+            affected_years, changed_keys = plan_rebuild(hashes, options, required_outputs)
+            stage['rowsOut'] = len(changed_keys) if changed_keys is not None else None
+        if affected_years is not None and not affected_years:
+            print("✅ No rows changed since the last build, outputs are up to date")
+            finish_profile(profiler, profile_dir)
+            return
+    
+    # Only the metrics the requested outputs read are computed
+    metric_columns = OUTPUT_COLUMNS + INDEX_COLUMNS if args.dense_index else OUTPUT_COLUMNS
+    
+    with profiler.stage('create_state_metadata') as stage:
+        state_metadata = create_state_metadata()
+        stage['rowsOut'] = len(state_metadata)
+    
+    if affected_years is not None:
+        print(f"♻️  {len(changed_keys)} changed rows, rebuilding years {sorted(affected_years)}")
+        with profiler.stage('build_incremental', rows_in=len(df)) as stage:
+            timeline_data, year_summaries, subset = build_incremental(df, affected_years, metric_columns)
+            stage['rowsOut'] = len(timeline_data)
+        changed_states = set(subset['State'])
+        with profiler.stage('save_json_files', rows_in=len(df)) as stage:
+            save_json_files(timeline_data, year_summaries, state_metadata, df, sharded=args.sharded,
+                            columnar=args.columnar, scenarios=args.scenarios,
+                            shard_years=affected_years, shard_states=changed_states,
+                            indent=2 if args.pretty else None, deltas=args.deltas)
+    else:
+        # Calculate metrics
+        with profiler.stage('calculate_metrics', rows_in=len(df)) as stage:
+            df = calculate_metrics(df, metric_columns)
+            stage['rowsOut'] = len(df)
+        
+        if args.workers > 1:
+            # Builders and their writes run on a pool that reads df from shared memory
+            with profiler.stage('save_outputs_parallel', rows_in=len(df)) as stage:
+                state_count, year_count = save_outputs_parallel(
+                    df, state_metadata, OUTPUT_DIR, args.workers, sharded=args.sharded, columnar=args.columnar,
+                    scenarios=args.scenarios, indent=2 if args.pretty else None, deltas=args.deltas)
+                stage['rowsOut'] = state_count
+        else:
+            # Create data structures
+            with profiler.stage('create_state_timeline', rows_in=len(df)) as stage:
+                timeline_data = create_state_timeline(df)
+                stage['rowsOut'] = len(timeline_data)
+            with profiler.stage('create_year_summaries', rows_in=len(df)) as stage:
+                year_summaries = create_year_summaries(df)
+                stage['rowsOut'] = len(year_summaries)
+            
+            # Save files
+            with profiler.stage('save_json_files', rows_in=len(df)):
+                save_json_files(timeline_data, year_summaries, state_metadata, df, sharded=args.sharded,
+                                columnar=args.columnar, scenarios=args.scenarios, indent=2 if args.pretty else None,
+                                deltas=args.deltas)
+    
+    if args.workers <= 1 or affected_years is not None:
+        state_count, year_count = len(timeline_data), len(year_summaries)
+    
+    # Year x state row offsets and metric arrays for O(1) lookups by analysis scripts
+    if args.dense_index:
+        with profiler.stage('save_dense_index', rows_in=len(df)) as stage:
+            if affected_years is None:
+                index = YearStateIndex(df)
+            else:
+                index = merge_index(df, load_index(INDEX_PATH), YearStateIndex(subset), affected_years)
+            size = index.save(INDEX_PATH)
+            stage['rowsOut'] = int(index.present.sum())
+        print(f"🗂️  Saved dense year x state index ({size:,} bytes)")
+    
+    # Remember row hashes so the next --incremental run can skip unchanged years
+    with profiler.stage('save_build_state', rows_in=len(hashes)):
+        save_build_state(hashes, options)
     
     # Print summary
     print("\n📊 Processing complete!")
-    print(f"  - States: {len(timeline_data)}")
-    print(f"  - Years: {len(year_summaries)}")
+    print(f"  - States: {state_count}")
+    print(f"  - Years: {year_count}")
     print(f"  - Total records: {len(df):,}")
+    
+    finish_profile(profiler, profile_dir)
+
+def main(argv=None, df=None):
+    """Main processing function; callers that already hold the raw frame can pass it as df"""
+    args = parse_args(argv)
+    if not args.watch:
+        return process(args, df)
+    
+    # Rebuild in this interpreter on every change; incremental builds fall back to full ones when needed
+    args.incremental = True
+    watch(lambda: process(args), RAW_DIR, debounce=args.debounce)
+
+def finish_profile(profiler, profile_dir):
+    """Print the stage profile and write its JSON and Chrome trace files, when profiling is on"""
+    if not profiler.enabled:
+        return
+    profiler.print_summary()
+    profile_path, trace_path = profiler.write(profile_dir)
+    print(f"💾 Saved stage profile to {profile_path} and Chrome trace to {trace_path}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Precomputed what-if scenarios
+Reproduces the 'equal' and 'normalized' view modes of
+src/hooks/useWhatIfCalculations.ts offline for every election year and every
+normalize-to-state choice, so the app can look results up instead of
+recomputing them on each interaction. Each year is solved as one
+(targets x states) matrix: every row is a target population-per-EV ratio.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from json_writer import write_if_changed
+
+def allocate_largest_remainder(populations, ratios, total_evs):
+    """Allocate EVs for several target ratios at once, exactly as the frontend does
+
+    populations: (states,) array; ratios: (targets,) array of people per EV.
+    Every state gets max(1, floor(exact)) EVs, then the shortfall (or excess)
+    against total_evs is settled by largest (or smallest) remainders, at most
+    one EV per state, ties keeping state order.
+    """
+    exact = populations[None, :] / ratios[:, None]
+    floors = np.floor(exact)
+    allocated = np.maximum(1, floors)
+    remainders = np.where(exact > 1, exact - floors, 0.0)
+    remaining = total_evs - allocated.sum(axis=1)
+
+    rows = np.arange(len(ratios))[:, None]
+
+    # Shortfall: +1 to the states with the largest remainders
+    order = np.argsort(-remainders, axis=1, kind='stable')
+    add = np.zeros_like(allocated, dtype=bool)
+    add[rows, order] = np.arange(populations.size)[None, :] < remaining[:, None]
+
+    # Excess: -1 from the smallest remainders, skipping states already at 1 EV
+    order = np.argsort(remainders, axis=1, kind='stable')
+    removable = np.take_along_axis(allocated, order, axis=1) > 1
+    remove = np.zeros_like(allocated, dtype=bool)
+    remove[rows, order] = removable & (np.cumsum(removable, axis=1) <= -remaining[:, None])
+
+    return (allocated + add - remove).astype(np.int64)
+
+def _party_totals(evs, party_codes, parties):
+    """Sum EVs per party for each scenario row; parties are in first-appearance order"""
+    one_hot = np.zeros((party_codes.size, len(parties)), dtype=np.int64)
+    one_hot[np.arange(party_codes.size), party_codes] = 1
+    return evs @ one_hot
+
+def _outcome(totals, parties):
+    """Winner, winner EVs and runner-up EVs from a row of party totals (stable on ties)"""
+    if len(parties) == 0:
+        return None, 0, 0
+    ranked = np.sort(totals)[::-1]
+    return parties[int(np.argmax(totals))], int(ranked[0]), int(ranked[1]) if len(ranked) > 1 else 0
+
+def _year_frame(timeline_data, year=None):
+    """One row per participating state-year (optionally one year), in stateTimelines.json state order"""
+    records = [
+        (state, entry['year'], entry['winner'], entry['electoralVotes'], entry['population'])
+        for state, data in timeline_data.items()
+        for entry in data['timeline']
+        if entry['exists'] and (year is None or entry['year'] == year)
+    ]
+    return pd.DataFrame.from_records(records, columns=['state', 'year', 'winner', 'electoralVotes', 'population'])
+
+def _scenario(evs, totals, parties, original_winner):
+    winner, winner_evs, runner_up_evs = _outcome(totals, parties)
+    return {
+        'evs': evs,
+        'partyTotals': dict(zip(parties, totals.tolist())),
+        'winner': winner,
+        'winnerEVs': winner_evs,
+        'runnerUpEVs': runner_up_evs,
+        'totalEVs': int(totals.sum()),
+        'outcomeChanged': winner != original_winner,
+    }
+
+def build_year_scenarios(year_frame):
+    """Original result plus equal and every normalize-to-state scenario for one year"""
+    states = year_frame['state'].tolist()
+    winners = year_frame['winner'].fillna('').to_numpy(dtype=object)
+    electoral_votes = year_frame['electoralVotes'].to_numpy(dtype=np.int64)
+    population = year_frame['population'].fillna(0).to_numpy(dtype=float)
+
+    # Original totals: states with a winner and EVs
+    counted = (winners != '') & (electoral_votes > 0)
+    original_parties = pd.unique(winners[counted]).tolist()
+    original_codes = pd.Categorical(winners[counted], categories=original_parties).codes
+    original_totals = _party_totals(electoral_votes[counted][None, :], original_codes, original_parties)[0]
+    original_winner, winner_evs, runner_up_evs = _outcome(original_totals, original_parties)
+    total_evs = int(original_totals.sum())
+
+    result = {
+        'states': states,
+        'original': {
+            'partyTotals': dict(zip(original_parties, original_totals.tolist())),
+            'winner': original_winner,
+            'winnerEVs': winner_evs,
+            'runnerUpEVs': runner_up_evs,
+            'totalEVs': total_evs,
+        },
+        'equal': None,
+        'normalized': {},
+    }
+
+    # Reallocated states: those with a winner and a population
+    eligible = (winners != '') & (population > 0)
+    if not eligible.any() or total_evs == 0:
+        return result
+
+    # Row 0 is equal representation, the rest normalize to each valid target state
+    targets = np.flatnonzero((population > 0) & (electoral_votes > 0))
+    ratios = np.concatenate((
+        [population.sum() / total_evs],
+        population[targets] / electoral_votes[targets],
+    ))
+    allocated = allocate_largest_remainder(population[eligible], ratios, total_evs)
+
+    parties = pd.unique(winners[eligible]).tolist()
+    codes = pd.Categorical(winners[eligible], categories=parties).codes
+    totals = _party_totals(allocated, codes, parties)
+
+    # EVs per state in 'states' order, null where a state is not reallocated
+    evs = np.full((len(ratios), len(states)), -1, dtype=np.int64)
+    evs[:, eligible] = allocated
+    ev_lists = [[value if value >= 0 else None for value in row] for row in evs.tolist()]
+
+    result['equal'] = _scenario(ev_lists[0], totals[0], parties, original_winner)
+    for row, target in enumerate(targets, start=1):
+        result['normalized'][states[target]] = _scenario(ev_lists[row], totals[row], parties, original_winner)
+
+    return result
+
+def build_whatif_scenarios(timeline_data):
+    """Build the what-if lookup table for every election year"""
+    frame = _year_frame(timeline_data)
+    return {
+        int(year): build_year_scenarios(year_frame.reset_index(drop=True))
+        for year, year_frame in frame.groupby('year', sort=True)
+    }
+
+def build_scenarios_for_year(timeline_data, year):
+    """Build the what-if lookup table for a single election year"""
+    return build_year_scenarios(_year_frame(timeline_data, year))
+
+def save_whatif_scenarios(timeline_data, path):
+    """Write the what-if lookup table as compact JSON, returning its size in bytes"""
+    print("🔮 Precomputing what-if scenarios...")
+    scenarios = build_whatif_scenarios(timeline_data)
+    content = json.dumps(scenarios, separators=(',', ':')).encode('utf-8')
+    write_if_changed(path, content)
+    return len(content)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Sharded output for lazy frontend loading
+Splits the state timelines into one file per election year and one per state,
+plus a small manifest listing every shard with its size and content hash
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from json_writer import write_if_changed
+
+SHARD_DIR = 'shards'
+MANIFEST_NAME = 'manifest.json'
+
+def state_shard_name(state):
+    """Return the shard file name for a state, e.g. 'states/district-of-columbia.json'"""
+    slug = re.sub(r'[^a-z0-9]+', '-', state.lower()).strip('-')
+    return f"states/{slug}.json"
+
+def year_shard_name(year):
+    """Return the shard file name for an election year, e.g. 'years/2024.json'"""
+    return f"years/{int(year)}.json"
+
+def build_year_shards(timeline_data, year_summaries, years=None):
+    """Regroup state timelines by election year: {year: {'year', 'summary', 'states'}}"""
+    shards = {}
+    for year, summary in year_summaries.items():
+        if years is None or int(year) in years:
+            shards[int(year)] = {'year': int(year), 'summary': summary, 'states': {}}
+
+    # One pass over every timeline entry, keeping the state order of stateTimelines.json
+    for state, data in timeline_data.items():
+        for entry in data['timeline']:
+            shard = shards.get(entry['year'])
+            if shard is not None:
+                shard['states'][state] = entry
+
+    return shards
+
+def build_state_shards(timeline_data, states=None):
+    """Return each state's timeline keyed by state name"""
+    return {
+        state: data for state, data in timeline_data.items()
+        if states is None or state in states
+    }
+
+def encode_shard(payload):
+    """Serialize a shard compactly with a stable key order"""
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+def write_shard(shard_dir, name, payload):
+    """Write one shard and return its manifest entry"""
+    content = encode_shard(payload)
+    path = shard_dir / name
+    path.parent.mkdir(exist_ok=True, parents=True)
+    write_if_changed(path, content)
+
+    return {
+        'file': name,
+        'bytes': len(content),
+        'sha256': hashlib.sha256(content).hexdigest(),
+    }
+
+def load_manifest(shard_dir):
+    """Load an existing manifest, or an empty one if none has been written yet"""
+    manifest_path = Path(shard_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {'years': {}, 'states': {}}
+
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+def save_sharded_files(timeline_data, year_summaries, output_dir, years=None, states=None):
+    """Write per-year and per-state shards plus manifest.json under output_dir/shards
+
+    When years or states are given, only those shards are rewritten and the
+    remaining manifest entries are carried over from the previous run.
+    """
+    print("🧩 Saving sharded outputs...")
+
+    shard_dir = Path(output_dir) / SHARD_DIR
+    shard_dir.mkdir(exist_ok=True, parents=True)
+
+    manifest = load_manifest(shard_dir) if years is not None or states is not None else {'years': {}, 'states': {}}
+
+    rewritten = 0
+    if years is None or years:
+        for year, payload in build_year_shards(timeline_data, year_summaries, years).items():
+            manifest['years'][str(year)] = write_shard(shard_dir, year_shard_name(year), payload)
+            rewritten += 1
+
+    if states is None or states:
+        for state, payload in build_state_shards(timeline_data, states).items():
+            manifest['states'][state] = write_shard(shard_dir, state_shard_name(state), payload)
+            rewritten += 1
+
+    return write_manifest(shard_dir, manifest, year_summaries, timeline_data, rewritten)
+
+def write_manifest(shard_dir, manifest, years, states, rewritten):
+    """Write manifest.json with years sorted and states in stateTimelines.json order
+
+    Entries for years or states that no longer exist are dropped, and so are
+    their shard files, which would otherwise still be reachable by path.
+    """
+    # Keep manifest ordering stable regardless of which shards were rewritten
+    known_years = {str(int(year)) for year in years}
+    manifest = {
+        'years': dict(sorted(
+            ((year, entry) for year, entry in manifest['years'].items() if year in known_years),
+            key=lambda item: int(item[0])
+        )),
+        'states': {state: manifest['states'][state] for state in states if state in manifest['states']},
+    }
+
+    write_if_changed(Path(shard_dir) / MANIFEST_NAME, json.dumps(manifest, indent=2).encode('utf-8'))
+
+    listed = {entry['file'] for group in manifest.values() for entry in group.values()}
+    removed = 0
+    for path in sorted(Path(shard_dir).glob('*/*.json')):
+        if path.relative_to(shard_dir).as_posix() not in listed:
+            path.unlink()
+            removed += 1
+
+    total_bytes = sum(entry['bytes'] for group in manifest.values() for entry in group.values())
+    print(f"✅ Rewrote {rewritten} shards; manifest lists {len(manifest['years'])} year shards "
+          f"and {len(manifest['states'])} state shards ({total_bytes:,} bytes)")
+    if removed:
+        print(f"🧹 Removed {removed} shards of years or states no longer in the data")
+
+    return manifest
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo simulation of electoral outcomes
+Samples many scenarios for every election year at once from the
+calculate_metrics frame: a national swing plus per-state noise applied to each
+state's margin, optionally combined with a random House size that
+reapportions the electoral votes. Draws are processed in fixed-size chunks,
+each with its own seed derived from one root seed, so results are identical
+for any number of worker processes.
+
+The datasource has no popular-vote margins. Unless the frame carries a
+'Margin' column (winner's margin as a share of the vote), every state starts
+from the same --margin, and the run is a sensitivity sweep: its flip
+probabilities follow from --margin, --swing-sd and --state-sd, not from the
+data, and the report says so. A state only flips to a runner-up whose party
+is known.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from apportionment import apportion_divisor
+from frame_index import YearStateIndex
+
+# Metrics frame columns build_arrays reads (plus 'Margin' when the data has it)
+SIMULATION_COLUMNS = ['Year', 'State', 'Electoral_Votes', 'Population', 'Corrected_Winner_Party', 'Corrected_RunnerUp_Party']
+
+DC = 'District of Columbia'
+# Runner-up parties a state cannot flip to
+UNKNOWN_PARTIES = ('Unknown', '')
+REPORT_PATH = Path('data/cache/simulation.json')
+
+def build_arrays(df, default_margin=0.05, house_sizes=None):
+    """Turn the metrics frame into the padded year x state arrays the simulation needs"""
+    index = YearStateIndex(df)
+    parties = pd.unique(pd.concat([df['Corrected_Winner_Party'], df['Corrected_RunnerUp_Party']]).astype(object)).tolist()
+
+    def party_codes(column):
+        return pd.Categorical(index.grid(column).ravel(), categories=parties).codes.reshape(index.shape).astype(np.int64)
+
+    electoral_votes = np.nan_to_num(index.grid('Electoral_Votes'), nan=0).astype(np.int64)
+    margins = np.nan_to_num(index.grid('Margin'), nan=default_margin) if 'Margin' in df else default_margin
+    arrays = {
+        'years': index.years,
+        'states': index.states,
+        'parties': parties,
+        'participating': electoral_votes > 0,
+        'electoral_votes': electoral_votes,
+        'margins': np.where(index.present, margins, 0.0),
+        'winner': party_codes('Corrected_Winner_Party'),
+        'runner_up': party_codes('Corrected_RunnerUp_Party'),
+    }
+    # Code -1 (no party) picks the trailing False
+    known = np.array([party not in UNKNOWN_PARTIES for party in parties] + [False])
+    arrays['flippable'] = arrays['participating'] & known[arrays['runner_up']]
+    arrays['house_evs'] = house_size_evs(arrays, index.grid('Population'), index.states, house_sizes)
+    return arrays
+
+def house_size_evs(arrays, population, states, house_sizes):
+    """EVs per (year, House size, state): HH-apportioned seats + 2 senators, DC tied to the smallest state
+
+    Years where a participating state lacks a population keep their real EVs.
+    Returns None when no House sizes are simulated.
+    """
+    if not house_sizes:
+        return None
+
+    participating = arrays['participating']
+    is_dc = np.array([state == DC for state in states])
+    is_state = participating & ~is_dc[None, :]
+    sizes = np.tile(np.asarray(house_sizes, dtype=np.int64), (participating.shape[0], 1))
+
+    seats = apportion_divisor(np.where(is_state, population, np.nan), sizes, 'huntingtonHill')
+    evs = np.where(is_state[:, None, :], seats + 2, 0)
+    smallest = np.where(is_state[:, None, :], evs, np.iinfo(np.int64).max).min(axis=2, keepdims=True)
+    evs = np.where((participating & is_dc[None, :])[:, None, :], smallest, evs)
+
+    complete = ~(participating & np.isnan(population)).any(axis=1)
+    return np.where(complete[:, None, None], evs, arrays['electoral_votes'][:, None, :])
+
+def original_winners(arrays):
+    """Party code with the most EVs in each year (first party on ties)"""
+    totals = party_totals(arrays['winner'][None], arrays['electoral_votes'][None], len(arrays['parties']))[0]
+    return np.argmax(totals, axis=1)
+
+def party_totals(party_codes, electoral_votes, n_parties):
+    """Sum EVs per party: (draws, years, states) -> (draws, years, parties)"""
+    return np.stack([
+        np.where(party_codes == party, electoral_votes, 0).sum(axis=2)
+        for party in range(n_parties)
+    ], axis=2)
+
+def simulate_chunk(arrays, draws, seed, swing_sd, state_sd):
+    """Run one chunk of draws for all years and return integer counts"""
+    rng = np.random.default_rng(seed)
+    n_years, n_states = arrays['participating'].shape
+    max_evs = int(arrays['electoral_votes'].sum(axis=1).max())
+    if arrays['house_evs'] is not None:
+        max_evs = max(max_evs, int(arrays['house_evs'].sum(axis=2).max()))
+
+    # Correlated swings: one national shift per draw and year, plus independent state noise
+    national = rng.normal(0.0, swing_sd, (draws, n_years, 1))
+    local = rng.normal(0.0, state_sd, (draws, n_years, n_states))
+    flipped = arrays['flippable'][None] & (arrays['margins'][None] + national + local < 0)
+
+    if arrays['house_evs'] is not None:
+        size_index = rng.integers(0, arrays['house_evs'].shape[1], draws)
+        electoral_votes = arrays['house_evs'][:, size_index, :].transpose(1, 0, 2)
+    else:
+        electoral_votes = np.broadcast_to(arrays['electoral_votes'][None], flipped.shape)
+
+    final_party = np.where(flipped, arrays['runner_up'][None], arrays['winner'][None])
+    totals = party_totals(final_party, electoral_votes, len(arrays['parties']))
+    baseline = arrays['original_winner']
+    baseline_evs = np.take_along_axis(totals, np.broadcast_to(baseline[None, :, None], (draws, n_years, 1)), axis=2)[:, :, 0]
+
+    # EV histogram of the original winner's party, flattened as year * (max_evs + 1) + evs
+    offsets = np.arange(n_years)[None, :] * (max_evs + 1)
+    histogram = np.bincount((offsets + baseline_evs).ravel(), minlength=n_years * (max_evs + 1))
+
+    return {
+        'outcome_flips': (np.argmax(totals, axis=2) != baseline[None, :]).sum(axis=0),
+        'state_flips': flipped.sum(axis=0),
+        'ev_histogram': histogram.reshape(n_years, max_evs + 1),
+    }
+
+_worker_arrays = None
+
+def _init_worker(arrays):
+    global _worker_arrays
+    _worker_arrays = arrays
+
+def _run_chunk(task):
+    draws, seed, swing_sd, state_sd = task
+    return simulate_chunk(_worker_arrays, draws, seed, swing_sd, state_sd)
+
+def simulate(df, draws=100_000, seed=0, workers=1, chunk_size=2_000, swing_sd=0.03, state_sd=0.05,
+             default_margin=0.05, house_sizes=None):
+    """Simulate outcomes for every year; returns (per-year frame, per-state frame)"""
+    arrays = build_arrays(df, default_margin, house_sizes)
+    arrays['original_winner'] = original_winners(arrays)
+
+    # Fixed chunking and spawned seeds keep results independent of the worker count
+    chunk_sizes = [chunk_size] * (draws // chunk_size) + ([draws % chunk_size] if draws % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(size, chunk_seed, swing_sd, state_sd) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays,)) as pool:
+            results = list(pool.map(_run_chunk, tasks))
+    else:
+        _init_worker(arrays)
+        results = [_run_chunk(task) for task in tasks]
+
+    outcome_flips = sum(result['outcome_flips'] for result in results)
+    state_flips = sum(result['state_flips'] for result in results)
+    histogram = sum(result['ev_histogram'] for result in results)
+
+    # Percentiles straight from the exact EV histograms
+    cumulative = np.cumsum(histogram, axis=1) / draws
+    evs = np.arange(histogram.shape[1])
+    percentile = lambda q: (cumulative < q).sum(axis=1)
+    per_year = pd.DataFrame({
+        'year': arrays['years'],
+        'originalWinner': [arrays['parties'][code] for code in arrays['original_winner']],
+        'flipProbability': outcome_flips / draws,
+        'winnerEVsMean': (histogram * evs[None, :]).sum(axis=1) / draws,
+        'winnerEVsP5': percentile(0.05),
+        'winnerEVsP50': percentile(0.5),
+        'winnerEVsP95': percentile(0.95),
+    })
+
+    year_index, state_index = np.nonzero(arrays['participating'])
+    per_state = pd.DataFrame({
+        'year': np.asarray(arrays['years'])[year_index],
+        'state': np.asarray(arrays['states'], dtype=object)[state_index],
+        'flipProbability': state_flips[year_index, state_index] / draws,
+    })
+
+    return per_year, per_state
+
+def main(argv=None):
+    """Run the simulation on the processed dataset and write a JSON report"""
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of electoral outcomes")
+    parser.add_argument('--draws', type=int, default=100_000, help="scenarios per election year")
+    parser.add_argument('--seed', type=int, default=0, help="root random seed")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=2_000, help="draws per task")
+    parser.add_argument('--swing-sd', type=float, default=0.03, help="std. dev. of the national swing")
+    parser.add_argument('--state-sd', type=float, default=0.05, help="std. dev. of each state's own swing")
+    parser.add_argument('--margin', type=float, default=0.05,
+                        help="margin assumed for every state when the data has none (a sensitivity sweep)")
+    parser.add_argument('--house-sizes', type=int, nargs='*', help="House sizes to sample for EV reallocation")
+    parser.add_argument('--output', type=Path, default=REPORT_PATH,
+                        help="report path (kept out of data/outputs, which the app serves)")
+    args = parser.parse_args(argv)
+
+    from processData import calculate_metrics, load_data
+
+    df = calculate_metrics(load_data(), SIMULATION_COLUMNS)
+    margins_from_data = 'Margin' in df
+    if not margins_from_data:
+        print(f"⚠️  No Margin column: every state starts {args.margin:+.1%} ahead, so this is a sensitivity sweep over "
+              f"--margin, --swing-sd and --state-sd, not a forecast from the data")
+    print(f"🎲 Simulating {args.draws:,} draws per year on {args.workers} workers (seed {args.seed})...")
+    per_year, per_state = simulate(df, args.draws, args.seed, args.workers, args.chunk_size,
+                                   args.swing_sd, args.state_sd, args.margin, args.house_sizes)
+
+    report = {
+        'analysis': 'margins from data' if margins_from_data else 'sensitivity sweep (assumed --margin for every state)',
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('output', 'workers')},
+        'years': per_year.to_dict(orient='records'),
+        'states': per_state.to_dict(orient='records'),
+    }
+    Path(args.output).parent.mkdir(exist_ok=True, parents=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    closest = per_year.sort_values('flipProbability', ascending=False).head(5)
+    print("📊 Years most likely to flip" + ("" if margins_from_data else f" at an assumed {args.margin:+.1%} margin") + ":")
+    for row in closest.itertuples(index=False):
+        print(f"  - {row.year}: {row.flipProbability:.1%} (winner {row.originalWinner}, median {row.winnerEVsP50} EVs)")
+    print(f"✅ Saved simulation report to {args.output}")
+
+if __name__ == "__main__":
+    main()
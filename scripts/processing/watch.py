@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Watch mode for processData.py
+Waits for files under data/raw to change and rebuilds in the running
+interpreter, so pandas stays imported and the typed-frame cache stays warm.
+On Linux changes arrive through inotify (no extra packages); elsewhere the
+directory is polled with stat(). A burst of saves is collapsed into one
+rebuild once the directory has been quiet for the debounce period.
+
+Rebuilds run incrementally and every writer leaves unchanged files untouched,
+so a dev server only reloads the outputs whose content changed. Edits to the
+processing code itself need a restart.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+RAW_DIR = Path('data/raw')
+DEBOUNCE_SECONDS = 0.5
+POLL_SECONDS = 0.5
+
+# Editor swap files, lock files and our own temporary files never trigger a rebuild
+IGNORED_SUFFIXES = ('~', '.swp', '.swx', '.tmp', '.part')
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+def _relevant(name):
+    return bool(name) and not name.startswith(('.', '~$')) and not name.endswith(IGNORED_SUFFIXES)
+
+class InotifyWatcher:
+    """Directory change events from Linux inotify through libc"""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout=None):
+        """Names changed within timeout seconds (None blocks until a change)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        buffer = os.read(self.fd, 64 * 1024)
+        position = 0
+        while position < len(buffer):
+            _, _, _, length = EVENT_HEADER.unpack_from(buffer, position)
+            start = position + EVENT_HEADER.size
+            name = buffer[start:start + length].rstrip(b'\0').decode('utf-8', 'replace')
+            if _relevant(name):
+                changed.add(name)
+            position = start + length
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Directory changes found by comparing (mtime, size) snapshots"""
+
+    def __init__(self, directory, interval=POLL_SECONDS):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        with os.scandir(self.directory) as entries:
+            return {
+                entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in entries if entry.is_file() and _relevant(entry.name)
+            }
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {name for name in current.keys() | self.snapshot.keys()
+                       if current.get(name) != self.snapshot.get(name)}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+def open_watcher(directory=RAW_DIR):
+    """inotify on Linux, stat polling everywhere else (or if inotify is unavailable)"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as error:
+            print(f"⚠️  inotify unavailable ({error}), polling {directory} instead")
+    return PollingWatcher(directory)
+
+def wait_for_changes(watcher, debounce=DEBOUNCE_SECONDS):
+    """Block until something changes, then until no further change for `debounce` seconds"""
+    changed = set()
+    while not changed:
+        changed = watcher.wait()
+    while True:
+        more = watcher.wait(timeout=debounce)
+        if not more:
+            return changed
+        changed |= more
+
+def watch(rebuild, directory=RAW_DIR, debounce=DEBOUNCE_SECONDS):
+    """Call rebuild() now and after every debounced burst of changes, until interrupted
+
+    A failing rebuild is reported and the watcher keeps waiting for the next fix.
+    """
+    watcher = open_watcher(directory)
+    mode = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+    try:
+        rebuild()
+        while True:
+            print(f"\n👀 Watching {directory}/ for changes ({mode}, {debounce:g}s debounce, Ctrl+C to stop)...")
+            changed = wait_for_changes(watcher, debounce)
+            # Save-by-rename editors leave short-lived temporary names in the burst
+            remaining = sorted(name for name in changed if (Path(directory) / name).exists())
+            print(f"🔁 Changed: {', '.join(remaining or sorted(changed))}")
+            started = time.perf_counter()
+            try:
+                rebuild()
+            except Exception as error:
+                print(f"❌ Rebuild failed: {type(error).__name__}: {error}")
+                continue
+            print(f"⏱️  Rebuilt in {time.perf_counter() - started:.2f}s")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
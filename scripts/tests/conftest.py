@@ -0,0 +1,10 @@
+"""Make the pipeline modules importable by name, as they are when run from scripts/processing"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = SCRIPTS_DIR.parent
+
+for package in ('processing', 'api', 'validation'):
+    sys.path.insert(0, str(SCRIPTS_DIR / package))
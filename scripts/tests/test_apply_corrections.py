@@ -0,0 +1,78 @@
+"""data/corrections reproduce the removed fix_1988_data.py and fix_1992_data.py, and applying them twice changes nothing"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from apply_corrections import apply_corrections, load_corrections
+from loader import load_electoral_data
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CORRECTIONS_DIR = REPO_ROOT / 'data' / 'corrections'
+
+def fix_1988(df):
+    """fix_1988_data.py's corrections, without the file writing"""
+    corrections = {
+        'Iowa': {'Winner_EV': 8, 'Runner_Up_EV': 0, 'Notes': 'Dukakis Democrat'},
+        'Washington': {'Winner_EV': 10, 'Runner_Up_EV': 0, 'Notes': 'Dukakis Democrat'},
+        'West Virginia': {'Winner_EV': 5, 'Runner_Up_EV': 0, 'Notes': '1 faithless elector voted Bentsen'},
+    }
+    for state, correction in corrections.items():
+        idx = df[(df['Year'] == 1988) & (df['State'] == state)].index[0]
+        for field, value in correction.items():
+            if df.loc[idx, field] != value:
+                df.loc[idx, field] = value
+        if state in ['Iowa', 'Washington'] and df.loc[idx, 'RunnerUp_Party'] != 'Republican':
+            df.loc[idx, 'RunnerUp_Party'] = 'Republican'
+    return df
+
+def fix_1992(df):
+    """fix_1992_data.py's party assignments, without the file writing"""
+    for idx, row in df[df['Year'] == 1992].iterrows():
+        if 'Bush' in row['Winner']:
+            parties = ('Republican', 'Democratic')
+        elif 'Clinton' in row['Winner']:
+            parties = ('Democratic', 'Republican')
+        else:
+            continue
+        if (row['Winner_Party'], row['RunnerUp_Party']) != parties:
+            df.loc[idx, ['Winner_Party', 'RunnerUp_Party']] = parties
+    return df
+
+@pytest.fixture(scope='module')
+def damaged():
+    """The datasource with the 1988 and 1992 errors the scripts fixed put back in"""
+    df = load_electoral_data(REPO_ROOT / 'data' / 'raw' / 'electoral_enhanced.csv', categorical=False)
+    rows_1988 = df.index[(df['Year'] == 1988) & df['State'].isin(['Iowa', 'Washington', 'West Virginia'])]
+    df.loc[rows_1988, 'Winner_EV'] -= 1
+    df.loc[rows_1988, 'Runner_Up_EV'] = 1
+    df.loc[rows_1988, 'Notes'] = 'Split vote'
+    df.loc[rows_1988, 'RunnerUp_Party'] = 'Democratic'
+
+    rows_1992 = df.index[df['Year'] == 1992]
+    swapped, missing = rows_1992[::2], rows_1992[1::3]
+    df.loc[swapped, ['Winner_Party', 'RunnerUp_Party']] = df.loc[swapped, ['RunnerUp_Party', 'Winner_Party']].to_numpy()
+    df.loc[missing, 'RunnerUp_Party'] = np.nan
+    return df
+
+def test_corrections_match_the_fix_scripts(damaged):
+    expected = fix_1992(fix_1988(damaged.copy()))
+    corrected, changes, unmatched = apply_corrections(damaged, load_corrections(CORRECTIONS_DIR))
+
+    assert unmatched.empty
+    assert set(changes['Year']) == {1988, 1992}
+    # The scripts' result was the CSV they wrote
+    assert corrected.to_csv(index=False) == expected.to_csv(index=False)
+
+def test_applying_twice_changes_nothing(damaged):
+    corrections = load_corrections(CORRECTIONS_DIR)
+    once, _, _ = apply_corrections(damaged, corrections)
+    twice, changes, _ = apply_corrections(once, corrections)
+    assert changes.empty
+    assert twice.to_csv(index=False) == once.to_csv(index=False)
+
+def test_datasource_already_has_every_correction():
+    df = load_electoral_data(REPO_ROOT / 'data' / 'raw' / 'electoral_enhanced.csv', categorical=False)
+    _, changes, unmatched = apply_corrections(df, load_corrections(CORRECTIONS_DIR))
+    assert changes.empty and unmatched.empty
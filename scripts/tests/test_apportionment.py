@@ -0,0 +1,104 @@
+"""apportion_divisor and apportion_hamilton against plain one-seat-at-a-time references"""
+
+import heapq
+
+import numpy as np
+import pytest
+
+from apportionment import DIVISORS, apportion_divisor, apportion_hamilton
+
+# 2020 census apportionment populations (residents plus overseas federal employees) and House seats
+CENSUS_2020 = {
+    'Alabama': (5030053, 7), 'Alaska': (736081, 1), 'Arizona': (7158923, 9), 'Arkansas': (3013756, 4),
+    'California': (39576757, 52), 'Colorado': (5782171, 8), 'Connecticut': (3608298, 5), 'Delaware': (990837, 1),
+    'Florida': (21570527, 28), 'Georgia': (10725274, 14), 'Hawaii': (1460137, 2), 'Idaho': (1841377, 2),
+    'Illinois': (12822739, 17), 'Indiana': (6790280, 9), 'Iowa': (3192406, 4), 'Kansas': (2940865, 4),
+    'Kentucky': (4509342, 6), 'Louisiana': (4661468, 6), 'Maine': (1363582, 2), 'Maryland': (6185278, 8),
+    'Massachusetts': (7033469, 9), 'Michigan': (10084442, 13), 'Minnesota': (5709752, 8), 'Mississippi': (2963914, 4),
+    'Missouri': (6160281, 8), 'Montana': (1085407, 2), 'Nebraska': (1963333, 3), 'Nevada': (3108462, 4),
+    'New Hampshire': (1379089, 2), 'New Jersey': (9294493, 12), 'New Mexico': (2120220, 3), 'New York': (20215751, 26),
+    'North Carolina': (10453948, 14), 'North Dakota': (779702, 1), 'Ohio': (11808848, 15), 'Oklahoma': (3963516, 5),
+    'Oregon': (4241500, 6), 'Pennsylvania': (13011844, 17), 'Rhode Island': (1098163, 2),
+    'South Carolina': (5124712, 7), 'South Dakota': (887770, 1), 'Tennessee': (6916897, 9), 'Texas': (29183290, 38),
+    'Utah': (3275252, 4), 'Vermont': (643503, 1), 'Virginia': (8654542, 11), 'Washington': (7715946, 10),
+    'West Virginia': (1795045, 2), 'Wisconsin': (5897473, 8), 'Wyoming': (577719, 1),
+}
+
+def reference_divisor(populations, seats, method):
+    """One seat at a time to the highest priority population / divisor(seats held)"""
+    eligible = [i for i, population in enumerate(populations) if np.isfinite(population) and population > 0]
+    result = [1 if i in eligible else 0 for i in range(len(populations))]
+    queue = [(-populations[i] / DIVISORS[method](1.0), i) for i in eligible]
+    heapq.heapify(queue)
+    for _ in range(max(seats - len(eligible), 0)):
+        _, i = heapq.heappop(queue)
+        result[i] += 1
+        heapq.heappush(queue, (-populations[i] / DIVISORS[method](float(result[i])), i))
+    return result
+
+def reference_hamilton(populations, seats):
+    """Largest remainders, fixing states whose quota falls below one at one seat first"""
+    eligible = [i for i, population in enumerate(populations) if np.isfinite(population) and population > 0]
+    fixed = set()
+    while True:
+        free = [i for i in eligible if i not in fixed]
+        free_population = sum(populations[i] for i in free)
+        quotas = {i: populations[i] / free_population * (seats - len(fixed)) for i in free}
+        below_one = {i for i in free if quotas[i] < 1}
+        if not below_one:
+            break
+        fixed |= below_one
+
+    result = [0] * len(populations)
+    for i in fixed:
+        result[i] = 1
+    for i in free:
+        result[i] = int(np.floor(quotas[i]))
+    by_remainder = sorted(free, key=lambda i: (-(quotas[i] - np.floor(quotas[i])), i))
+    for i in by_remainder[:max(seats - sum(result), 0)]:
+        result[i] += 1
+    return result
+
+def random_years(seed, n_years=20, n_states=30):
+    """Populations spanning three orders of magnitude, with some states not taking part"""
+    rng = np.random.default_rng(seed)
+    populations = np.exp(rng.uniform(np.log(5e4), np.log(4e7), size=(n_years, n_states)))
+    populations[rng.random((n_years, n_states)) < 0.15] = np.nan
+    populations[rng.random((n_years, n_states)) < 0.05] = 0.0
+    seats = rng.integers(1, 600, size=n_years)
+    return populations, seats
+
+def test_huntington_hill_reproduces_the_2020_house():
+    populations = np.array([[population for population, _ in CENSUS_2020.values()]], dtype=float)
+    official = [seats for _, seats in CENSUS_2020.values()]
+
+    assert apportion_divisor(populations, np.array([435]))[0].tolist() == official
+    assert reference_divisor(populations[0], 435, 'huntingtonHill') == official
+
+@pytest.mark.parametrize('method', sorted(DIVISORS))
+def test_divisor_methods_match_the_reference(method):
+    populations, seats = random_years(seed=1)
+    result = apportion_divisor(populations, seats, method)
+    for year in range(len(seats)):
+        assert result[year].tolist() == reference_divisor(populations[year], seats[year], method)
+
+@pytest.mark.parametrize('method', sorted(DIVISORS))
+def test_divisor_methods_solve_several_house_sizes_at_once(method):
+    populations, _ = random_years(seed=2, n_years=5)
+    sizes = np.tile([1, 25, 100, 435, 1000], (5, 1))
+    result = apportion_divisor(populations, sizes, method)
+    assert result.shape == (5, 5, populations.shape[1])
+    for year in range(5):
+        for position, size in enumerate(sizes[year]):
+            assert result[year, position].tolist() == reference_divisor(populations[year], size, method)
+
+def test_hamilton_matches_the_reference():
+    populations, seats = random_years(seed=3)
+    result = apportion_hamilton(populations, seats)
+    for year in range(len(seats)):
+        assert result[year].tolist() == reference_hamilton(populations[year], seats[year])
+
+def test_every_participating_state_keeps_one_seat_when_seats_run_short():
+    populations = np.array([[3e6, np.nan, 1e6, 2e6]])
+    assert apportion_divisor(populations, np.array([2])).tolist() == [[1, 0, 1, 1]]
+    assert apportion_hamilton(populations, np.array([2])).tolist() == [[1, 0, 1, 1]]
@@ -0,0 +1,72 @@
+"""minimum_winning_coalitions against a brute-force search over every set of players"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from coalitions import minimum_winning_coalitions
+
+def reference_coalition(weights, populations, quota):
+    """(population, electoral votes, chosen players) of the coalition the DP is expected to pick
+
+    The least population wins, then the fewest EVs reaching it; among sets with
+    both equal the DP keeps the set without the later knapsack item (items in
+    stable weight order), which is the set with the least sum of 2**rank.
+    """
+    players = [player for player, weight in enumerate(weights) if weight > 0]
+    rank = {player: position for position, player in enumerate(sorted(players, key=lambda player: weights[player]))}
+    best = None
+    for size in range(1, len(players) + 1):
+        for coalition in combinations(players, size):
+            held = sum(weights[player] for player in coalition)
+            if held < quota:
+                continue
+            key = (sum(populations[player] for player in coalition), held, sum(2**rank[player] for player in coalition))
+            if best is None or key < best[0]:
+                best = key, coalition
+    (population, held, _), coalition = best
+    return population, held, sorted(coalition)
+
+def test_tie_keeps_the_set_without_the_later_state():
+    # {0, 2} and {1, 2} both reach 3 EVs with population 3; state 1 is the later item of weight 1
+    population, electoral_votes, chosen = minimum_winning_coalitions([[1, 1, 2]], [[1, 1, 2]])
+    assert (population[0], electoral_votes[0]) == (3, 3)
+    assert chosen[0].tolist() == [True, False, True]
+
+@pytest.mark.parametrize('seed', range(4))
+def test_matches_brute_force_on_random_games(seed):
+    rng = np.random.default_rng(seed)
+    # Few distinct small weights and populations make ties common
+    weights = rng.integers(0, 5, size=(60, 7))
+    populations = rng.integers(1, 4, size=weights.shape).astype(float)
+    quota = np.maximum(weights.sum(axis=1) // 2 + 1 + rng.integers(-2, 3, size=len(weights)), 1)
+
+    population, electoral_votes, chosen = minimum_winning_coalitions(weights, populations, quota)
+    for game in range(len(weights)):
+        if quota[game] > weights[game].sum():
+            assert np.isnan(population[game]) and electoral_votes[game] == 0 and not chosen[game].any()
+            continue
+        expected = reference_coalition(weights[game].tolist(), populations[game].tolist(), quota[game])
+        actual = population[game], electoral_votes[game], np.nonzero(chosen[game])[0].tolist()
+        assert actual == expected, f"weights {weights[game].tolist()}, populations {populations[game].tolist()}"
+
+def test_default_quota_is_a_majority_per_game():
+    population, electoral_votes, chosen = minimum_winning_coalitions([[3, 1, 1, 1], [2, 2, 2, 0]],
+                                                                     [[10, 1, 1, 1], [5, 3, 4, 0]])
+    assert population.tolist() == [11, 7]
+    assert electoral_votes.tolist() == [4, 4]
+    assert chosen.tolist() == [[True, True, False, False], [False, True, True, False]]
+
+def test_missing_population_leaves_the_game_unsolved():
+    population, electoral_votes, chosen = minimum_winning_coalitions([[2, 1, 1], [2, 0, 1]],
+                                                                     [[5, np.nan, 1], [5, np.nan, 1]])
+    assert np.isnan(population[0]) and electoral_votes[0] == 0 and not chosen[0].any()
+    # A player outside the game may lack a population
+    assert (population[1], electoral_votes[1]) == (5, 2)
+
+@pytest.mark.parametrize('shape', [(0, 0), (0, 5), (3, 0), (2, 0, 4)])
+def test_empty_games(shape):
+    population, electoral_votes, chosen = minimum_winning_coalitions(np.zeros(shape), np.zeros(shape))
+    assert population.shape == electoral_votes.shape == shape[:-1]
+    assert chosen.shape == shape
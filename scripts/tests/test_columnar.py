@@ -0,0 +1,42 @@
+"""The .ecol export reads back to exactly the values of the JSON timelines, in every column"""
+
+import json
+
+import numpy as np
+import pytest
+
+from columnar import COLUMNS, null_value, read_columnar, write_columnar
+from processData import calculate_metrics, create_state_timeline, load_data
+
+@pytest.fixture(scope='module')
+def timelines():
+    # Through JSON text, as the frontend sees stateTimelines.json
+    return json.loads(json.dumps(create_state_timeline(calculate_metrics(load_data()))))
+
+def field_value(entry, field):
+    for key in field.split('.'):
+        entry = entry[key]
+    return entry
+
+def test_every_column_round_trips(timelines, tmp_path):
+    write_columnar(timelines, tmp_path / 'stateTimelines.ecol')
+    data = read_columnar(tmp_path / 'stateTimelines.ecol')
+    assert data.states == list(timelines)
+
+    decoded = {field: data.decode(field) if dictionary else data[field] for field, (_, dictionary) in COLUMNS.items()}
+    for column, (state, timeline) in enumerate(timelines.items()):
+        for entry in timeline['timeline']:
+            row = data.years.index(entry['year'])
+            assert data['present'][row, column]
+            for field, (dtype, dictionary) in COLUMNS.items():
+                expected, stored = field_value(entry, field), decoded[field][row, column]
+                if dictionary is None and expected is None:
+                    assert stored == null_value(dtype) or np.isnan(stored), (state, entry['year'], field)
+                    continue
+                # As Python values, so a float32 is not compared at its own precision
+                stored = stored if dictionary else stored.item()
+                assert (type(stored), stored) == (type(expected), expected), (state, entry['year'], field)
+    assert data['present'].sum() == sum(len(timeline['timeline']) for timeline in timelines.values())
+
+def test_float_columns_are_stored_at_double_precision():
+    assert {dtype for dtype, _ in COLUMNS.values() if np.dtype(dtype).kind == 'f'} == {'<f8'}
@@ -0,0 +1,85 @@
+"""Every year decodes from the delta stream to exactly the drawn fields of the full timelines"""
+
+import json
+
+import pytest
+
+from deltas import FRAME_FIELDS, build_delta_stream, decode_year, iter_years, year_frames
+from processData import calculate_metrics, create_state_timeline, load_data, parse_args
+
+@pytest.fixture(scope='module')
+def timelines():
+    # Through JSON text, as stateTimelines.json is written
+    return json.loads(json.dumps(create_state_timeline(calculate_metrics(load_data()))))
+
+def expected_frames(timelines):
+    """{year: {state: {field: value}}} straight from the timelines, without the stream"""
+    years = sorted({entry['year'] for data in timelines.values() for entry in data['timeline']})
+    return {
+        year: {state: {field: entry.get(field) for field in FRAME_FIELDS}
+               for state, data in timelines.items() for entry in data['timeline'] if entry['year'] == year}
+        for year in years
+    }
+
+@pytest.mark.parametrize('interval', [1, 3, 8, 1000])
+def test_every_year_round_trips(timelines, interval):
+    # Through JSON text, as timelineDeltas.json is written
+    stream = json.loads(json.dumps(build_delta_stream(timelines, interval)))
+    expected = expected_frames(timelines)
+    assert stream['years'] == list(expected)
+
+    for year, states in expected.items():
+        decoded = decode_year(stream, year)
+        assert decoded == states, year
+        assert list(decoded) == list(states), year
+    played = {year: {state: dict(values) for state, values in states.items()} for year, states in iter_years(stream)}
+    assert played == expected
+    assert next(iter_years(stream, 1960)) == (1960, expected[1960])
+
+def test_diff_frames_only_carry_changes(timelines):
+    stream = build_delta_stream(timelines, 8)
+    frames = year_frames(timelines)
+    years = stream['years']
+    assert [year for year in years if stream['frames'][str(year)]['keyframe']] == years[::8]
+
+    # Virginia casts no EVs in 1864 and 1868; only what changed is stored when it returns
+    assert stream['frames']['1872']['changed']['Virginia']['exists'] is True
+    assert 'isSplitState' not in stream['frames']['1872']['changed']['Virginia']
+    for previous, year in zip(years, years[1:]):
+        frame = stream['frames'][str(year)]
+        if frame['keyframe']:
+            continue
+        for state, changed in frame['changed'].items():
+            if state in frames[previous]:
+                assert all(frames[previous][state][field] != value for field, value in changed.items())
+
+def test_states_leaving_and_returning():
+    def timeline(state, years):
+        return {'name': state, 'timeline': [{'year': year, 'winner': f"{state} {year}", 'exists': True}
+                                            for year in years]}
+
+    timelines = {'Ohio': timeline('Ohio', [1860, 1864, 1868]), 'Texas': timeline('Texas', [1860, 1868])}
+    stream = build_delta_stream(timelines, 8)
+    assert stream['frames']['1864']['removed'] == ['Texas']
+    assert stream['frames']['1868']['changed']['Texas'] == {field: None for field in FRAME_FIELDS} | {
+        'winner': 'Texas 1868', 'exists': True}
+    assert list(decode_year(stream, 1864)) == ['Ohio']
+    assert decode_year(stream, 1868) == expected_frames(timelines)[1868]
+
+def test_unknown_year():
+    stream = build_delta_stream({'Ohio': {'name': 'Ohio', 'timeline': [{'year': 2020, 'winner': 'Republican'}]}})
+    with pytest.raises(KeyError):
+        decode_year(stream, 2024)
+    with pytest.raises(ValueError):
+        build_delta_stream({}, 0)
+
+@pytest.mark.parametrize('argv, interval', [([], None), (['--deltas'], 8), (['--deltas', '3'], 3),
+                                            (['--deltas', '1'], 1)])
+def test_deltas_option(argv, interval):
+    assert parse_args(argv).deltas == interval
+
+@pytest.mark.parametrize('value', ['0', '-2', 'eight'])
+def test_deltas_option_rejects_intervals_below_one(value, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(['--deltas', value])
+    assert 'argument --deltas' in capsys.readouterr().err
@@ -0,0 +1,88 @@
+"""The dense index finds the right rows, survives save/load, and merges incremental years like a full rebuild"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from frame_index import INDEX_COLUMNS, YearStateIndex, load_index, merge_index
+from processData import OUTPUT_COLUMNS, calculate_metrics, load_data
+
+COLUMNS = OUTPUT_COLUMNS + INDEX_COLUMNS
+
+def assert_same_index(index, expected, columns=INDEX_COLUMNS):
+    assert index.years == expected.years
+    assert index.states == expected.states
+    assert np.array_equal(index.offsets, expected.offsets)
+    assert np.array_equal(index.order, expected.order)
+    assert np.array_equal(index.bounds, expected.bounds)
+    for column in columns:
+        grid, expected_grid = index.grid(column), expected.grid(column)
+        assert grid.dtype == expected_grid.dtype, column
+        assert np.array_equal(grid, expected_grid, equal_nan=grid.dtype.kind == 'f'), column
+
+@pytest.fixture(scope='module')
+def raw():
+    return load_data()
+
+def test_lookups():
+    df = pd.DataFrame({
+        'Year': [1800, 1796, 1800, 1796, 1804, 1800],
+        'State': ['Ohio', 'Maine', 'Maine', 'Ohio', 'Maine', 'Ohio'],
+        'Electoral_Votes': pd.array([3, 9, None, 4, 5, 6], dtype='Int64'),
+        'Is_Split_State': [False, True, False, False, True, True],
+    })
+    index = YearStateIndex(df)
+
+    assert index.years == [1796, 1800, 1804]
+    assert index.states == ['Ohio', 'Maine']
+    assert index.row(1800, 'Ohio') == 0 and index.row(1796, 'Maine') == 1
+    assert index.row(1804, 'Ohio') is None and index.row(1900, 'Ohio') is None and index.row(1800, 'Texas') is None
+    assert (1804, 'Maine') in index and (1804, 'Ohio') not in index
+    assert index.duplicates == 1
+
+    assert index.year_rows(1800).tolist() == [0, 5, 2]
+    assert index.year_rows(1796, 1800).tolist() == [3, 1, 0, 5, 2]
+    assert index.year_rows(1797, 1803).tolist() == [0, 5, 2]
+    assert index.state_rows('Maine').tolist() == [1, 2, 4]
+
+    votes = index.grid('Electoral_Votes')
+    assert np.array_equal(votes, [[4, 9], [3, np.nan], [np.nan, 5]], equal_nan=True)
+    assert index.value('Electoral_Votes', 1804, 'Ohio') is None
+    assert index.by_year('Is_Split_State', 1796).tolist() == [False, True]
+    assert np.shares_memory(index.by_state('Electoral_Votes', 'Maine'), votes)
+    with pytest.raises(ValueError):
+        votes[0, 0] = 1
+
+def test_save_and_load(raw, tmp_path):
+    index = YearStateIndex(calculate_metrics(raw.copy(), COLUMNS))
+    path = tmp_path / 'yearStateIndex.npz'
+    size = index.save(path)
+    assert size == path.stat().st_size
+
+    loaded = load_index(path)
+    assert_same_index(loaded, index)
+    assert loaded.year_rows(1960, 1968).tolist() == index.year_rows(1960, 1968).tolist()
+    assert loaded.value('Population', 2020, 'Ohio') == index.value('Population', 2020, 'Ohio')
+    with pytest.raises(KeyError):
+        loaded.grid('Winner')
+
+    # Saving the same arrays again leaves the file alone
+    modified = path.stat().st_mtime_ns
+    assert loaded.save(path) == size
+    assert path.stat().st_mtime_ns == modified
+
+def test_merge_matches_full_index(raw, tmp_path):
+    previous_path = tmp_path / 'yearStateIndex.npz'
+    YearStateIndex(calculate_metrics(raw.copy(), COLUMNS)).save(previous_path)
+
+    # One year edited, one dropped, and a state that only appears in the new data
+    df = raw[raw['Year'] != 1792].copy()
+    df.loc[(df['Year'] == 1960) & (df['State'] == 'Ohio'), 'Population'] += 500_000
+    extra = df[(df['Year'] == 1960) & (df['State'] == 'Ohio')].assign(State='Ohio Territory')
+    df = pd.concat([df, extra], ignore_index=True)
+    df['State'] = df['State'].astype('category')
+    affected = {1792, 1960}
+
+    subset = calculate_metrics(df[df['Year'].isin(affected)].copy(), COLUMNS)
+    merged = merge_index(df, load_index(previous_path), YearStateIndex(subset), affected)
+    assert_same_index(merged, YearStateIndex(calculate_metrics(df, COLUMNS)))
@@ -0,0 +1,99 @@
+"""Incremental and watch-mode rebuilds write the same bytes as a full rebuild of the same data, in every output"""
+
+import csv
+import io
+import os
+import select
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+RAW_DIR = SCRIPTS_DIR.parent / 'data' / 'raw'
+OPTIONS = ['--sharded', '--columnar', '--scenarios', '--deltas', '--dense-index']
+WATCH_TIMEOUT = 120
+
+def build(workdir, *args):
+    """Run processData.py with every output enabled in workdir; returns its stdout"""
+    run = subprocess.run([sys.executable, str(SCRIPTS_DIR / 'processing' / 'processData.py'), *OPTIONS, *args],
+                         cwd=workdir, capture_output=True, text=True)
+    assert run.returncode == 0, run.stdout + run.stderr
+    return run.stdout
+
+def read_until(process, marker, timeout=WATCH_TIMEOUT):
+    """Lines a running build prints up to and including the first one containing marker"""
+    deadline = time.monotonic() + timeout
+    lines = []
+    while not lines or marker not in lines[-1]:
+        remaining = deadline - time.monotonic()
+        assert remaining > 0 and select.select([process.stdout], [], [], remaining)[0], \
+            f"no {marker!r} within {timeout}s:\n" + ''.join(lines)
+        line = process.stdout.readline()
+        assert line, f"exited before {marker!r}:\n" + ''.join(lines)
+        lines.append(line)
+    return ''.join(lines)
+
+def outputs(workdir):
+    """{relative path: bytes} of everything under data/outputs"""
+    root = Path(workdir) / 'data' / 'outputs'
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob('*') if path.is_file()}
+
+def edit_population(csv_path, year, state, change):
+    """Change one row's Population in place, leaving every other line untouched"""
+    lines = csv_path.read_text().split('\n')
+    column = next(csv.reader([lines[0]])).index('Population')
+    for position, line in enumerate(lines):
+        row = next(csv.reader([line])) if line else []
+        if row[:2] == [year, state]:
+            row[column] = str(int(float(row[column])) + change)
+            text = io.StringIO()
+            csv.writer(text, lineterminator='').writerow(row)
+            lines[position] = text.getvalue()
+            break
+    else:
+        raise AssertionError(f"no {year} {state} row")
+    csv_path.write_text('\n'.join(lines))
+
+def test_incremental_rebuild_matches_full_rebuild(tmp_path):
+    incremental, full = tmp_path / 'incremental', tmp_path / 'full'
+    shutil.copytree(RAW_DIR, incremental / 'data' / 'raw')
+    build(incremental)
+
+    edit_population(incremental / 'data' / 'raw' / 'electoral_enhanced.csv', '1960', 'Ohio', 500_000)
+    assert 'rebuilding years [1960]' in build(incremental, '--incremental')
+
+    shutil.copytree(incremental / 'data' / 'raw', full / 'data' / 'raw')
+    build(full)
+
+    incremental_outputs, full_outputs = outputs(incremental), outputs(full)
+    assert sorted(incremental_outputs) == sorted(full_outputs)
+    assert [name for name in full_outputs if incremental_outputs[name] != full_outputs[name]] == []
+
+def test_watch_rebuild_matches_full_rebuild(tmp_path):
+    watched, full = tmp_path / 'watched', tmp_path / 'full'
+    shutil.copytree(RAW_DIR, watched / 'data' / 'raw')
+    process = subprocess.Popen([sys.executable, str(SCRIPTS_DIR / 'processing' / 'processData.py'), *OPTIONS,
+                                '--watch', '--debounce', '0.2'],
+                               cwd=watched, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                               env={**os.environ, 'PYTHONUNBUFFERED': '1'})
+    try:
+        read_until(process, 'Watching')
+        edit_population(watched / 'data' / 'raw' / 'electoral_enhanced.csv', '1960', 'Ohio', 500_000)
+        rebuild = read_until(process, 'Rebuilt in')
+        assert 'rebuilding years [1960]' in rebuild
+        process.send_signal(signal.SIGINT)
+        assert process.wait(timeout=WATCH_TIMEOUT) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+
+    shutil.copytree(watched / 'data' / 'raw', full / 'data' / 'raw')
+    build(full)
+
+    watched_outputs, full_outputs = outputs(watched), outputs(full)
+    assert sorted(watched_outputs) == sorted(full_outputs)
+    assert [name for name in full_outputs if watched_outputs[name] != full_outputs[name]] == []
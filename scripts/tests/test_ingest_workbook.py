@@ -0,0 +1,182 @@
+"""A generated workbook streams into the CSV schema, is cached by its hash, and diffs against the CSV row by row"""
+
+import zipfile
+from pathlib import Path
+from xml.etree.ElementTree import fromstring
+from xml.sax.saxutils import escape
+
+import pandas as pd
+import pytest
+
+import ingest_workbook
+from ingest_workbook import (MAIN_NS, POPULATION_SHEET, VOTES_SHEET, _cell_value, diff_frames, load_workbook,
+                             read_workbook)
+from loader import SCHEMA, parse_csv
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MAIN = MAIN_NS.strip('{}')
+VOTES_COLUMNS = [column for column in SCHEMA if column not in ('Population', 'Population_Per_EV')]
+
+def column_letters(position):
+    letters = ''
+    position += 1
+    while position:
+        position, remainder = divmod(position - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def shared_string(text):
+    """A shared string item; text with a space is written as two rich-text runs"""
+    if ' ' not in text:
+        return f'<si><t>{escape(text)}</t></si>'
+    first, rest = text.split(' ', 1)
+    return f'<si><r><t xml:space="preserve">{escape(first)} </t></r><r><rPr><b/></rPr><t>{escape(rest)}</t></r></si>'
+
+def write_workbook(path, sheets):
+    """A minimal .xlsx: text in the shared string table, numbers in the cells, None cells left out"""
+    strings = {}
+    members = {}
+    for number, (name, rows) in enumerate(sheets.items(), start=1):
+        xml_rows = []
+        for row_number, row in enumerate(rows, start=1):
+            cells = []
+            for position, value in enumerate(row):
+                reference = f"{column_letters(position)}{row_number}"
+                if value is None:
+                    continue
+                if isinstance(value, str):
+                    cells.append(f'<c r="{reference}" t="s"><v>{strings.setdefault(value, len(strings))}</v></c>')
+                else:
+                    cells.append(f'<c r="{reference}"><v>{value!r}</v></c>')
+            xml_rows.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+        members[f'xl/worksheets/sheet{number}.xml'] = (
+            f'<worksheet xmlns="{MAIN}"><sheetData>{"".join(xml_rows)}</sheetData></worksheet>')
+
+    relationships = ''.join(
+        # The first sheet's target is relative to xl/, the others absolute, as writers differ
+        f'<Relationship Id="rId{number}" Type="worksheet" '
+        f'Target="{"" if number == 1 else "/xl/"}worksheets/sheet{number}.xml"/>'
+        for number in range(1, len(sheets) + 1))
+    members['xl/_rels/workbook.xml.rels'] = (
+        f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{relationships}</Relationships>')
+    sheet_elements = ''.join(f'<sheet name="{name}" sheetId="{number}" r:id="rId{number}"/>'
+                             for number, name in enumerate(sheets, start=1))
+    members['xl/workbook.xml'] = (
+        f'<workbook xmlns="{MAIN}" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets>{sheet_elements}</sheets></workbook>')
+    members['xl/sharedStrings.xml'] = f'<sst xmlns="{MAIN}">{"".join(map(shared_string, strings))}</sst>'
+
+    with zipfile.ZipFile(path, 'w') as archive:
+        for member, content in members.items():
+            archive.writestr(member, content)
+    return path
+
+@pytest.fixture(scope='module')
+def sample():
+    """A few real CSV rows, including 1789 rows without runner-up, parties or population"""
+    csv = parse_csv(REPO_ROOT / 'data' / 'raw' / 'electoral_enhanced.csv')
+    rows = csv[csv['Year'].isin([1789, 1860, 2020])
+               & csv['State'].isin(['Connecticut', 'Maine', 'Nebraska', 'Ohio', 'Virginia'])]
+    return rows.reset_index(drop=True)
+
+def sheets(frame):
+    """Workbook sheets holding a root frame's rows: results, and populations in the workbook's column order"""
+    values = frame.astype(object).where(frame.notna(), None)
+    populated = values[values['Population'].notna()]
+    return {
+        VOTES_SHEET: [VOTES_COLUMNS] + values[VOTES_COLUMNS].to_numpy().tolist(),
+        POPULATION_SHEET: [['State', 'Year', 'Population']] + [
+            [state, year, int(population)]
+            for state, year, population in populated[['State', 'Year', 'Population']].itertuples(index=False)],
+    }
+
+def changed_rows(added, removed, changes):
+    return ([tuple(key) for key in added.itertuples(index=False)],
+            [tuple(key) for key in removed.itertuples(index=False)],
+            [tuple(change) for change in changes[['Year', 'State', 'field', 'old', 'new']].itertuples(index=False)])
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingest_workbook, 'CACHE_DIR', tmp_path / 'cache')
+    return tmp_path / 'cache'
+
+def test_read_workbook(sample, tmp_path):
+    path = write_workbook(tmp_path / 'sample.xlsx', sheets(sample))
+    frames = read_workbook(path, workers=1)
+    assert list(frames[VOTES_SHEET].columns) == VOTES_COLUMNS
+    assert list(frames[POPULATION_SHEET].columns) == ['State', 'Year', 'Population']
+
+    votes = frames[VOTES_SHEET].set_index(['Year', 'State'])
+    # Rich-text shared strings, and cells missing from the row, including its last ones
+    assert votes.loc[(2020, 'Maine'), 'Notes'] == 'Split by district'
+    assert pd.isna(votes.loc[(1789, 'Virginia'), 'Runner_Up'])
+    assert pd.isna(votes.loc[(1789, 'Virginia'), 'RunnerUp_Party'])
+    assert votes.loc[(2020, 'Ohio'), 'Electoral_Votes'] == 18
+
+    # Sheets parsed on a pool come out the same
+    pooled = read_workbook(path, workers=2)
+    for name, frame in frames.items():
+        assert pooled[name].equals(frame)
+
+def test_workbook_converts_to_the_csv_rows(sample, tmp_path, cache):
+    incoming, cached = load_workbook(write_workbook(tmp_path / 'sample.xlsx', sheets(sample)), workers=1)
+    assert not cached
+    assert list(incoming.columns) == list(SCHEMA)
+    assert incoming[['Year', 'State']].astype(object).values.tolist() == \
+        sample[['Year', 'State']].astype(object).values.tolist()
+    assert changed_rows(*diff_frames(sample, incoming)) == ([], [], [])
+
+def test_conversion_is_cached_by_workbook_hash(sample, tmp_path, cache):
+    path = write_workbook(tmp_path / 'sample.xlsx', sheets(sample))
+    first, cached = load_workbook(path, workers=1)
+    assert not cached and len(list(cache.glob('workbook-*.csv'))) == 1
+    second, cached = load_workbook(path, workers=1)
+    assert cached and second.equals(first)
+
+    edited = sample.copy()
+    edited.loc[edited['State'] == 'Connecticut', 'Total_EV_Cast'] = 70
+    _, cached = load_workbook(write_workbook(path, sheets(edited)), workers=1)
+    assert not cached and len(list(cache.glob('workbook-*.csv'))) == 2
+
+def test_diff_against_the_csv(sample, tmp_path, cache):
+    edited = sample.copy()
+    ohio = (edited['Year'] == 2020) & (edited['State'] == 'Ohio')
+    edited.loc[ohio, 'Winner_EV'] = 17
+    edited.loc[ohio, 'Runner_Up_EV'] = 1
+    maine = (edited['Year'] == 2020) & (edited['State'] == 'Maine')
+    edited.loc[maine, 'Population'] = 1_362_363
+    edited = edited[~((edited['Year'] == 1860) & (edited['State'] == 'Virginia'))]
+    added = sample[(sample['Year'] == 2020) & (sample['State'] == 'Ohio')].assign(Year=2024)
+    workbook = write_workbook(tmp_path / 'edited.xlsx', sheets(pd.concat([edited, added], ignore_index=True)))
+    incoming, _ = load_workbook(workbook, workers=1)
+
+    assert changed_rows(*diff_frames(sample, incoming)) == (
+        [(2024, 'Ohio')],
+        [(1860, 'Virginia')],
+        [
+            (2020, 'Maine', 'Population', 1362359.0, 1362363.0),
+            (2020, 'Maine', 'Population_Per_EV', 340589.75, 340590.75),
+            (2020, 'Ohio', 'Winner_EV', 18, 17),
+            (2020, 'Ohio', 'Runner_Up_EV', 0, 1),
+        ],
+    )
+
+@pytest.mark.parametrize('cell, value', [
+    ('<c r="A1" t="inlineStr"><is><t>Inline</t></is></c>', 'Inline'),
+    ('<c r="A1" t="str"><f>A2</f><v>Formula text</v></c>', 'Formula text'),
+    ('<c r="A1" t="b"><v>1</v></c>', True),
+    ('<c r="A1" t="e"><v>#N/A</v></c>', None),
+    ('<c r="A1" s="3"/>', None),
+    ('<c r="A1"><v>538</v></c>', 538),
+    ('<c r="A1"><v>0.5</v></c>', 0.5),
+    ('<c r="A1" t="s"><v>1</v></c>', 'second'),
+])
+def test_cell_values(cell, value):
+    element = fromstring(cell.replace('<c ', f'<c xmlns="{MAIN}" ', 1))
+    assert _cell_value(element, ['first', 'second']) == value
+
+def test_missing_sheet(tmp_path):
+    path = write_workbook(tmp_path / 'votes-only.xlsx', {VOTES_SHEET: [VOTES_COLUMNS]})
+    with pytest.raises(ValueError, match=POPULATION_SHEET):
+        read_workbook(path, workers=1)
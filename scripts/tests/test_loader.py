@@ -0,0 +1,65 @@
+"""The typed CSV cache is reused while the content is unchanged and rebuilt when it changes"""
+
+import importlib.util
+import os
+
+import pandas as pd
+import pytest
+
+import loader
+
+CSV = """Year,State,Electoral_Votes,Winner,Winner_EV,Runner_Up,Runner_Up_EV,Total_EV_Cast,Notes,Winner_Party,RunnerUp_Party,Population,Population_Per_EV
+2016,Maine,4,Hillary Clinton,3,Donald Trump,1,538,Split by district,Democratic,Republican,1328361,332090.25
+2016,Ohio,18,Donald Trump,18,,,538,,Republican,,11536504,640916.888889
+"""
+
+FORMATS = ['pickle'] + (['feather'] if importlib.util.find_spec('pyarrow') else [])
+
+@pytest.fixture(params=FORMATS)
+def source(request, tmp_path, monkeypatch):
+    """A small CSV with an empty cache, and the list of paths parsed from text"""
+    monkeypatch.setattr(loader, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(loader, 'CACHE_FORMAT', request.param)
+    parses = []
+    parse_csv = loader.parse_csv
+    monkeypatch.setattr(loader, 'parse_csv', lambda path=loader.CSV_PATH: parses.append(path) or parse_csv(path))
+    path = tmp_path / 'electoral_enhanced.csv'
+    path.write_text(CSV)
+    return path, parses
+
+def test_unchanged_file_is_read_from_cache(source):
+    csv_path, parses = source
+    first = loader.load_electoral_data(csv_path)
+    second = loader.load_electoral_data(csv_path)
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+def test_touched_file_with_the_same_content_reuses_the_cache(source):
+    csv_path, parses = source
+    loader.load_electoral_data(csv_path)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    loader.load_electoral_data(csv_path)
+    loader.load_electoral_data(csv_path)
+    assert len(parses) == 1
+
+def test_edit_of_the_same_size_is_caught_by_the_hash(source):
+    csv_path, parses = source
+    assert loader.load_electoral_data(csv_path)['Winner_EV'].tolist() == [3, 18]
+    csv_path.write_text(CSV.replace('Hillary Clinton,3,Donald Trump,1', 'Hillary Clinton,2,Donald Trump,2'))
+    assert csv_path.stat().st_size == len(CSV)
+
+    df = loader.load_electoral_data(csv_path)
+    assert len(parses) == 2
+    assert df['Winner_EV'].tolist() == [2, 18]
+
+def test_schema_survives_the_cache(source):
+    csv_path, parses = source
+    parsed = loader.load_electoral_data(csv_path)
+    cached = loader.load_electoral_data(csv_path)
+    assert len(parses) == 1
+    assert {column: str(dtype) for column, dtype in cached.dtypes.items()} == loader.SCHEMA
+    assert cached['Runner_Up_EV'].isna().tolist() == [False, True]
+    assert cached['Winner_Party'].cat.categories.tolist() == ['Democratic', 'Republican']
+    pd.testing.assert_frame_equal(cached, parsed)
@@ -0,0 +1,74 @@
+"""The metrics registry computes the same columns as the single calculate_metrics pass it replaced"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apportionment import apportion_frame
+from metrics import METRICS, Metric, MetricsEngine
+from notes_classifier import NOTE_COLUMNS, default_classifier
+from party_inference import default_matcher
+from power_index import frame_power_indices
+from processData import OUTPUT_COLUMNS, calculate_metrics, load_data
+
+def reference_metrics(df):
+    """calculate_metrics as it was before the registry: every column, in one pass"""
+    for party, candidate in (('Winner_Party', 'Winner'), ('RunnerUp_Party', 'Runner_Up')):
+        corrected = df[party].astype(object).fillna('Unknown')
+        missing = corrected.isin(['Unknown', '', None]) | corrected.isna()
+        if missing.any():
+            inferred = default_matcher().infer_column(df.loc[missing, candidate]).dropna()
+            corrected.loc[inferred.index] = inferred
+        df[f"Corrected_{party}"] = corrected
+    df['Is_Split_State'] = ((df['Winner_EV'] < df['Electoral_Votes']) & (df['Runner_Up_EV'] > 0)).fillna(False).astype(bool)
+    classified = default_classifier().classify_column(df['Notes'])
+    for column in NOTE_COLUMNS:
+        df[column] = classified[column]
+
+    df['Population_Per_EV'] = (df['Population'] / df['Electoral_Votes']).replace([np.inf, -np.inf], np.nan)
+    year_stats = df.groupby('Year').agg({'Population': 'sum', 'Electoral_Votes': 'sum'}).reset_index()
+    year_stats['National_Pop_Per_EV'] = year_stats['Population'] / year_stats['Electoral_Votes']
+    df = df.merge(year_stats[['Year', 'National_Pop_Per_EV']], on='Year', how='left')
+    df['Representation_Ratio'] = (df['National_Pop_Per_EV'] / df['Population_Per_EV']).replace([np.inf, -np.inf], np.nan)
+    df['Hypothetical_EVs'] = (df['Population'] / df['National_Pop_Per_EV']).round()
+    df['EV_Difference'] = df['Hypothetical_EVs'] - df['Electoral_Votes']
+    df = df.join(apportion_frame(df))
+    for column, values in frame_power_indices(df).items():
+        df[column] = values
+    return df
+
+@pytest.fixture(scope='module')
+def raw():
+    return load_data()
+
+def test_output_columns_match_the_single_pass(raw):
+    columns = OUTPUT_COLUMNS + NOTE_COLUMNS
+    expected = reference_metrics(raw.copy())[columns]
+    actual = calculate_metrics(raw.copy(), columns)[columns]
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected)
+
+def test_default_columns_are_the_output_columns(raw):
+    df = calculate_metrics(raw.copy())
+    assert set(OUTPUT_COLUMNS) <= set(df)
+    assert not set(NOTE_COLUMNS) & set(df)
+
+def test_plan_runs_only_what_the_columns_need(raw):
+    engine = MetricsEngine(raw.copy())
+    assert [entry.name for entry in engine.plan(['Representation_Ratio'])] == [
+        'national_pop_per_ev', 'population_per_ev', 'representation_ratio']
+    engine.require(['Population_Per_EV'])
+    assert [entry.name for entry in engine.plan(['Representation_Ratio', 'Population_Per_EV'])] == [
+        'national_pop_per_ev', 'representation_ratio']
+
+def test_unknown_column_raises(raw):
+    with pytest.raises(KeyError, match='Nonexistent'):
+        MetricsEngine(raw.copy()).plan(['Nonexistent'])
+
+def test_cycle_raises():
+    registry = dict(METRICS)
+    for name, column, inputs in (('first', 'A', ['B']), ('second', 'B', ['C']), ('third', 'C', ['A'])):
+        compute = lambda df: df['Year']
+        compute.__name__ = name
+        registry[column] = Metric([column], inputs, compute)
+    with pytest.raises(ValueError, match='cycle: first -> second -> third -> first'):
+        MetricsEngine(pd.DataFrame({'Year': [2020]}), registry).plan(['A'])
@@ -0,0 +1,111 @@
+"""Each Notes rule on its own, and classify_column broadcasting one classification per distinct note"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from notes_classifier import NOTE_COLUMNS, NotesClassifier, default_classifier
+
+@pytest.mark.parametrize('note, split_type', [
+    ('Split by district', 'district'),
+    ('split by district (2 of 4)', 'district'),
+    ('Complex split', 'complex'),
+    ('Electoral votes split', 'vote'),
+    ('Split', 'vote'),
+    ('Splitting hairs', None),
+    ('Included Maine district', None),
+    ('Lincoln Republican', None),
+])
+def test_split_type(note, split_type):
+    assert default_classifier().classify(note)['Split_Type'] == split_type
+
+@pytest.mark.parametrize('note, faithless', [
+    ('1 faithless elector', 1),
+    ('1 faithless elector voted Bentsen', 1),
+    ('4 faithless electors', 4),
+    ('12  Faithless Electors', 12),
+    ('2 electors did not vote', 0),
+    ('faithless electors', 0),
+])
+def test_faithless_electors(note, faithless):
+    assert default_classifier().classify(note)['Faithless_Electors'] == faithless
+
+@pytest.mark.parametrize('note, disputed', [
+    ('Disputed; awarded to Hayes', True),
+    ('Result disputed', True),
+    ('Undisputed Republican', False),
+    ('Lincoln Republican', False),
+])
+def test_disputed(note, disputed):
+    assert default_classifier().classify(note)['Is_Disputed'] is disputed
+
+@pytest.mark.parametrize('note, party', [
+    # District splits name no single party
+    ('Split by district', 'Split'),
+    # Faithless and awarded disputes defer to Winner_Party, before any party word in them
+    ('2 faithless electors', None),
+    ('3 Faithless Electors voted Republican', None),
+    ('Disputed; awarded to Hayes', None),
+    ('Awarded to Tilden, later disputed Democrat', None),
+    # Party words are case-sensitive substrings, checked in table order
+    ('Lincoln Republican', 'Republican'),
+    ('Democratic-Republican', 'Republican'),
+    ('Biden Democrat', 'Democratic'),
+    ('Southern Democrats', 'Democratic'),
+    ('Adams Federalist', 'Federalist'),
+    ('Harrison Whig', 'Whig'),
+    ('Roosevelt Progressive', 'Progressive'),
+    ('Did Not Vote', 'Did Not Vote'),
+    ('lincoln republican', 'republican'),
+    # Otherwise the last of two or more words, unless it is a non-party word
+    ('Bell Constitutional Union', 'Union'),
+    ('1 faithless elector voted Bentsen', 'Bentsen'),
+    ('Adams home state', None),
+    ('Bryan home state lost', None),
+    ('1 elector did not vote', None),
+    ('Each elector had 2 votes', None),
+    ('Included Maine District', None),
+    ('Anti-Masonic', None),
+    ('   ', None),
+])
+def test_notes_party(note, party):
+    assert default_classifier().classify(note)['Notes_Party'] == party
+
+@pytest.mark.parametrize('note', [None, np.nan, pd.NA, ''])
+def test_missing_note(note):
+    assert default_classifier().classify(note) == {
+        'Split_Type': None, 'Faithless_Electors': 0, 'Is_Disputed': False, 'Notes_Party': None}
+
+def test_rule_tables_are_replaceable():
+    classifier = NotesClassifier(split_rules=(('halved', r'\bhalved\b'),),
+                                 party_rules=((re.compile(r'Tory'), 'Conservative'),))
+    assert classifier.classify('Halved votes') == {
+        'Split_Type': 'halved', 'Faithless_Electors': 0, 'Is_Disputed': False, 'Notes_Party': None}
+    assert classifier.classify('Tory Split')['Split_Type'] is None
+    assert classifier.classify('Tory Split')['Notes_Party'] == 'Conservative'
+
+@pytest.mark.parametrize('categorical', [True, False], ids=['categorical', 'object'])
+def test_classify_column(categorical):
+    notes = pd.Series(['Split by district', None, 'Lincoln Republican', '2 faithless electors', 'Split by district',
+                       'Disputed; awarded to Hayes', ''], index=[10, 11, 12, 13, 14, 15, 16])
+    if categorical:
+        notes = notes.astype('category')
+    classifier = NotesClassifier()
+    calls = []
+    classify = classifier.classify
+    classifier.classify = lambda note: calls.append(note) or classify(note)
+
+    result = classifier.classify_column(notes)
+    assert list(result.columns) == NOTE_COLUMNS
+    assert result.index.equals(notes.index)
+    assert result['Split_Type'].tolist() == ['district', np.nan, np.nan, np.nan, 'district', np.nan, np.nan]
+    assert result['Split_Type'].cat.categories.tolist() == ['district', 'complex', 'vote']
+    assert result['Faithless_Electors'].tolist() == [0, 0, 0, 2, 0, 0, 0]
+    assert result['Faithless_Electors'].dtype == np.int64
+    assert result['Is_Disputed'].tolist() == [False, False, False, False, False, True, False]
+    assert result['Notes_Party'].tolist() == ['Split', None, 'Republican', None, 'Split', None, None]
+
+    # Once per distinct note, plus once for the missing ones
+    assert len(calls) == 6
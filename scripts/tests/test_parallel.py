@@ -0,0 +1,68 @@
+"""A build on a process pool writes the same bytes as a sequential build, and the shared frame reads back unchanged"""
+
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import parallel
+from processData import calculate_metrics, load_data
+from test_incremental import RAW_DIR, build, outputs
+
+def synthetic_frame():
+    df = pd.DataFrame({
+        'State': pd.Categorical(['Ohio', 'Texas', None, 'Ohio', 'Maine']),
+        'Rank': pd.Categorical(['b', 'a', 'b', None, 'c'], categories=['c', 'b', 'a'], ordered=True),
+        'Electoral_Votes': pd.array([18, None, 3, 4, 0], dtype='Int64'),
+        'Representation_Ratio': pd.array([1.25, 0.5, None, 2.0, 0.1], dtype='Float64'),
+        'Is_Split': pd.array([True, None, False, False, True], dtype='boolean'),
+        'Population': [1.5e6, np.nan, 3.0, 4.0, 5.0],
+        'Year': np.array([2020, 2020, 1800, 1804, 2024], dtype=np.int64),
+        'Flag': [True, False, True, False, False],
+        'Party': ['Democratic', None, 'Republican', 'Democratic', np.nan],
+        'Winner': pd.array(['A', 'B', None, 'A', 'C'], dtype='string'),
+    })
+    # A filtered frame keeps its original row labels
+    return df.iloc[[4, 0, 2, 3]]
+
+@pytest.fixture
+def attach():
+    """attach_frame in this process, detaching again after the test"""
+    names = set()
+
+    def attach_frame(spec):
+        names.add(spec['name'])
+        return parallel.attach_frame(spec)
+
+    yield attach_frame
+    for name in names:
+        shm, frame = parallel._attached.pop(name)
+        del frame
+        shm.close()
+
+@pytest.mark.parametrize('make_frame', [synthetic_frame, lambda: calculate_metrics(load_data())],
+                         ids=['synthetic', 'metrics'])
+def test_shared_frame_round_trip(make_frame, attach):
+    df = make_frame()
+    shared = parallel.SharedFrame(df)
+    try:
+        frame = attach(shared.spec)
+        pd.testing.assert_frame_equal(frame, df, check_exact=True)
+        # Zero-copy: the columns are read-only views into the block
+        assert not frame['Population'].to_numpy().flags.writeable
+        assert attach(shared.spec) is frame
+        del frame
+    finally:
+        shared.close()
+
+def test_parallel_build_matches_sequential_build(tmp_path):
+    sequential, pooled = tmp_path / 'sequential', tmp_path / 'pooled'
+    for workdir in (sequential, pooled):
+        shutil.copytree(RAW_DIR, workdir / 'data' / 'raw')
+    build(sequential)
+    assert 'on 4 worker processes' in build(pooled, '--workers', '4')
+
+    sequential_outputs, pooled_outputs = outputs(sequential), outputs(pooled)
+    assert sorted(pooled_outputs) == sorted(sequential_outputs)
+    assert [name for name in sequential_outputs if pooled_outputs[name] != sequential_outputs[name]] == []
@@ -0,0 +1,55 @@
+"""Candidate names map to parties by whole-word table matches, each distinct name matched once"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from party_inference import CandidatePartyMatcher
+
+@pytest.mark.parametrize('name, party', [
+    ('Joe Biden', 'Democratic'),
+    ('Mike Pence', 'Republican'),
+    ('  DONALD TRUMP ', 'Republican'),
+    ('George Washington', 'Independent'),
+    # Table names inside longer words are not matches
+    ('Benjamin Harrison', None),
+    ('William Henry Harrison', None),
+    ('Booker Washingtonian', None),
+    ('Bushrod Johnson', None),
+    # Hyphenated and punctuated names still split into words
+    ('Clinton-Gore', 'Democratic'),
+    ('H. W. Bush, Jr.', 'Republican'),
+    ('Abraham Lincoln', None),
+    ('', None),
+    (None, None),
+    (np.nan, None),
+])
+def test_whole_word_matches(name, party):
+    assert CandidatePartyMatcher().infer(name) == party
+
+def test_earlier_table_entry_wins():
+    assert CandidatePartyMatcher().infer('Bush Clinton ticket') == 'Democratic'
+    matcher = CandidatePartyMatcher((('Whig', ('harrison',)), ('Democratic', ('harris',))))
+    assert matcher.infer('Kamala Harris') == 'Democratic'
+    assert matcher.infer('William Henry Harrison') == 'Whig'
+    assert matcher.parties == ['Democratic', 'Whig']
+
+def test_column_matches_each_distinct_name_once():
+    matcher = CandidatePartyMatcher()
+    calls = []
+    best_party = matcher._best_party
+    matcher._best_party = lambda matches: calls.append(matches) or best_party(matches)
+
+    names = pd.Series(['Barack Obama', 'Mitt Romney', 'Barack Obama', None, 'Ross Perot'], index=[10, 11, 12, 13, 14])
+    parties = matcher.infer_column(names)
+    assert parties.index.tolist() == [10, 11, 12, 13, 14]
+    assert parties.tolist() == ['Democratic', 'Republican', 'Democratic', None, None]
+    assert len(calls) == 3
+
+    # Names seen before, by the column or one at a time, come from the memo
+    assert matcher.infer_column(['Ross Perot', 'Mitt Romney']).tolist() == [None, 'Republican']
+    assert matcher.infer('Barack Obama') == 'Democratic'
+    assert len(calls) == 3
+    assert matcher.infer('John McCain') == 'Republican'
+    assert matcher.infer_column(pd.Categorical(['John McCain', 'Bob Dole'])).tolist() == ['Republican', 'Republican']
+    assert len(calls) == 5
@@ -0,0 +1,70 @@
+"""power_indices against hand-checked games and a brute-force enumeration of every coalition and ordering"""
+
+from itertools import combinations, permutations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from power_index import frame_power_indices, power_indices
+
+def reference_indices(weights, quota):
+    """Normalized Banzhaf and Shapley-Shubik by enumerating coalitions and orderings"""
+    players = [player for player, weight in enumerate(weights) if weight > 0]
+    swings = dict.fromkeys(players, 0)
+    for size in range(len(players)):
+        for coalition in combinations(players, size):
+            held = sum(weights[member] for member in coalition)
+            for player in players:
+                if player not in coalition and held < quota <= held + weights[player]:
+                    swings[player] += 1
+    pivots = dict.fromkeys(players, 0)
+    orderings = list(permutations(players))
+    for ordering in orderings:
+        held = 0
+        for player in ordering:
+            held += weights[player]
+            if held >= quota:
+                pivots[player] += 1
+                break
+    total = sum(swings.values())
+    banzhaf = [swings[player] / total if player in swings else np.nan for player in range(len(weights))]
+    shapley = [pivots[player] / len(orderings) if player in pivots else np.nan for player in range(len(weights))]
+    return banzhaf, shapley
+
+@pytest.mark.parametrize('weights, quota, banzhaf, shapley', [
+    # The large player swings every coalition of small ones; each small one only {large}
+    ([3, 1, 1, 1], None, [7 / 10, 1 / 10, 1 / 10, 1 / 10], [3 / 4, 1 / 12, 1 / 12, 1 / 12]),
+    ([4, 3, 2, 1], 6, [5 / 12, 1 / 4, 1 / 4, 1 / 12], [5 / 12, 1 / 4, 1 / 4, 1 / 12]),
+    # A player of weight 0 is not in the game
+    ([2, 0, 1, 1], None, [3 / 5, np.nan, 1 / 5, 1 / 5], [2 / 3, np.nan, 1 / 6, 1 / 6]),
+])
+def test_hand_checked_games(weights, quota, banzhaf, shapley):
+    result = power_indices(np.array([weights], dtype=float), quota)
+    np.testing.assert_allclose(result[0][0], banzhaf)
+    np.testing.assert_allclose(result[1][0], shapley)
+
+def test_matches_enumeration_on_random_games():
+    rng = np.random.default_rng(3)
+    weights = rng.integers(0, 9, size=(40, 7)).astype(float)
+    weights[rng.random(weights.shape) < 0.1] = np.nan
+    banzhaf, shapley = power_indices(weights)
+    for game, (row_banzhaf, row_shapley) in enumerate(zip(banzhaf, shapley)):
+        row = np.nan_to_num(weights[game]).astype(int).tolist()
+        if not any(row):
+            assert np.isnan(row_banzhaf).all() and np.isnan(row_shapley).all()
+            continue
+        expected_banzhaf, expected_shapley = reference_indices(row, sum(row) // 2 + 1)
+        np.testing.assert_allclose(row_banzhaf, expected_banzhaf, err_msg=f"game {row}")
+        np.testing.assert_allclose(row_shapley, expected_shapley, err_msg=f"game {row}")
+
+@pytest.mark.parametrize('shape', [(0, 0), (0, 5), (3, 0), (2, 0, 4)])
+def test_empty_games(shape):
+    banzhaf, shapley = power_indices(np.zeros(shape))
+    assert banzhaf.shape == shapley.shape == shape
+
+def test_empty_frame():
+    df = pd.DataFrame({'Year': pd.Series(dtype='int64'), 'State': pd.Series(dtype=object),
+                       'Electoral_Votes': pd.Series(dtype='Int64')})
+    columns = frame_power_indices(df)
+    assert {name: len(values) for name, values in columns.items()} == {'Banzhaf_Index': 0, 'Shapley_Shubik_Index': 0}
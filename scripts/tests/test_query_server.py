@@ -0,0 +1,202 @@
+"""QueryApp routes, caches and revalidates responses; handle_connection keeps connections usable between requests"""
+
+import asyncio
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from query_server import ElectoralIndex, QueryApp, handle_connection
+from scenarios import save_whatif_scenarios
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / 'data' / 'outputs'
+
+class BrokenIndex:
+    """Index whose year lookups fail the way a corrupt output would"""
+    years = [2020]
+    states = ['Ohio']
+
+    def resolve_year(self, value):
+        return int(value)
+
+    def year(self, year):
+        raise KeyError('summary')
+
+@pytest.fixture(scope='module')
+def index():
+    # The tracked outputs have no whatIfScenarios.json, so what-if years are solved on demand
+    return ElectoralIndex(OUTPUT_DIR)
+
+@pytest.fixture
+def app(index):
+    return QueryApp(index)
+
+def get(app, target, headers=None, method='GET'):
+    """(status, headers, parsed body) of one request"""
+    status, response_headers, body = app.respond(method, target, headers or {})
+    return status, response_headers, json.loads(body) if body else None
+
+def test_routes(app, index):
+    status, _, body = get(app, '/')
+    assert status == 200 and body['years'] == index.years and body['states'] == index.states
+
+    status, _, body = get(app, '/year/2020')
+    assert status == 200 and body['summary'] == index.summaries[2020]
+    assert body['states'] == {state: entry for state, data in index.timelines.items()
+                              for entry in data['timeline'] if entry['year'] == 2020}
+
+    for target in ('/state/New%20York', '/state/new-york', '/state/NEW%20YORK/', '/state/district-of-columbia'):
+        status, _, body = get(app, target)
+        assert status == 200 and body['name'] in ('New York', 'District of Columbia'), target
+    assert get(app, '/state/new-york')[2] == index.timelines['New York']
+
+@pytest.mark.parametrize('target, status', [
+    ('/year/1791', 404),
+    ('/year/next', 400),
+    ('/state/Atlantis', 404),
+    ('/state/Ohio/range?from=then', 400),
+    ('/whatif', 400),
+    ('/whatif?year=2020&normalize=Atlantis', 404),
+    ('/nowhere', 404),
+    ('/year/2020/extra', 404),
+])
+def test_errors(app, target, status):
+    response_status, _, body = get(app, target)
+    assert response_status == status and 'error' in body
+
+@pytest.mark.parametrize('state', ['Ohio', 'Alaska', 'District of Columbia'])
+@pytest.mark.parametrize('start, end', [(1960, 1968), (1961, 1967), (1700, 1800), (1789, 2024), (2030, 2040),
+                                        (1968, 1960)])
+def test_range_matches_a_filter(app, index, state, start, end):
+    status, _, body = get(app, f"/state/{state}/range?from={start}&to={end}")
+    assert status == 200
+    assert body['timeline'] == [entry for entry in index.timelines[state]['timeline'] if start <= entry['year'] <= end]
+
+def test_range_defaults_to_every_year(app, index):
+    assert get(app, '/state/Ohio/range')[2]['timeline'] == index.timelines['Ohio']['timeline']
+    assert get(app, '/state/Ohio/range?from=2000')[2]['timeline'] == [
+        entry for entry in index.timelines['Ohio']['timeline'] if entry['year'] >= 2000]
+
+def test_cache_and_etags(app):
+    first = app.respond('GET', '/state/ohio/range?from=1960&to=1968', {})
+    assert app.render.cache_info().misses == 1
+
+    # Same path and query in another spelling is the same cache entry
+    second = app.respond('GET', '/state/ohio/range/?to=1968&from=1960', {})
+    assert app.render.cache_info().hits == 1
+    assert second == first
+
+    etag = first[1]['ETag']
+    assert app.respond('GET', '/state/ohio/range?from=1960&to=1968', {'if-none-match': etag}) == (304, first[1], b'')
+    assert app.respond('GET', '/state/ohio/range?from=1960&to=1968', {'if-none-match': '"stale"'}) == first
+    assert app.respond('GET', '/state/ohio/range?from=1960&to=1972', {})[1]['ETag'] != etag
+
+    # Errors are never revalidated
+    status, headers, _ = app.respond('GET', '/year/1791', {})
+    assert app.respond('GET', '/year/1791', {'if-none-match': headers['ETag']})[0] == status == 404
+
+def test_cache_size_is_bounded(index):
+    app = QueryApp(index, cache_size=2)
+    for year in (2012, 2016, 2020, 2012):
+        app.respond('GET', f"/year/{year}", {})
+    info = app.render.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 4, 2)
+
+def test_methods(app):
+    assert app.respond('HEAD', '/year/2020', {}) == app.respond('GET', '/year/2020', {})
+    status, headers, body = get(app, '/year/2020', method='POST')
+    assert status == 405 and headers['Allow'] == 'GET, HEAD' and body == {'error': 'POST not allowed'}
+
+def test_whatif_is_solved_on_demand_or_read_from_the_precomputed_table(app, index, tmp_path):
+    assert index.whatif is None
+    for name in ('stateTimelines.json', 'yearSummaries.json'):
+        shutil.copy(OUTPUT_DIR / name, tmp_path / name)
+    save_whatif_scenarios(index.timelines, tmp_path / 'whatIfScenarios.json')
+    precomputed = QueryApp(ElectoralIndex(tmp_path))
+    assert precomputed.index.whatif is not None
+
+    for target in ('/whatif?year=2020', '/whatif?year=2020&normalize=wyoming', '/whatif?normalize=Texas&year=1960'):
+        solved, stored = get(app, target), get(precomputed, target)
+        assert solved[0] == 200 and solved == stored, target
+    assert sorted(index.solved) == [1960, 2020]
+
+    status, _, body = get(app, '/whatif?year=2020&normalize=wyoming')
+    assert body['mode'] == 'normalized' and body['normalize'] == 'Wyoming'
+    assert body['states'] == list(get(app, '/year/2020')[2]['states'])
+    assert get(app, '/whatif?year=2020&normalize=equal')[2]['mode'] == 'equal'
+
+async def exchange(app, requests):
+    """Send raw requests on one keep-alive connection; returns [(status, headers, body)] until it closes"""
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(app, reader, writer), '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    responses = []
+    for request in requests:
+        writer.write(request.encode('latin-1'))
+        await writer.drain()
+        try:
+            lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        except asyncio.IncompleteReadError:
+            break
+        headers = dict(line.split(': ', 1) for line in lines[1:] if line)
+        body = b'' if request.startswith('HEAD ') else await reader.readexactly(int(headers['Content-Length']))
+        responses.append((int(lines[0].split(' ')[1]), headers, body))
+
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    return responses
+
+def test_unexpected_error_returns_500_and_keeps_the_connection(capsys):
+    failing, working = asyncio.run(exchange(QueryApp(BrokenIndex()), [
+        'GET /year/2020 HTTP/1.1\r\nHost: localhost\r\n\r\n',
+        'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n',
+    ]))
+
+    status, headers, body = failing
+    assert status == 500
+    assert headers['Content-Type'] == 'application/json'
+    assert headers['Connection'] == 'keep-alive'
+    assert json.loads(body) == {'error': 'Internal server error'}
+    assert 'GET /year/2020 failed' in capsys.readouterr().err
+
+    status, _, body = working
+    assert status == 200
+    assert json.loads(body)['years'] == [2020]
+
+def test_unexpected_error_honours_connection_close():
+    (status, headers, _), = asyncio.run(exchange(QueryApp(BrokenIndex()),
+                                                 ['GET /year/2020 HTTP/1.1\r\nConnection: close\r\n\r\n']))
+    assert status == 500
+    assert headers['Connection'] == 'close'
+
+def test_keep_alive_skips_request_bodies(app):
+    body = json.dumps({'year': 2020, 'padding': 'x' * 5000})
+    responses = asyncio.run(exchange(app, [
+        f"POST /year/2020 HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n{body}",
+        'HEAD /year/2020 HTTP/1.1\r\n\r\n',
+        'GET /year/2020 HTTP/1.1\r\nContent-Length: 4\r\n\r\nGET ',
+        'GET /year/2020 HTTP/1.1\r\n\r\n',
+    ]))
+
+    assert [status for status, _, _ in responses] == [405, 200, 200, 200]
+    (_, _, rejected), (_, head, empty), (_, headers, year), _ = responses
+    assert json.loads(rejected) == {'error': 'POST not allowed'}
+    assert empty == b'' and head['Content-Length'] == headers['Content-Length'] == str(len(year))
+    assert head['ETag'] == headers['ETag'] and head['Connection'] == 'keep-alive'
+    assert json.loads(year)['year'] == 2020
+
+@pytest.mark.parametrize('framing, status', [
+    ('Transfer-Encoding: chunked\r\n\r\n4\r\nyear\r\n0\r\n\r\n', 501),
+    ('Content-Length: -4\r\n\r\nyear', 400),
+    ('Content-Length: 1000000\r\n\r\n', 413),
+], ids=['chunked', 'negative-length', 'too-large'])
+def test_bodies_that_cannot_be_skipped_close_the_connection(app, framing, status):
+    responses = asyncio.run(exchange(app, [
+        f"POST /year/2020 HTTP/1.1\r\n{framing}",
+        'GET /year/2020 HTTP/1.1\r\n\r\n',
+    ]))
+    (refused, headers, body), = responses
+    assert refused == status and headers['Connection'] == 'close' and 'error' in json.loads(body)
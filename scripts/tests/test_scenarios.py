@@ -0,0 +1,82 @@
+"""What-if scenarios: the largest-remainder allocation by hand, against Hamilton, and through a small year"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from apportionment import apportion_hamilton
+from scenarios import allocate_largest_remainder, build_whatif_scenarios, build_year_scenarios
+
+TIMELINES = Path(__file__).resolve().parents[2] / 'data' / 'outputs' / 'stateTimelines.json'
+
+@pytest.mark.parametrize('populations, ratio, total, expected', [
+    # Exact 5, 3, 1.5, 0.5: floors with a one-EV minimum already sum to 10
+    ([50, 30, 15, 5], 10, 10, [5, 3, 1, 1]),
+    # Exact 4.4, 3.3, 2.3: one EV short, the largest remainder (0.4) gets it
+    ([44, 33, 23], 10, 10, [5, 3, 2]),
+    # Exact 9.5, 0.2, 0.3: the minimum makes 11, and only the state above 1 EV can give one back
+    ([95, 2, 3], 10, 10, [8, 1, 1]),
+    # Exact 8.8, 6.6, 4.6: 8 too many, but at most one EV comes off each state, as in the app
+    ([44, 33, 23], 5, 10, [7, 5, 3]),
+    # Equal remainders keep state order
+    ([15, 15, 10], 10, 4, [2, 1, 1]),
+])
+def test_hand_worked_allocations(populations, ratio, total, expected):
+    allocated = allocate_largest_remainder(np.array(populations, dtype=float), np.array([ratio], dtype=float), total)
+    assert allocated.tolist() == [expected]
+
+def test_rows_are_independent():
+    populations = np.array([44, 33, 23], dtype=float)
+    allocated = allocate_largest_remainder(populations, np.array([10, 5, 10], dtype=float), 10)
+    assert allocated.tolist() == [[5, 3, 2], [7, 5, 3], [5, 3, 2]]
+
+def test_equal_representation_is_hamilton_when_every_quota_is_one_or_more():
+    rng = np.random.default_rng(9)
+    for _ in range(50):
+        populations = rng.integers(100_000, 1_000_000, size=rng.integers(2, 20)).astype(float)
+        seats = int(rng.integers(populations.sum() / populations.min(), 600))
+        allocated = allocate_largest_remainder(populations, np.array([populations.sum() / seats]), seats)
+        assert allocated[0].tolist() == apportion_hamilton(populations[None], np.array([seats]))[0].tolist()
+
+def test_real_equal_scenarios_match_hamilton():
+    with open(TIMELINES, 'r') as f:
+        timelines = json.load(f)
+    compared = 0
+    for year, scenarios in build_whatif_scenarios(timelines).items():
+        if scenarios['equal'] is None:
+            continue
+        entries = {state: entry for state, data in timelines.items() for entry in data['timeline'] if entry['year'] == year}
+        reallocated = [(state, evs) for state, evs in zip(scenarios['states'], scenarios['equal']['evs']) if evs is not None]
+        populations = np.array([entries[state]['population'] for state, _ in reallocated], dtype=float)
+        total = scenarios['original']['totalEVs']
+        if (populations / populations.sum() * total).min() < 1:
+            continue
+        expected = apportion_hamilton(populations[None], np.array([total]))[0]
+        assert [evs for _, evs in reallocated] == expected.tolist(), year
+        compared += 1
+    assert compared >= 10
+
+def test_small_year():
+    year = pd.DataFrame({
+        'state': ['A', 'B', 'C', 'D'],
+        'winner': ['Blue', 'Red', 'Red', None],
+        'electoralVotes': [3, 4, 3, 2],
+        'population': [44.0, 33.0, 23.0, np.nan],
+    })
+    result = build_year_scenarios(year)
+
+    assert result['original'] == {'partyTotals': {'Blue': 3, 'Red': 7}, 'winner': 'Red', 'winnerEVs': 7,
+                                  'runnerUpEVs': 3, 'totalEVs': 10}
+    # Equal representation at 10 people per EV; D has no winner and no population, so keeps no EVs
+    assert result['equal']['evs'] == [5, 3, 2, None]
+    assert result['equal']['partyTotals'] == {'Blue': 5, 'Red': 5}
+    assert result['equal']['winner'] == 'Blue' and result['equal']['outcomeChanged']
+    # Normalized to B: 8.25 people per EV gives exact 5.33, 4, 2.79, settled from 11 down to 10
+    assert list(result['normalized']) == ['A', 'B', 'C']
+    assert result['normalized']['B']['evs'] == [5, 3, 2, None]
+    # Normalized to A: exact 3, 2.25, 1.57 fall 4 short, and each state takes at most one more EV
+    assert result['normalized']['A']['evs'] == [4, 3, 2, None]
+    assert result['normalized']['A']['totalEVs'] == 9
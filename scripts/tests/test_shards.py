@@ -0,0 +1,97 @@
+"""Shards split the timelines by year and state, the manifest describes them, and stale shards are removed"""
+
+import hashlib
+import json
+
+import pytest
+
+from processData import calculate_metrics, create_state_timeline, create_year_summaries, load_data
+from shards import MANIFEST_NAME, SHARD_DIR, save_sharded_files, state_shard_name, year_shard_name
+
+def dataset(years, states):
+    timelines = {
+        state: {'name': state, 'timeline': [{'year': year, 'electoralVotes': position + 3} for year in years]}
+        for position, state in enumerate(states)
+    }
+    summaries = {str(year): {'totalElectoralVotes': sum(range(3, 3 + len(states)))} for year in years}
+    return timelines, summaries
+
+def read(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def shard_files(shard_dir):
+    return sorted(path.relative_to(shard_dir).as_posix() for path in shard_dir.glob('*/*.json'))
+
+def test_shards_and_manifest(tmp_path):
+    timelines, summaries = dataset([2016, 2020], ['Ohio', 'District of Columbia'])
+    manifest = save_sharded_files(timelines, summaries, tmp_path)
+    shard_dir = tmp_path / SHARD_DIR
+
+    assert read(shard_dir / MANIFEST_NAME) == manifest
+    assert list(manifest['years']) == ['2016', '2020']
+    assert list(manifest['states']) == ['Ohio', 'District of Columbia']
+    for entry in [*manifest['years'].values(), *manifest['states'].values()]:
+        content = (shard_dir / entry['file']).read_bytes()
+        assert entry['bytes'] == len(content)
+        assert entry['sha256'] == hashlib.sha256(content).hexdigest()
+
+    assert manifest['states']['District of Columbia']['file'] == 'states/district-of-columbia.json'
+    assert read(shard_dir / state_shard_name('Ohio')) == timelines['Ohio']
+    assert read(shard_dir / year_shard_name(2020)) == {
+        'year': 2020,
+        'summary': summaries['2020'],
+        'states': {state: data['timeline'][1] for state, data in timelines.items()},
+    }
+
+@pytest.fixture(scope='module')
+def outputs():
+    # Through JSON text, as stateTimelines.json and yearSummaries.json are written
+    df = calculate_metrics(load_data())
+    return json.loads(json.dumps(create_state_timeline(df))), json.loads(json.dumps(create_year_summaries(df)))
+
+def test_shards_split_the_real_outputs(outputs, tmp_path):
+    timelines, summaries = outputs
+    manifest = save_sharded_files(timelines, summaries, tmp_path)
+    shard_dir = tmp_path / SHARD_DIR
+    assert list(manifest['years']) == list(summaries)
+    assert list(manifest['states']) == list(timelines)
+
+    for state, data in timelines.items():
+        assert read(shard_dir / state_shard_name(state)) == data
+
+    # Every timeline entry lands in its year's shard, in stateTimelines.json state order, and nowhere else
+    rebuilt = {state: [] for state in timelines}
+    for year, summary in summaries.items():
+        shard = read(shard_dir / year_shard_name(year))
+        assert shard['year'] == int(year) and shard['summary'] == summary
+        assert list(shard['states']) == [state for state in timelines if state in shard['states']]
+        for state, entry in shard['states'].items():
+            assert entry['year'] == int(year)
+            rebuilt[state].append(entry)
+    assert rebuilt == {state: data['timeline'] for state, data in timelines.items()}
+
+def test_partial_rewrite_keeps_the_other_entries(tmp_path):
+    timelines, summaries = dataset([2016, 2020], ['Ohio', 'Texas'])
+    before = save_sharded_files(timelines, summaries, tmp_path)
+    timelines['Texas']['timeline'][1]['electoralVotes'] = 40
+
+    after = save_sharded_files(timelines, summaries, tmp_path, years={2020}, states={'Texas'})
+    assert after['years']['2016'] == before['years']['2016']
+    assert after['states']['Ohio'] == before['states']['Ohio']
+    assert after['years']['2020'] != before['years']['2020']
+    assert after['states']['Texas'] != before['states']['Texas']
+    assert read(tmp_path / SHARD_DIR / year_shard_name(2020))['states']['Texas']['electoralVotes'] == 40
+
+def test_removed_years_and_states_lose_their_shards(tmp_path):
+    save_sharded_files(*dataset([2016, 2020], ['Ohio', 'Texas']), tmp_path)
+    shard_dir = tmp_path / SHARD_DIR
+    assert shard_files(shard_dir) == ['states/ohio.json', 'states/texas.json', 'years/2016.json', 'years/2020.json']
+
+    manifest = save_sharded_files(*dataset([2020], ['Ohio']), tmp_path)
+    assert shard_files(shard_dir) == ['states/ohio.json', 'years/2020.json']
+    assert sorted(entry['file'] for group in manifest.values() for entry in group.values()) == shard_files(shard_dir)
+
+    # An incremental run that rewrites nothing still drops what left the data
+    save_sharded_files(*dataset([2020], []), tmp_path, years=set(), states=set())
+    assert shard_files(shard_dir) == ['years/2020.json']
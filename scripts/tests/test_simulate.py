@@ -0,0 +1,83 @@
+"""The simulator flips states by the rule in simulate_chunk and gives the same counts for any worker count"""
+
+from math import erf, sqrt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulate import build_arrays, simulate
+
+def frame(rows):
+    """Metrics-frame rows of (year, state, EVs, winner party, runner-up party, margin)"""
+    df = pd.DataFrame(rows, columns=['Year', 'State', 'Electoral_Votes', 'Corrected_Winner_Party',
+                                     'Corrected_RunnerUp_Party', 'Margin'])
+    df['Population'] = 1e6
+    return df
+
+GAME = frame([
+    (2000, 'A', 5, 'Red', 'Blue', 0.02),
+    (2000, 'B', 4, 'Blue', 'Red', -0.01),
+    (2000, 'C', 3, 'Red', 'Blue', -0.03),
+    (2000, 'D', 2, 'Red', 'Unknown', -0.05),
+    (2004, 'A', 5, 'Blue', 'Red', 0.10),
+    (2004, 'B', 4, 'Red', 'Blue', 0.10),
+])
+
+def test_hand_computed_flips_without_noise():
+    # With no swing, exactly the states behind in their margin flip, and D has no known party to flip to
+    per_year, per_state = simulate(GAME, draws=10, workers=1, chunk_size=4, swing_sd=0.0, state_sd=0.0)
+
+    assert per_state.set_index(['year', 'state'])['flipProbability'].to_dict() == {
+        (2000, 'A'): 0.0, (2000, 'B'): 1.0, (2000, 'C'): 1.0, (2000, 'D'): 0.0, (2004, 'A'): 0.0, (2004, 'B'): 0.0,
+    }
+    # 2000: Red 10 - Blue 4 before, Red 5 + 4 + 2 = 11 - Blue 3 after, so Red stays ahead but its EVs change
+    year_2000 = per_year.set_index('year').loc[2000]
+    assert year_2000['originalWinner'] == 'Red'
+    assert year_2000['flipProbability'] == 0.0
+    assert year_2000['winnerEVsMean'] == year_2000['winnerEVsP50'] == 11
+
+def test_outcome_flips_when_enough_states_do():
+    game = frame([
+        (2000, 'A', 5, 'Red', 'Blue', -0.02),
+        (2000, 'B', 4, 'Blue', 'Red', 0.01),
+        (2000, 'C', 3, 'Red', 'Blue', 0.01),
+    ])
+    per_year, _ = simulate(game, draws=5, workers=1, swing_sd=0.0, state_sd=0.0)
+    # Red 8 - Blue 4 becomes Blue 9 - Red 3
+    assert per_year['flipProbability'].tolist() == [1.0]
+    assert per_year['winnerEVsP50'].tolist() == [3]
+
+def test_flip_probability_follows_the_normal_distribution():
+    # One state 2 points ahead under N(0, 0.03^2 + 0.04^2) noise flips with probability Phi(-0.02 / 0.05)
+    game = frame([(2000, 'A', 3, 'Red', 'Blue', 0.02), (2000, 'B', 1, 'Red', 'Blue', 1.0)])
+    _, per_state = simulate(game, draws=200_000, seed=1, workers=1, chunk_size=50_000, swing_sd=0.03, state_sd=0.04)
+    expected = 0.5 * (1 + erf(-0.4 / sqrt(2)))
+    assert per_state['flipProbability'][0] == pytest.approx(expected, abs=0.005)
+
+def test_runner_up_without_a_party_never_flips():
+    arrays = build_arrays(GAME)
+    states = arrays['states']
+    assert arrays['flippable'][0].tolist() == [True, True, True, False]
+    assert not arrays['flippable'][1, [states.index('C'), states.index('D')]].any()
+
+@pytest.mark.parametrize('draws, chunk_size', [(3_000, 1_000), (2_500, 700)])
+def test_same_seed_same_result_for_any_worker_count(draws, chunk_size):
+    options = dict(draws=draws, seed=7, chunk_size=chunk_size, swing_sd=0.03, state_sd=0.05)
+    serial = simulate(GAME, workers=1, **options)
+    parallel = simulate(GAME, workers=3, **options)
+    for expected, actual in zip(serial, parallel):
+        pd.testing.assert_frame_equal(actual, expected)
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_chunks_add_up_to_every_draw(workers):
+    # Without noise every draw gives the same EVs, so a lost or repeated chunk would move the mean off them
+    per_year, per_state = simulate(GAME, draws=2_500, workers=workers, chunk_size=700, swing_sd=0.0, state_sd=0.0)
+    assert per_year['winnerEVsMean'].tolist() == [11.0, 5.0]
+    assert set(per_state['flipProbability']) == {0.0, 1.0}
+
+def test_house_sizes_use_the_same_draws_for_any_worker_count():
+    options = dict(draws=1_200, seed=3, chunk_size=500, house_sizes=[50, 100])
+    serial, _ = simulate(GAME, workers=1, **options)
+    parallel, _ = simulate(GAME, workers=2, **options)
+    pd.testing.assert_frame_equal(parallel, serial)
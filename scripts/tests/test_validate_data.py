@@ -0,0 +1,33 @@
+"""Notes checks flag rows whose classified note disagrees with the EV counts"""
+
+import pandas as pd
+
+from validate_data import find_faithless_note_conflicts, find_split_note_conflicts
+
+def frame(rows):
+    columns = ['Year', 'State', 'Electoral_Votes', 'Winner_EV', 'Runner_Up_EV', 'Notes']
+    df = pd.DataFrame(rows, columns=columns)
+    df[columns[2:5]] = df[columns[2:5]].astype('Int64')
+    df['Notes'] = df['Notes'].astype('category')
+    return df
+
+def test_split_note_without_split_evs_is_flagged():
+    df = frame([
+        (1800, 'Rhode Island', 4, 4, 0, 'Split vote'),
+        (2008, 'Nebraska', 5, 4, 1, 'Split by district'),
+        (2008, 'Ohio', 20, 20, 0, None),
+    ])
+    found = find_split_note_conflicts(df)
+    assert found['location'].tolist() == ['line 2']
+    assert found['message'][0].startswith("1800 Rhode Island: notes say 'Split vote'")
+    assert 'Split_Type' not in df
+
+def test_faithless_electors_must_account_for_missing_evs():
+    df = frame([
+        (2016, 'Texas', 38, 36, 0, '2 faithless electors'),
+        (2016, 'Hawaii', 4, 4, 0, '1 faithless elector'),
+        (2016, 'Washington', 12, None, 3, '4 faithless electors'),
+        (2016, 'Ohio', 18, 18, 0, None),
+    ])
+    found = find_faithless_note_conflicts(df)
+    assert found['location'].tolist() == ['line 3', 'line 4']
@@ -0,0 +1,81 @@
+"""The groupby year summaries match the per-year loop they replaced, key order included"""
+
+import pandas as pd
+import pytest
+
+from processData import FLOAT_DIGITS, calculate_metrics, create_year_summaries, load_data
+
+FIELDS = ('year', 'totalStates', 'totalElectoralVotes', 'totalPopulation', 'averagePopPerEV', 'minPopPerEV',
+          'maxPopPerEV', 'parties')
+
+def reference_summary(df, year):
+    """create_year_summaries' former body for one year: filter the frame, then aggregate"""
+    year_data = df[df['Year'] == year]
+    participating = year_data[year_data['Electoral_Votes'] > 0]
+    if len(participating) == 0:
+        return {
+            'year': int(year), 'totalStates': 0, 'totalElectoralVotes': 0, 'totalPopulation': None,
+            'averagePopPerEV': None, 'minPopPerEV': {'state': None, 'value': None},
+            'maxPopPerEV': {'state': None, 'value': None},
+            'parties': {'winner': {}, 'runnerUp': {}, 'stateCount': {'winner': {}, 'runnerUp': {}}},
+        }
+
+    values = participating['Population_Per_EV'].dropna()
+    rounded = lambda value: round(float(value), FLOAT_DIGITS)
+    return {
+        'year': int(year),
+        'totalStates': len(participating),
+        'totalElectoralVotes': int(participating['Electoral_Votes'].sum()),
+        'totalPopulation': int(participating['Population'].sum()) if participating['Population'].notna().any() else None,
+        'averagePopPerEV': rounded(values.mean()) if len(values) > 0 else None,
+        'minPopPerEV': {
+            'state': participating.loc[participating['Population_Per_EV'].idxmin(), 'State'] if len(values) > 0 else None,
+            'value': rounded(values.min()) if len(values) > 0 else None,
+        },
+        'maxPopPerEV': {
+            'state': participating.loc[participating['Population_Per_EV'].idxmax(), 'State'] if len(values) > 0 else None,
+            'value': rounded(values.max()) if len(values) > 0 else None,
+        },
+        'parties': {
+            'winner': participating.groupby('Corrected_Winner_Party')['Electoral_Votes'].sum().to_dict(),
+            'runnerUp': participating.groupby('Corrected_RunnerUp_Party')['Electoral_Votes'].sum().to_dict(),
+            'stateCount': {
+                'winner': participating['Corrected_Winner_Party'].value_counts().to_dict(),
+                'runnerUp': participating['Corrected_RunnerUp_Party'].value_counts().to_dict(),
+            },
+        },
+    }
+
+def ordered(value):
+    """Nested dicts as lists of items, so key order is compared too"""
+    if isinstance(value, dict):
+        return [(key, ordered(item)) for key, item in value.items()]
+    return value
+
+@pytest.fixture(scope='module')
+def metrics():
+    return calculate_metrics(load_data())
+
+def assert_matches_reference(df):
+    summaries = create_year_summaries(df)
+    assert list(summaries) == sorted(int(year) for year in df['Year'].unique())
+    for year, summary in summaries.items():
+        expected = reference_summary(df, year)
+        assert ordered({field: summary[field] for field in FIELDS}) == ordered(expected), year
+
+def test_real_data(metrics):
+    assert_matches_reference(metrics)
+
+def test_years_without_electoral_votes_or_populations(metrics):
+    df = metrics.copy()
+    df.loc[df['Year'] == 1792, 'Electoral_Votes'] = 0
+    df.loc[df['Year'] == 1800, ['Population', 'Population_Per_EV']] = pd.NA
+    # Ties in the state counts keep the order in which the parties first appear
+    df.loc[df['Year'] == 1804, 'Corrected_Winner_Party'] = ['Federalist', 'Democratic-Republican'] * 8 + ['Independent']
+
+    summaries = create_year_summaries(df)
+    assert summaries[1792]['totalStates'] == 0 and summaries[1792]['parties']['winner'] == {}
+    assert summaries[1800]['totalPopulation'] is None and summaries[1800]['averagePopPerEV'] is None
+    assert list(summaries[1804]['parties']['stateCount']['winner'].items()) == [
+        ('Federalist', 8), ('Democratic-Republican', 8), ('Independent', 1)]
+    assert_matches_reference(df)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Apply declarative data corrections to the root datasource
+Corrections live in data/corrections/*.csv. Each file is keyed by Year and
+State; every other column names a CSV field to overwrite, and an empty cell
+leaves that field unchanged. All files are applied in one merge, the CSV is
+written once, and the processing pipeline then runs in-process and only
+rebuilds the election years whose rows changed.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Shared typed loader and the pipeline live with the processing scripts
+sys.path.append(os.path.join(os.path.dirname(__file__), '../processing'))
+from loader import CATEGORICAL_COLUMNS, CSV_PATH, SCHEMA, load_electoral_data
+
+CORRECTIONS_DIR = Path('data/corrections')
+KEY_COLUMNS = ['Year', 'State']
+
+def load_corrections(corrections_dir=CORRECTIONS_DIR):
+    """Load every corrections file into one frame; later files win for the same key and field"""
+    files = sorted(Path(corrections_dir).glob('*.csv'))
+    if not files:
+        return pd.DataFrame(columns=KEY_COLUMNS)
+
+    patches = []
+    for path in files:
+        patch = pd.read_csv(path, dtype={column: dtype for column, dtype in SCHEMA.items() if dtype != 'category'})
+
+        unknown = [column for column in patch.columns if column not in SCHEMA]
+        if unknown or not set(KEY_COLUMNS) <= set(patch.columns):
+            raise ValueError(f"{path}: needs Year and State columns and only known fields, got unknown {unknown}")
+        if patch.duplicated(KEY_COLUMNS).any():
+            raise ValueError(f"{path}: duplicate (Year, State) keys")
+
+        patch['_order'] = len(patches)
+        patches.append(patch)
+
+    # Later files take precedence field by field: keep the last non-empty value per key
+    combined = pd.concat(patches, ignore_index=True).sort_values('_order', kind='stable')
+    return combined.drop(columns='_order').groupby(KEY_COLUMNS, as_index=False, sort=False).last()
+
+def apply_corrections(df, corrections):
+    """Apply corrections to df in one merge
+
+    Returns (corrected frame, changes frame with Year, State, field, old, new,
+    corrections that matched no row).
+    """
+    fields = [column for column in corrections.columns if column not in KEY_COLUMNS]
+    merged = df[KEY_COLUMNS].merge(corrections, on=KEY_COLUMNS, how='left', validate='many_to_one')
+    merged.index = df.index
+
+    unmatched = corrections.merge(df[KEY_COLUMNS], on=KEY_COLUMNS, how='left', indicator=True)
+    unmatched = unmatched.loc[unmatched['_merge'] == 'left_only', KEY_COLUMNS]
+
+    corrected = df.copy()
+    changes = []
+    for field in fields:
+        fix = merged[field]
+        current = df[field].astype(object)
+        proposed = fix.astype(object)
+        differs = fix.notna() & (current.isna() | (current != proposed))
+        if not differs.any():
+            continue
+
+        corrected[field] = corrected[field].astype(object).where(~differs, proposed)
+        changes.append(pd.DataFrame({
+            'Year': df.loc[differs, 'Year'],
+            'State': df.loc[differs, 'State'],
+            'field': field,
+            'old': current[differs],
+            'new': proposed[differs],
+        }))
+
+    # Restore the schema types the rest of the pipeline expects
+    corrected = corrected.astype({field: SCHEMA[field] for field in fields if SCHEMA[field] != 'category'})
+    changes = pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(columns=['Year', 'State', 'field', 'old', 'new'])
+    return corrected, changes.sort_values(KEY_COLUMNS, kind='stable'), unmatched
+
+def main(argv=None):
+    """Apply all corrections, write the CSV once and regenerate outputs in-process"""
+    parser = argparse.ArgumentParser(description="Apply data/corrections/*.csv to the root datasource")
+    parser.add_argument('--dry-run', action='store_true', help="report changes without writing anything")
+    parser.add_argument('--no-process', action='store_true', help="write the CSV but skip regenerating outputs")
+    args = parser.parse_args(argv)
+
+    print("🔍 Applying data corrections...")
+
+    corrections = load_corrections()
+    print(f"📋 Loaded {len(corrections)} corrected rows from {CORRECTIONS_DIR}")
+
+    df = load_electoral_data(categorical=False)
+    corrected, changes, unmatched = apply_corrections(df, corrections)
+
+    for year, state in unmatched.itertuples(index=False):
+        print(f"⚠️  No {year} record found for {state}")
+
+    if changes.empty:
+        print("✅ No fixes needed, datasource already matches all corrections")
+        return
+
+    for (year, state), rows in changes.groupby(KEY_COLUMNS, sort=False):
+        print(f"Fixing {year} {state}:")
+        for field, old, new in rows[['field', 'old', 'new']].itertuples(index=False):
+            print(f"  {field}: {old} → {new}")
+
+    changed_keys = changes[KEY_COLUMNS].drop_duplicates()
+    print(f"\n✅ {len(changes)} field changes across {len(changed_keys)} rows")
+
+    if args.dry_run:
+        print("🔎 Dry run, nothing written")
+        return
+
+    corrected.to_csv(CSV_PATH, index=False)
+    print(f"💾 Saved corrected data to {CSV_PATH}")
+
+    if not args.no_process:
+        # Run the pipeline in this interpreter on the frame we already hold;
+        # the incremental build only recomputes the years of the changed rows
+        print("🔄 Regenerating processed data...")
+        import processData
+
+        corrected[CATEGORICAL_COLUMNS] = corrected[CATEGORICAL_COLUMNS].astype('category')
+        processData.main(['--incremental'], df=corrected)
+
+if __name__ == '__main__':
+    main()
+    print("\n🎉 Corrections complete!")
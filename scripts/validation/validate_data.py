@@ -4,157 +4,223 @@ Data validation script for electoral datasource
 Ensures integrity of the single source of truth
 """
 
+import argparse
+import numpy as np
 import pandas as pd
 import json
+import os
+import sys
 from pathlib import Path
 
+# Shared typed loader lives with the processing pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '../processing'))
+from frame_index import YearStateIndex
+from loader import load_electoral_data
+from metrics import MetricsEngine
+from party_inference import default_matcher
+from validation_engine import (Check, csv_row_violations, no_violations, print_results, run_checks,
+                               split_messages, violations)
+
+EXPECTED_YEARS = (1789, 2024)
+EXPECTED_STATES = 51  # 50 states + DC
+MODERN_EV_YEARS = [2000, 2004, 2008, 2012, 2016, 2020, 2024]
+MODERN_TOTAL_EVS = 538
+PARTY_CHECK_FROM = 1988  # Name table covers every major candidate from here on
+REQUIRED_COLUMNS = ['Year', 'State', 'Electoral_Votes', 'Winner', 'Winner_Party', 'RunnerUp_Party']
+OUTPUT_DIR = Path('data/outputs')
+REQUIRED_FILES = ['stateTimelines.json', 'yearSummaries.json', 'stateMetadata.json', 'partyColors.json', 'config.json']
+
+# Root datasource checks - each runs as one mask/groupby over the whole frame
+
+def find_missing_columns(df):
+    missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if not missing_cols:
+        return no_violations()
+    return violations([f"Missing required columns: {missing_cols}"], ['header'])
+
+def find_year_range_errors(df):
+    min_year, max_year = df['Year'].min(), df['Year'].max()
+    if (min_year, max_year) == EXPECTED_YEARS:
+        return no_violations()
+    return violations([f"Expected years {EXPECTED_YEARS[0]}-{EXPECTED_YEARS[1]}, got {min_year}-{max_year}"], ['Year'])
+
+def find_duplicate_state_years(df):
+    duplicated = df[df.duplicated(['Year', 'State'], keep=False)]
+    return csv_row_violations(duplicated, (
+        f"Duplicate state-year combination {year} {state}"
+        for year, state in zip(duplicated['Year'], duplicated['State'])
+    ))
+
+def find_modern_ev_totals(df):
+    totals = df.groupby('Year')['Electoral_Votes'].sum().reindex(MODERN_EV_YEARS, fill_value=0)
+    wrong = totals[totals != MODERN_TOTAL_EVS]
+    return violations(
+        (f"{year}: Total EVs = {total}, expected {MODERN_TOTAL_EVS}" for year, total in wrong.items()),
+        (f"year {year}" for year in wrong.index)
+    )
+
+def find_party_mismatches(df):
+    # Infer each modern winner's party from the candidate name, once per distinct name
+    modern = df[df['Year'] >= PARTY_CHECK_FROM]
+    inferred_party = default_matcher().infer_column(modern['Winner'])
+    recorded_party = modern['Winner_Party'].astype(object)
+    mismatched = modern[inferred_party.notna() & (inferred_party != recorded_party)]
+    return csv_row_violations(mismatched, (
+        f"{year} {state}: {winner} marked as {winner_party}"
+        for year, state, winner, winner_party in zip(mismatched['Year'], mismatched['State'],
+                                                     mismatched['Winner'], mismatched['Winner_Party'])
+    ))
+
+def find_missing_recent_population(df):
+    missing = df[(df['Year'] >= 2000) & df['Population'].isna()]
+    return csv_row_violations(missing, (
+        f"{year} {state}: missing population data" for year, state in zip(missing['Year'], missing['State'])
+    ))
+
+def _with_metrics(df, columns):
+    """A copy of df with the requested metric columns added, leaving the checked frame as loaded"""
+    return MetricsEngine(df.copy()).require(columns)
+
+def find_split_note_conflicts(df):
+    # Is_Split_State comes from the EV counts; a note describing a split they do not show is suspect
+    noted = _with_metrics(df, ['Split_Type', 'Is_Split_State'])
+    conflicting = noted[noted['Split_Type'].notna() & ~noted['Is_Split_State']]
+    return csv_row_violations(conflicting, (
+        f"{year} {state}: notes say '{note}' but {winner_ev} of {evs} EVs went to the winner and {runner_up_ev} to the runner-up"
+        for year, state, note, evs, winner_ev, runner_up_ev in zip(
+            conflicting['Year'], conflicting['State'], conflicting['Notes'], conflicting['Electoral_Votes'],
+            conflicting['Winner_EV'], conflicting['Runner_Up_EV'])
+    ))
+
+def find_faithless_note_conflicts(df):
+    # Every EV the winner did not get is accounted for by the faithless electors the note counts
+    noted = _with_metrics(df, ['Faithless_Electors'])
+    faithless = noted[noted['Faithless_Electors'] > 0]
+    accounted = (faithless['Winner_EV'] + faithless['Faithless_Electors'] == faithless['Electoral_Votes']).fillna(False)
+    wrong = faithless[~accounted.astype(bool)]
+    return csv_row_violations(wrong, (
+        f"{year} {state}: notes count {count} faithless electors but the winner got {winner_ev} of {evs} EVs"
+        for year, state, count, evs, winner_ev in zip(wrong['Year'], wrong['State'], wrong['Faithless_Electors'],
+                                                       wrong['Electoral_Votes'], wrong['Winner_EV'])
+    ))
+
+ROOT_CHECKS = [
+    Check('required-columns', "Required columns are present", find_missing_columns),
+    Check('year-range', "Years span the full election history", find_year_range_errors),
+    Check('unique-state-year', "Each (Year, State) appears once", find_duplicate_state_years),
+    Check('modern-ev-totals', "Modern elections total 538 EVs", find_modern_ev_totals),
+    Check('party-consistency', "Modern winners' parties match their candidates", find_party_mismatches),
+    Check('recent-population', "Population is present since 2000", find_missing_recent_population, severity='warning'),
+    Check('notes-split', "Splits described in the notes show in the EV counts", find_split_note_conflicts,
+          severity='warning'),
+    Check('notes-faithless', "Faithless electors in the notes account for the EVs the winner missed",
+          find_faithless_note_conflicts, severity='warning'),
+]
+
+# Processed output checks - run against the loaded JSON outputs
+
+def load_outputs(output_dir=OUTPUT_DIR):
+    """Load the processed outputs once; missing files become None"""
+    outputs = {'dir': Path(output_dir), 'yearSummaries': None, 'timelines': None}
+    
+    if (outputs['dir'] / 'yearSummaries.json').exists():
+        with open(outputs['dir'] / 'yearSummaries.json', 'r') as f:
+            outputs['yearSummaries'] = json.load(f)
+    
+    if (outputs['dir'] / 'stateTimelines.json').exists():
+        with open(outputs['dir'] / 'stateTimelines.json', 'r') as f:
+            state_timelines = json.load(f)
+        # Flatten to one (state, year) row per timeline entry
+        outputs['timelines'] = pd.DataFrame(
+            [(state, entry.get('year')) for state, data in state_timelines.items() for entry in data.get('timeline', [])],
+            columns=['state', 'year']
+        )
+        outputs['stateNames'] = list(state_timelines)
+        outputs['index'] = YearStateIndex(outputs['timelines'], year_column='year', state_column='state')
+    
+    return outputs
+
+def find_missing_files(outputs):
+    missing = [name for name in REQUIRED_FILES if not (outputs['dir'] / name).exists()]
+    return violations((f"Missing output file: {name}" for name in missing), missing)
+
+def find_2024_summary_errors(outputs):
+    year_summaries = outputs['yearSummaries']
+    if year_summaries is None:
+        return violations(["Error reading yearSummaries.json: file not found"], ['yearSummaries.json'])
+    if '2024' not in year_summaries:
+        return violations(["Missing 2024 data in year summaries"], ['yearSummaries.json'])
+    
+    messages = []
+    result_2024 = year_summaries['2024']
+    actual_total_evs = result_2024['totalElectoralVotes']
+    if actual_total_evs != MODERN_TOTAL_EVS:
+        messages.append(f"2024 total EVs: got {actual_total_evs}, expected {MODERN_TOTAL_EVS}")
+    
+    # Check that Trump has more EVs than Harris
+    winner_parties = result_2024['parties']['winner']
+    if 'Republican' not in winner_parties or 'Democratic' not in winner_parties:
+        messages.append("2024: Missing Republican or Democratic parties in results")
+    elif winner_parties['Republican'] <= winner_parties['Democratic']:
+        messages.append("2024: Republican should have more EVs than Democratic")
+    
+    return violations(messages, ['yearSummaries.json:2024'] * len(messages))
+
+def find_state_count_errors(outputs):
+    if outputs['timelines'] is None:
+        return violations(["Error reading stateTimelines.json: file not found"], ['stateTimelines.json'])
+    actual_states = len(outputs['stateNames'])
+    if actual_states == EXPECTED_STATES:
+        return no_violations()
+    return violations([f"State timelines: got {actual_states} states, expected {EXPECTED_STATES}"], ['stateTimelines.json'])
+
+def find_states_missing_2024(outputs):
+    if outputs['timelines'] is None:
+        return violations(["Error reading stateTimelines.json: file not found"], ['stateTimelines.json'])
+    index = outputs['index']
+    has_2024 = index.present[index.year_position(2024)] if 2024 in index.years else np.zeros(len(index.states), bool)
+    has_2024 = pd.Series(has_2024, index=index.states).reindex(outputs['stateNames'], fill_value=False)
+    missing = has_2024[~has_2024].index
+    return violations((f"State missing 2024 data: {state}" for state in missing), missing)
+
+OUTPUT_CHECKS = [
+    Check('output-files', "All processed output files exist", find_missing_files),
+    Check('summary-2024', "2024 year summary totals and winner are correct", find_2024_summary_errors),
+    Check('state-count', "Timelines cover 50 states + DC", find_state_count_errors),
+    Check('timelines-2024', "Every state timeline has a 2024 entry", find_states_missing_2024),
+]
+
 def validate_root_datasource():
     """Validate the root CSV datasource"""
     print("🔍 Validating root datasource...")
     
-    df = pd.read_csv('data/raw/electoral_enhanced.csv')
-    
-    errors = []
-    warnings = []
-    
-    # Check basic structure
-    required_columns = ['Year', 'State', 'Electoral_Votes', 'Winner', 'Winner_Party', 'RunnerUp_Party']
-    missing_cols = [col for col in required_columns if col not in df.columns]
-    if missing_cols:
-        errors.append(f"Missing required columns: {missing_cols}")
-    
-    # Check year range
-    min_year, max_year = df['Year'].min(), df['Year'].max()
-    if min_year != 1789 or max_year != 2024:
-        errors.append(f"Expected years 1789-2024, got {min_year}-{max_year}")
-    
-    # Check for duplicate state-year combinations
-    duplicates = df.groupby(['Year', 'State']).size()
-    duplicates = duplicates[duplicates > 1]
-    if len(duplicates) > 0:
-        errors.append(f"Found {len(duplicates)} duplicate state-year combinations")
-    
-    # Check electoral vote totals for recent elections
-    for year in [2000, 2004, 2008, 2012, 2016, 2020, 2024]:
-        year_data = df[df['Year'] == year]
-        total_evs = year_data['Electoral_Votes'].sum()
-        if total_evs != 538:
-            errors.append(f"{year}: Total EVs = {total_evs}, expected 538")
-    
-    # Check party assignments for modern elections
-    modern_elections = df[df['Year'] >= 2000]
-    party_issues = []
-    
-    for _, row in modern_elections.iterrows():
-        winner = str(row['Winner']).lower()
-        winner_party = row['Winner_Party']
-        
-        # Check for obvious party mismatches
-        if any(name in winner for name in ['bush', 'trump', 'romney', 'mccain']):
-            if winner_party != 'Republican':
-                party_issues.append(f"{row['Year']} {row['State']}: {row['Winner']} marked as {winner_party}")
-        elif any(name in winner for name in ['obama', 'biden', 'clinton', 'gore', 'kerry']):
-            if winner_party != 'Democratic':
-                party_issues.append(f"{row['Year']} {row['State']}: {row['Winner']} marked as {winner_party}")
-    
-    if party_issues:
-        errors.extend(party_issues[:5])  # Show first 5 issues
-        if len(party_issues) > 5:
-            errors.append(f"... and {len(party_issues) - 5} more party assignment issues")
-    
-    # Check for missing population data in recent years
-    recent_data = df[df['Year'] >= 2000]
-    missing_pop = recent_data['Population'].isna().sum()
-    if missing_pop > 0:
-        warnings.append(f"{missing_pop} records missing population data since 2000")
-    
-    return errors, warnings
+    results = run_checks(load_electoral_data(), ROOT_CHECKS)
+    print_results(results)
+    return results
 
 def validate_processed_outputs():
     """Validate processed JSON outputs"""
     print("🔍 Validating processed outputs...")
     
-    errors = []
-    warnings = []
-    
-    output_dir = Path('data/outputs')
-    required_files = ['stateTimelines.json', 'yearSummaries.json', 'stateMetadata.json', 'partyColors.json', 'config.json']
-    
-    # Check all required files exist
-    for filename in required_files:
-        filepath = output_dir / filename
-        if not filepath.exists():
-            errors.append(f"Missing output file: {filename}")
-    
-    # Validate year summaries
-    try:
-        with open(output_dir / 'yearSummaries.json', 'r') as f:
-            year_summaries = json.load(f)
-        
-        # Check 2024 results specifically
-        if '2024' in year_summaries:
-            result_2024 = year_summaries['2024']
-            expected_total_evs = 538
-            actual_total_evs = result_2024['totalElectoralVotes']
-            
-            if actual_total_evs != expected_total_evs:
-                errors.append(f"2024 total EVs: got {actual_total_evs}, expected {expected_total_evs}")
-            
-            # Check that Trump has more EVs than Harris
-            winner_parties = result_2024['parties']['winner']
-            if 'Republican' not in winner_parties or 'Democratic' not in winner_parties:
-                errors.append("2024: Missing Republican or Democratic parties in results")
-            elif winner_parties['Republican'] <= winner_parties['Democratic']:
-                errors.append("2024: Republican should have more EVs than Democratic")
-        else:
-            errors.append("Missing 2024 data in year summaries")
-            
-    except Exception as e:
-        errors.append(f"Error reading yearSummaries.json: {e}")
-    
-    # Validate state timelines structure
-    try:
-        with open(output_dir / 'stateTimelines.json', 'r') as f:
-            state_timelines = json.load(f)
-        
-        expected_states = 51  # 50 states + DC
-        actual_states = len(state_timelines)
-        
-        if actual_states != expected_states:
-            errors.append(f"State timelines: got {actual_states} states, expected {expected_states}")
-            
-        # Check that each state has 2024 data
-        missing_2024 = []
-        for state, data in state_timelines.items():
-            timeline = data.get('timeline', [])
-            has_2024 = any(entry.get('year') == 2024 for entry in timeline)
-            if not has_2024:
-                missing_2024.append(state)
-        
-        if missing_2024:
-            errors.append(f"States missing 2024 data: {missing_2024[:5]}")
-            
-    except Exception as e:
-        errors.append(f"Error reading stateTimelines.json: {e}")
-    
-    return errors, warnings
-
-def main():
+    results = run_checks(load_outputs(), OUTPUT_CHECKS)
+    print_results(results)
+    return results
+
+def main(argv=None):
     """Run full validation"""
-    print("🚀 Starting electoral data validation...")
+    parser = argparse.ArgumentParser(description="Validate the electoral datasource and processed outputs")
+    parser.add_argument('--report', help="write every violation and per-check timing to this JSON file")
+    args = parser.parse_args(argv)
     
-    all_errors = []
-    all_warnings = []
+    print("🚀 Starting electoral data validation...")
     
-    # Validate root datasource
-    errors, warnings = validate_root_datasource()
-    all_errors.extend(errors)
-    all_warnings.extend(warnings)
+    results = validate_root_datasource() + validate_processed_outputs()
+    all_errors, all_warnings = split_messages(results)
     
-    # Validate processed outputs
-    errors, warnings = validate_processed_outputs()
-    all_errors.extend(errors)
-    all_warnings.extend(warnings)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'checks': [result.to_dict() for result in results]}, f, indent=2)
+        print(f"📝 Wrote validation report to {args.report}")
     
     # Report results
     print("\n📊 Validation Results:")
@@ -174,8 +240,10 @@ def main():
     if not all_errors and not all_warnings:
         print("\n🎉 All validation checks passed!")
     
+    print(f"⏱️  {len(results)} checks ran in {sum(result.seconds for result in results) * 1000:.1f} ms")
+    
     return len(all_errors) == 0
 
 if __name__ == "__main__":
     success = main()
-    exit(0 if success else 1)
\ No newline at end of file
+    exit(0 if success else 1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Declarative validation engine
+A check is a named rule whose function inspects a whole subject (usually a
+DataFrame) with one mask or groupby and returns every violating record at
+once. The engine runs each check, times it, and collects the violations with
+their locations for reporting.
+"""
+
+import time
+
+import pandas as pd
+
+VIOLATION_COLUMNS = ['location', 'message']
+
+def violations(messages, locations):
+    """Build a violations frame from aligned message and location sequences"""
+    return pd.DataFrame({'location': list(locations), 'message': list(messages)}, columns=VIOLATION_COLUMNS)
+
+def csv_row_violations(rows, messages):
+    """Violations located by CSV line number (the header is line 1)"""
+    return violations(messages, (f"line {index + 2}" for index in rows.index))
+
+def no_violations():
+    """Empty violations frame for a passing check"""
+    return pd.DataFrame(columns=VIOLATION_COLUMNS)
+
+class Check:
+    """A validation rule: find(subject) returns a violations frame"""
+
+    def __init__(self, name, description, find, severity='error'):
+        self.name = name
+        self.description = description
+        self.find = find
+        self.severity = severity
+
+class CheckResult:
+    """Outcome of running one check"""
+
+    def __init__(self, check, found, seconds):
+        self.name = check.name
+        self.description = check.description
+        self.severity = check.severity
+        self.violations = found
+        self.seconds = seconds
+
+    @property
+    def passed(self):
+        return len(self.violations) == 0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'description': self.description,
+            'severity': self.severity,
+            'passed': self.passed,
+            'seconds': self.seconds,
+            'violations': self.violations.to_dict(orient='records'),
+        }
+
+def run_checks(subject, checks):
+    """Run every check against subject; a check that fails to run is reported as a violation"""
+    results = []
+    for check in checks:
+        start = time.perf_counter()
+        try:
+            found = check.find(subject)
+        except Exception as e:
+            found = violations([f"Check could not run: {type(e).__name__}: {e}"], ['-'])
+        results.append(CheckResult(check, found.reset_index(drop=True), time.perf_counter() - start))
+    return results
+
+def print_results(results, limit=10):
+    """Print a per-check summary with timing and the first violations of each failing check"""
+    for result in results:
+        icon = '✅' if result.passed else ('❌' if result.severity == 'error' else '⚠️ ')
+        print(f"  {icon} {result.name}: {len(result.violations)} violations ({result.seconds * 1000:.1f} ms)")
+        for location, message in result.violations.head(limit).itertuples(index=False):
+            print(f"       - [{location}] {message}")
+        if len(result.violations) > limit:
+            print(f"       ... and {len(result.violations) - limit} more")
+
+def split_messages(results):
+    """Flatten results into (errors, warnings) message lists"""
+    errors, warnings = [], []
+    for result in results:
+        target = errors if result.severity == 'error' else warnings
+        target.extend(f"[{result.name}] {location}: {message}"
+                      for location, message in result.violations.itertuples(index=False))
+    return errors, warnings
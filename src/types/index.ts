@@ -7,13 +7,25 @@ export interface StateData {
   firstElection: number;
 }
 
+// Year's real EV total apportioned by population with each method (null if not taking part)
+export interface ApportionedEVs {
+  huntingtonHill: number | null;
+  webster: number | null;
+  jefferson: number | null;
+  hamilton: number | null;
+}
+
 export interface YearData {
   year: number;
   electoralVotes: number;
   population: number | null;
   populationPerEV: number | null;
   representationRatio: number | null;
+  // Normalized voting power in the year's Electoral College game (null if not taking part)
+  banzhafIndex?: number | null;
+  shapleyShubikIndex?: number | null;
   hypotheticalEVs: number | null;
+  apportionedEVs?: ApportionedEVs;
   evDifference: number | null;
   winner: string | null;
   runnerUp: string | null;
@@ -31,6 +43,19 @@ export interface StateTimeline {
   timeline: YearData[];
 }
 
+export interface VotingPower {
+  state: string | null;
+  banzhaf: number | null;
+  shapleyShubik: number | null;
+}
+
+export interface WinningCoalition {
+  electoralVotes: number | null;
+  population: number | null;
+  populationShare: number | null;
+  states: string[];
+}
+
 export interface YearSummary {
   year: number;
   totalStates: number;
@@ -45,6 +70,15 @@ export interface YearSummary {
     state: string | null;
     value: number | null;
   };
+  votingPower?: {
+    quota: number | null;
+    mostPowerful: VotingPower;
+    leastPowerful: VotingPower;
+  };
+  // Least-population set of states that could have won; whatIf holds the same for each EV allocation
+  minimumWinningCoalition?: WinningCoalition & {
+    whatIf: Record<string, WinningCoalition>;
+  };
   parties: {
     winner: Record<string, number>;
     runnerUp: Record<string, number>;